@@ -0,0 +1,44 @@
+"""
+게시글 목록용 집계 컬럼 갱신
+
+목록/API는 게시글마다 댓글 수, 이미지 수, 썸네일을 보여준다. 행마다 COUNT와 본문
+정규식을 돌리지 않도록 Post에 comment_count / image_count / thumbnail_url(+ digest)
+컬럼을 두고 여기서 갱신한다.
+
+- 댓글 생성/삭제: comment_count를 F()로 ±1 (UPDATE 1회)
+- 업로드 이미지 생성/삭제: 그 게시글의 이미지 집계를 다시 계산
+- 본문 저장: Post.save()가 직접 다시 계산
+
+updated_at이 바뀌지 않도록 모두 queryset.update()로 쓴다.
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, Post, PostImage
+
+
+def refresh_image_stats(post_id):
+    """게시글 이미지 집계 다시 계산 (게시글이 없으면 무시)"""
+    post = Post.objects.filter(pk=post_id).only('id', 'content').first()
+    if post is not None:
+        Post.objects.filter(pk=post_id).update(**post.get_image_stats())
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+    )
+
+
+@receiver(post_save, sender=PostImage)
+@receiver(post_delete, sender=PostImage)
+def post_image_changed(sender, instance, **kwargs):
+    refresh_image_stats(instance.post_id)
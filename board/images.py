@@ -0,0 +1,221 @@
+"""
+게시글 본문 이미지 저장소
+
+에디터는 이미지를 base64 data: URL로 본문에 바로 넣는다. 그대로 저장하면 게시글 한 행이
+수 MB가 되어 목록 조회, 본문 검색, 썸네일 추출이 모두 base64를 훑게 된다.
+
+저장 전에 본문의 data: URL 이미지를 디코딩해 파일로 저장하고 src를 파일 URL로 바꾼다.
+파일 이름은 내용의 SHA-256이라 같은 이미지는 한 번만 저장된다 (content-addressed).
+    
+    board/content/ab/ab12...ef.jpg
+
+기존 게시글: python manage.py ingest_post_images
+
+썸네일
+목록/갤러리 카드는 원본 대신 4:3으로 자른 썸네일을 여러 너비(WebP + JPEG)로 만들어
+srcset으로 내보낸다. 변환본도 원본 내용 해시와 너비로 저장해 한 번만 만든다.
+    
+    board/variants/ab/ab12...ef-320.webp
+
+업로드 이미지(PostImage)는 저장할 때, 본문 이미지는 처음 목록에 나올 때 만든다.
+"""
+import base64
+import binascii
+import hashlib
+import io
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+CONTENT_DIR = 'board/content'
+VARIANT_DIR = 'board/variants'
+
+THUMB_WIDTHS = (320, 480, 640)
+THUMB_RATIO = (4, 3)
+
+# 변환 실패(일시적인 저장소 오류 등)는 이 시간 뒤에 다시 시도
+RENDER_RETRY_TIMEOUT = 5 * 60
+
+# 확장자 → (Pillow 형식, 저장 옵션)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+Thumbnail = namedtuple('Thumbnail', ['src', 'srcset', 'webp_srcset'])
+
+DATA_URL_IMG = re.compile(
+    r'(<img\b[^>]*?\bsrc=)(["\'])data:image/[a-z0-9.+-]+;base64,([A-Za-z0-9+/=\s]+)\2',
+    re.IGNORECASE,
+)
+
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+
+
+def content_path(digest, ext):
+    return f'{CONTENT_DIR}/{digest[:2]}/{digest}.{ext}'
+
+
+def store_image(data):
+    """
+    이미지 bytes를 내용 해시 경로에 저장 (이미 있으면 그대로)
+    
+    Returns: 저장 경로, 이미지가 아니거나 지원하지 않는 형식이면 None
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            fmt = image.format
+            image.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        return None
+    if fmt not in EXTENSIONS:
+        return None
+    
+    name = content_path(hashlib.sha256(data).hexdigest(), EXTENSIONS[fmt])
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(data))
+    return name
+
+
+def ingest_inline_images(html):
+    """
+    본문의 data: URL 이미지를 파일로 저장하고 src를 파일 URL로 교체
+    
+    디코딩할 수 없는 이미지는 그대로 둔다.
+    Returns: (새 본문, 저장한 이미지 수)
+    """
+    if not html or 'data:image' not in html:
+        return html, 0
+    
+    stored = 0
+    
+    def replace(match):
+        nonlocal stored
+        try:
+            data = base64.b64decode(re.sub(r'\s+', '', match.group(3)), validate=True)
+        except (binascii.Error, ValueError):
+            return match.group(0)
+        
+        name = store_image(data)
+        if name is None:
+            return match.group(0)
+        stored += 1
+        quote = match.group(2)
+        return f'{match.group(1)}{quote}{default_storage.url(name)}{quote}'
+    
+    return DATA_URL_IMG.sub(replace, html), stored
+
+
+# === 썸네일 ===
+
+def file_digest(file):
+    """Django File의 SHA-256 (청크 단위로 읽음)"""
+    sha = hashlib.sha256()
+    for chunk in file.chunks():
+        sha.update(chunk)
+    return sha.hexdigest()
+
+
+def variant_path(digest, width, ext):
+    return f'{VARIANT_DIR}/{digest[:2]}/{digest}-{width}.{ext}'
+
+
+def render_variants(source_name, digest):
+    """
+    원본을 4:3으로 잘라 THUMB_WIDTHS × VARIANT_FORMATS 변환본 저장
+    
+    원본보다 큰 너비는 만들지 않는다 (가장 작은 너비는 항상 만듦).
+    Returns: 만든 너비 목록, 원본을 열 수 없으면 []
+    """
+    try:
+        with default_storage.open(source_name) as file, Image.open(file) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            else:
+                image = image.convert('RGB')
+            
+            widths = [w for w in THUMB_WIDTHS if w <= image.width] or THUMB_WIDTHS[:1]
+            for width in widths:
+                height = width * THUMB_RATIO[1] // THUMB_RATIO[0]
+                thumb = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+                for ext, (fmt, options) in VARIANT_FORMATS.items():
+                    name = variant_path(digest, width, ext)
+                    if default_storage.exists(name):
+                        continue
+                    buffer = io.BytesIO()
+                    thumb.save(buffer, fmt, **options)
+                    default_storage.save(name, ContentFile(buffer.getvalue()))
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        return []
+    return widths
+
+
+def ensure_variants(source_name, digest):
+    """
+    변환본 너비 목록 (없으면 만듦)
+    
+    결과를 캐시해 목록 페이지마다 파일 존재 확인을 반복하지 않는다.
+    변환본이 없는 결과(실패)는 RENDER_RETRY_TIMEOUT 동안만 캐시한다.
+    """
+    key = f'board_variants:{digest}'
+    widths = cache.get(key)
+    if widths is None:
+        widths = [
+            w for w in THUMB_WIDTHS
+            if default_storage.exists(variant_path(digest, w, 'jpg'))
+        ]
+        if not widths:
+            widths = render_variants(source_name, digest)
+        cache.set(key, widths, None if widths else RENDER_RETRY_TIMEOUT)
+    return widths
+
+
+def build_thumbnail(source_name, digest, fallback_url):
+    """변환본이 있으면 srcset 포함 Thumbnail, 없으면 원본 URL만"""
+    widths = ensure_variants(source_name, digest)
+    if not widths:
+        return Thumbnail(fallback_url, '', '')
+    
+    def srcset(ext):
+        return ', '.join(
+            f'{default_storage.url(variant_path(digest, w, ext))} {w}w' for w in widths
+        )
+    
+    return Thumbnail(
+        default_storage.url(variant_path(digest, widths[0], 'jpg')),
+        srcset('jpg'),
+        srcset('webp'),
+    )
+
+
+def thumbnail_from_url(url, digest=''):
+    """
+    저장된 이미지 URL(+ 내용 해시) → Thumbnail
+    
+    Post.thumbnail_url/thumbnail_digest 컬럼만으로 썸네일을 만들 때 쓴다 (DB 조회 없음).
+    """
+    if digest and url.startswith(settings.MEDIA_URL):
+        return build_thumbnail(url[len(settings.MEDIA_URL):], digest, url)
+    return content_thumbnail(url)
+
+
+def content_thumbnail(src):
+    """본문 이미지 src → Thumbnail (이 저장소에 저장된 이미지만 변환)"""
+    prefix = f'{settings.MEDIA_URL}{CONTENT_DIR}/'
+    match = re.fullmatch(
+        re.escape(prefix) + r'[0-9a-f]{2}/([0-9a-f]{64})\.(?:' + '|'.join(EXTENSIONS.values()) + ')',
+        src,
+    )
+    if not match:
+        return Thumbnail(src, '', '')
+    return build_thumbnail(src[len(settings.MEDIA_URL):], match.group(1), src)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from board.images import DATA_URL_IMG, ingest_inline_images
+from board.models import Post
+
+
+class Command(BaseCommand):
+    help = '게시글 본문의 base64 이미지를 파일로 옮기고 본문을 파일 URL로 바꿉니다'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='저장/수정 없이 대상 게시글만 출력',
+        )
+    
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        # 본문이 커서 한 번에 읽지 않고 id만 먼저 가져와 한 건씩 처리
+        post_ids = list(
+            Post.objects.filter(content__contains='data:image').values_list('id', flat=True)
+        )
+        
+        updated = images = before = after = 0
+        for post_id in post_ids:
+            content = Post.objects.filter(pk=post_id).values_list('content', flat=True).first()
+            if content is None:
+                continue
+            
+            if dry_run:
+                found = len(DATA_URL_IMG.findall(content))
+                self.stdout.write(f'#{post_id}: 이미지 {found}개, {len(content):,}자')
+                continue
+            
+            new_content, stored = ingest_inline_images(content)
+            if not stored:
+                continue
+            # 수정일(auto_now)이 바뀌지 않도록 update()로 본문(과 썸네일 컬럼)만 교체
+            stats = Post(pk=post_id, content=new_content).get_image_stats()
+            Post.objects.filter(pk=post_id).update(content=new_content, **stats)
+            updated += 1
+            images += stored
+            before += len(content)
+            after += len(new_content)
+            self.stdout.write(f'#{post_id}: 이미지 {stored}개, {len(content):,}자 → {len(new_content):,}자')
+        
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS(f'대상 게시글 {len(post_ids)}개'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'게시글 {updated}개, 이미지 {images}개 저장 ({before:,}자 → {after:,}자)'
+            ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from board.models import Post
+from board.search import create_index, get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = '게시글 전문 검색 색인을 처음부터 다시 만듭니다'
+    
+    def handle(self, *args, **options):
+        if create_index(connection) is None:
+            raise CommandError(f'{connection.vendor} DB는 전문 검색 색인을 지원하지 않습니다 (SQLite/PostgreSQL만).')
+        
+        with transaction.atomic():
+            count = rebuild_index(Post.objects.all(), get_backend())
+        self.stdout.write(self.style.SUCCESS(f'게시글 {count}개 색인'))
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0002_post_password"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="postimage",
+            name="digest",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, verbose_name="내용 해시"
+            ),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:40
+
+import hashlib
+import re
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from django.db.models import Count
+
+IMG_TAG = re.compile(r"<img[^>]+>")
+IMG_SRC = re.compile(r"<img[^>]+src=[\"']([^\"']+)[\"']")
+
+FIELDS = ["comment_count", "image_count", "thumbnail_url", "thumbnail_digest"]
+
+
+def backfill_counters(apps, schema_editor):
+    """댓글 수 / 이미지 수 / 썸네일 URL 채우기 (Post.get_image_stats와 같은 규칙)"""
+    Post = apps.get_model("board", "Post")
+    PostImage = apps.get_model("board", "PostImage")
+    Comment = apps.get_model("board", "Comment")
+
+    comment_counts = dict(
+        Comment.objects.values_list("post").annotate(n=Count("id")).order_by()
+    )
+    image_counts = dict(
+        PostImage.objects.values_list("post").annotate(n=Count("id")).order_by()
+    )
+
+    # 0003 이전에 올라온 이미지는 내용 해시가 비어 있어 썸네일 변환본을 찾지 못함
+    for image in PostImage.objects.filter(digest="").only("id", "image"):
+        sha = hashlib.sha256()
+        try:
+            with default_storage.open(image.image.name) as file:
+                for chunk in file.chunks():
+                    sha.update(chunk)
+        except OSError:
+            continue  # 파일이 없는 이미지는 원본 URL로 표시
+        image.digest = sha.hexdigest()
+        image.save(update_fields=["digest"])
+
+    first_images = {}
+    for post_id, name, digest in PostImage.objects.order_by(
+        "order", "created_at", "id"
+    ).values_list("post", "image", "digest"):
+        first_images.setdefault(post_id, (default_storage.url(name), digest))
+
+    batch = []
+    for post in Post.objects.only("id", "content").iterator():
+        content = post.content or ""
+        post.comment_count = comment_counts.get(post.id, 0)
+        post.image_count = image_counts.get(post.id, 0) + len(IMG_TAG.findall(content))
+        if post.id in first_images:
+            post.thumbnail_url, post.thumbnail_digest = first_images[post.id]
+        else:
+            match = IMG_SRC.search(content)
+            url = match.group(1) if match else ""
+            if url.startswith("data:") or len(url) > 500:
+                url = ""
+            post.thumbnail_url, post.thumbnail_digest = url, ""
+        batch.append(post)
+        if len(batch) >= 500:
+            Post.objects.bulk_update(batch, FIELDS)
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0003_postimage_digest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="댓글 수"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="이미지 수"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_digest",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="thumbnail_url",
+            field=models.CharField(
+                blank=True, editable=False, max_length=500, verbose_name="썸네일 URL"
+            ),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:10
+
+import html
+import re
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+BLOCK_BOUNDARY = re.compile(
+    r"<(?:br|/p|/div|/li|/h[1-6]|/blockquote|/pre)\b[^>]*>", re.IGNORECASE
+)
+
+
+def backfill_excerpt(apps, schema_editor):
+    """board.text.make_excerpt와 같은 규칙으로 요약 채우기"""
+    Post = apps.get_model("board", "Post")
+
+    batch = []
+    for post in Post.objects.only("id", "content").iterator(chunk_size=100):
+        text = strip_tags(BLOCK_BOUNDARY.sub(" ", post.content or ""))
+        text = re.sub(r"\s+", " ", html.unescape(text)).strip()
+        post.excerpt = text[:100].rstrip() + "..." if len(text) > 100 else text
+        batch.append(post)
+        if len(batch) >= 500:
+            Post.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ["excerpt"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0004_post_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(
+                blank=True, editable=False, max_length=200, verbose_name="요약"
+            ),
+        ),
+        migrations.RunPython(backfill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:40
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """
+    전문 검색 색인 테이블 생성 + 기존 게시글 색인
+    (SQLite FTS5 / PostgreSQL tsvector, 그 외 DB는 건너뜀)
+    """
+    from board.search import create_index, rebuild_index
+
+    backend = create_index(schema_editor.connection)
+    if backend is not None:
+        Post = apps.get_model("board", "Post")
+        rebuild_index(Post.objects.all(), backend)
+
+
+def drop_search_index(apps, schema_editor):
+    from board.search import drop_index
+
+    drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("board", "0005_post_excerpt"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -2,6 +2,13 @@ from django.db import models
 from members.models import Member
 import re
 
+from .images import ensure_variants, file_digest, thumbnail_from_url
+from .text import make_excerpt
+
+
+IMG_TAG = re.compile(r'<img[^>]+>')
+IMG_SRC = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']')
+
 
 class Post(models.Model):
     """게시글 모델"""
@@ -12,8 +19,15 @@ class Post(models.Model):
         ('gallery', '사진갤러리'),
     ]
     
+    # 목록/API에서 읽는 컬럼 (본문 content는 읽지 않음)
+    LIST_FIELDS = (
+        'id', 'title', 'excerpt', 'category', 'author_name', 'is_pinned', 'view_count',
+        'comment_count', 'image_count', 'thumbnail_url', 'thumbnail_digest', 'created_at',
+    )
+    
     title = models.CharField(max_length=200, verbose_name='제목')
     content = models.TextField(verbose_name='내용', blank=True)
+    excerpt = models.CharField(max_length=200, blank=True, editable=False, verbose_name='요약')
     category = models.CharField(
         max_length=20, 
         choices=CATEGORY_CHOICES, 
@@ -32,6 +46,11 @@ class Post(models.Model):
     password = models.CharField(max_length=100, blank=True, verbose_name='비밀번호')
     is_pinned = models.BooleanField(default=False, verbose_name='상단 고정')
     view_count = models.PositiveIntegerField(default=0, verbose_name='조회수')
+    # 목록용 집계 컬럼 (board.counters가 댓글/이미지 변경 시 갱신)
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수')
+    image_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='이미지 수')
+    thumbnail_url = models.CharField(max_length=500, blank=True, editable=False, verbose_name='썸네일 URL')
+    thumbnail_digest = models.CharField(max_length=64, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='작성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     
@@ -45,8 +64,19 @@ class Post(models.Model):
     
     def save(self, *args, **kwargs):
         # author가 있으면 author_name 자동 설정
-        if self.author and not self.author_name:
+        if not self.author_name and self.author:
             self.author_name = self.author.name
+        
+        # 본문이 바뀌는 저장이면 요약/이미지 집계도 다시 계산
+        # (목록용으로 content 없이 읽은 인스턴스는 본문을 쓰지 않음)
+        update_fields = kwargs.get('update_fields')
+        content_loaded = 'content' not in self.get_deferred_fields()
+        if content_loaded and (update_fields is None or 'content' in update_fields):
+            derived = {'excerpt': make_excerpt(self.content), **self.get_image_stats()}
+            for field, value in derived.items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *derived}
         super().save(*args, **kwargs)
     
     def has_password(self):
@@ -60,30 +90,40 @@ class Post(models.Model):
         # 타입 변환하여 비교 (숫자로 입력해도 문자열로 비교)
         return str(self.password) == str(password)
     
-    def get_thumbnail_url(self):
-        """본문에서 첫 번째 이미지 URL 추출"""
-        # 1. PostImage에서 먼저 찾기
-        first_image = self.images.first()
-        if first_image:
-            return first_image.image.url
-        
-        # 2. 본문 content에서 <img> 태그의 src 추출
+    def get_first_content_image(self):
+        """본문 첫 번째 <img>의 src"""
         if self.content:
             # <img src="..."> 패턴 찾기
-            img_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-            match = re.search(img_pattern, self.content)
+            match = IMG_SRC.search(self.content)
             if match:
                 return match.group(1)
-        
         return None
     
-    def get_image_count(self):
-        """본문의 이미지 개수 반환"""
-        count = self.images.count()
+    def get_thumbnail(self):
+        """목록/갤러리 카드용 썸네일 (src, srcset, webp_srcset) - 이미지가 없으면 None"""
+        if not self.thumbnail_url:
+            return None
+        return thumbnail_from_url(self.thumbnail_url, self.thumbnail_digest)
+    
+    def get_image_stats(self):
+        """image_count / thumbnail_url / thumbnail_digest 컬럼 값"""
+        first_image = None
+        count = 0
+        if self.pk:
+            first_image = self.images.first()
+            count = self.images.count()
         if self.content:
-            # 본문의 <img> 태그 개수
-            count += len(re.findall(r'<img[^>]+>', self.content))
-        return count
+            count += len(IMG_TAG.findall(self.content))
+        
+        if first_image:
+            url, digest = first_image.image.url, first_image.digest
+        else:
+            url, digest = self.get_first_content_image() or '', ''
+            if url.startswith('data:') or len(url) > 500:
+                # 아직 파일로 옮기지 않은 base64 이미지 (ingest_post_images)
+                url = ''
+        
+        return {'image_count': count, 'thumbnail_url': url, 'thumbnail_digest': digest}
 
 
 class PostImage(models.Model):
@@ -96,6 +136,7 @@ class PostImage(models.Model):
         verbose_name='게시글'
     )
     image = models.ImageField(upload_to='board/%Y/%m/', verbose_name='이미지')
+    digest = models.CharField(max_length=64, blank=True, editable=False, verbose_name='내용 해시')
     order = models.PositiveIntegerField(default=0, verbose_name='순서')
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -106,6 +147,14 @@ class PostImage(models.Model):
     
     def __str__(self):
         return f"{self.post.title} - 이미지 {self.order}"
+    
+    def save(self, *args, **kwargs):
+        if self.image and not self.digest:
+            self.digest = file_digest(self.image)
+        super().save(*args, **kwargs)
+        # 썸네일은 업로드할 때 미리 만들어 둠
+        if self.digest:
+            ensure_variants(self.image.name, self.digest)
 
 
 class Comment(models.Model):
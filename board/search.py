@@ -0,0 +1,310 @@
+"""
+게시글 전문 검색 색인
+
+제목 / 본문 평문 / 작성자명을 DB 전문 검색 색인에 넣고 관련도순으로 찾는다.
+- SQLite(로컬): FTS5 가상 테이블 board_post_fts (rowid = 게시글 id), bm25 순위
+- PostgreSQL(Railway): board_post_search(post_id, tsvector) + GIN 인덱스, ts_rank 순위
+- 그 외 DB나 색인 테이블이 없으면 기존 icontains 검색
+
+=== 한글 토큰 ===
+한글은 띄어쓰기 단위가 "테니스장에서"처럼 조사까지 붙어 있어 단어 단위 색인으로는
+"테니스"를 찾지 못한다. 한글 구간은 2-gram으로 쪼개 넣고 ("테니 니스 스장 장에 에서"),
+질의도 같은 방식으로 쪼개 연속 구문으로 찾는다 (FTS5 "테니 니스" / tsquery 테니 <-> 니스).
+한 글자 한글, 영문/숫자 단어는 접두사 검색.
+
+색인은 Post 저장/삭제 시그널로 갱신한다. 전체 재구성: python manage.py rebuild_post_search
+"""
+import re
+import time
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Post
+from .text import html_to_text
+
+
+MAX_RESULTS = 500
+MAX_QUERY_TERMS = 10
+
+SEARCH_FIELDS = {'title', 'content', 'author_name'}
+
+TOKEN_RUN = re.compile(r'[가-힣]+|[^\W_가-힣]+')
+HANGUL_RUN = re.compile(r'[가-힣]+')
+
+
+def _terms(text):
+    """텍스트 → [(구간, 한글 여부)]"""
+    return [(run, bool(HANGUL_RUN.fullmatch(run))) for run in TOKEN_RUN.findall(text.lower())]
+
+
+def bigrams(run):
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def tokenize(text):
+    """색인용 토큰 문자열 (한글은 2-gram, 그 외는 단어)"""
+    tokens = []
+    for run, hangul in _terms(text or ''):
+        tokens.extend(bigrams(run) if hangul else [run])
+    return ' '.join(tokens)
+
+
+def parse_query(query):
+    """질의 → [(토큰 목록, 접두사 여부)], 구간마다 AND"""
+    terms = []
+    for run, hangul in _terms(query)[:MAX_QUERY_TERMS]:
+        if hangul and len(run) > 1:
+            terms.append((bigrams(run), False))
+        else:
+            terms.append(([run], True))
+    return terms
+
+
+def document(post):
+    """게시글 → (제목, 본문, 작성자) 토큰 문자열"""
+    return (
+        tokenize(post.title),
+        tokenize(html_to_text(post.content)),
+        tokenize(post.author_name),
+    )
+
+
+# === DB별 색인 ===
+
+class SqliteBackend:
+    table = 'board_post_fts'
+    
+    def __init__(self, conn):
+        self.connection = conn
+    
+    def create(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                "USING fts5(title, body, author, tokenize='unicode61 remove_diacritics 0')"
+            )
+    
+    def drop(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+    
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+    
+    def index(self, rows):
+        """rows: [(게시글 id, 제목, 본문, 작성자)] (토큰 문자열)"""
+        rows = list(rows)
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, body, author) VALUES (%s, %s, %s, %s)', rows,
+            )
+    
+    def remove(self, post_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [post_id])
+    
+    def search(self, terms, limit, within=None):
+        """within: 게시글 id 서브쿼리 (sql, params), 주면 그 안에서만 찾음"""
+        expression = ' '.join(
+            f'"{tokens[0]}"*' if prefix else '"' + ' '.join(tokens) + '"'
+            for tokens, prefix in terms
+        )
+        where, params = f'{self.table} MATCH %s', [expression]
+        if within is not None:
+            where += f' AND rowid IN ({within[0]})'
+            params.extend(within[1])
+        with self.connection.cursor() as cursor:
+            # 제목 > 작성자 > 본문 가중치
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {where} '
+                f'ORDER BY bm25({self.table}, 10.0, 1.0, 5.0) LIMIT %s',
+                [*params, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresBackend:
+    table = 'board_post_search'
+    
+    def __init__(self, conn):
+        self.connection = conn
+    
+    def create(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                'post_id bigint PRIMARY KEY REFERENCES board_post (id) ON DELETE CASCADE, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_document_idx '
+                f'ON {self.table} USING GIN (document)'
+            )
+    
+    def drop(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+    
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {self.table}')
+    
+    def index(self, rows):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (post_id, document) VALUES (%s, '
+                "setweight(to_tsvector('simple', %s), 'A') || "
+                "setweight(to_tsvector('simple', %s), 'C') || "
+                "setweight(to_tsvector('simple', %s), 'B')) "
+                'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+                list(rows),
+            )
+    
+    def remove(self, post_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE post_id = %s', [post_id])
+    
+    def search(self, terms, limit, within=None):
+        expression = ' & '.join(
+            f'{tokens[0]}:*' if prefix else '(' + ' <-> '.join(tokens) + ')'
+            for tokens, prefix in terms
+        )
+        where, params = 'document @@ query', [expression]
+        if within is not None:
+            where += f' AND post_id IN ({within[0]})'
+            params.extend(within[1])
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT post_id FROM {self.table}, to_tsquery('simple', %s) query "
+                f'WHERE {where} ORDER BY ts_rank(document, query) DESC, post_id DESC LIMIT %s',
+                [*params, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {'sqlite': SqliteBackend, 'postgresql': PostgresBackend}
+
+
+def backend_for(conn):
+    """연결의 DB가 지원하면 색인 백엔드, 아니면 None (테이블 존재 여부는 보지 않음)"""
+    backend = BACKENDS.get(conn.vendor)
+    return backend(conn) if backend else None
+
+
+# 색인 테이블 존재 여부 확인 결과 (backend 테이블명, 존재 여부, 확인 시각)
+# 다른 프로세스의 migrate/rebuild_post_search도 INDEX_CHECK_TTL초 안에 반영된다.
+INDEX_CHECK_TTL = 60
+
+_index_check = None
+
+
+def create_index(conn):
+    """색인 테이블 생성 (마이그레이션용, 지원하지 않는 DB면 아무것도 안 함)"""
+    global _index_check
+    backend = backend_for(conn)
+    if backend is not None:
+        backend.create()
+        _index_check = None
+    return backend
+
+
+def drop_index(conn):
+    global _index_check
+    backend = backend_for(conn)
+    if backend is not None:
+        backend.drop()
+        _index_check = None
+
+
+def get_backend():
+    """색인 테이블이 있는 경우에만 백엔드 (없으면 None → icontains 검색)"""
+    global _index_check
+    backend = backend_for(connection)
+    if backend is None:
+        return None
+    
+    check = _index_check
+    if check is None or check[0] != backend.table or time.monotonic() - check[2] >= INDEX_CHECK_TTL:
+        exists = backend.table in connection.introspection.table_names()
+        check = _index_check = (backend.table, exists, time.monotonic())
+    return backend if check[1] else None
+
+
+# === 색인 갱신 / 검색 ===
+
+def index_posts(posts, backend=None):
+    backend = backend or get_backend()
+    if backend is not None:
+        backend.index((post.pk, *document(post)) for post in posts)
+
+
+def rebuild_index(posts, backend=None, chunk_size=200):
+    """
+    색인 전체 재구성
+    
+    posts: id/title/content/author_name을 가진 게시글 쿼리셋 (마이그레이션에서는 과거 모델)
+    Returns: 색인한 게시글 수
+    """
+    backend = backend or get_backend()
+    if backend is None:
+        return 0
+    
+    backend.clear()
+    count = 0
+    chunk = []
+    for post in posts.only('id', *SEARCH_FIELDS).iterator(chunk_size=chunk_size):
+        chunk.append(post)
+        if len(chunk) >= chunk_size:
+            index_posts(chunk, backend)
+            count += len(chunk)
+            chunk = []
+    index_posts(chunk, backend)
+    return count + len(chunk)
+
+
+def search_posts(posts, query):
+    """
+    posts 중 query에 맞는 게시글
+    
+    색인이 있으면 관련도순 리스트 (posts 조건을 색인 쿼리에 함께 걸어 그 안의 상위 MAX_RESULTS개),
+    없으면 icontains로 거른 쿼리셋.
+    """
+    backend = get_backend()
+    if backend is None:
+        return posts.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(author_name__icontains=query)
+        )
+    
+    terms = parse_query(query)
+    if not terms:
+        return []
+    # 카테고리 등 posts 조건은 색인 쿼리 안에서 적용 (전체 상위 결과만 거르면 누락됨)
+    within = posts.order_by().values('id').query.sql_with_params() if posts.query.where else None
+    ids = backend.search(terms, MAX_RESULTS, within)
+    rank = {post_id: position for position, post_id in enumerate(ids)}
+    return sorted(posts.filter(id__in=ids), key=lambda post: rank[post.id])
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return  # 조회수만 바뀐 저장 등
+    if SEARCH_FIELDS & instance.get_deferred_fields():
+        instance = Post.objects.only('id', *SEARCH_FIELDS).get(pk=instance.pk)
+    index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def remove_deleted_post(sender, instance, **kwargs):
+    backend = get_backend()
+    if backend is not None:
+        backend.remove(instance.pk)
@@ -1,3 +1,41 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from . import images, search
+from .models import Post
+
+
+class SearchPostsTests(TestCase):
+    def setUp(self):
+        for i in range(3):
+            Post.objects.create(title=f'테니스장 예약 {i}', content='', category='free', author_name='김민수')
+        self.gallery = Post.objects.create(
+            title='지난 주말 정기 모임 테니스장 단체 사진 모음', content='', category='gallery', author_name='이지은',
+        )
+    
+    def test_uses_index(self):
+        self.assertIsNotNone(search.get_backend())
+    
+    def test_finds_hangul_substring(self):
+        results = search.search_posts(Post.objects.all(), '테니스')
+        
+        self.assertEqual(len(results), 4)
+    
+    def test_category_filter_applies_inside_index_query(self):
+        # 제목이 긴 갤러리 글은 관련도가 낮아 전체 상위 3개에 들지 못함
+        with mock.patch.object(search, 'MAX_RESULTS', 3):
+            results = search.search_posts(Post.objects.filter(category='gallery'), '테니스')
+        
+        self.assertEqual(results, [self.gallery])
+
+
+class EnsureVariantsTests(TestCase):
+    def test_failed_render_is_retried_after_timeout(self):
+        digest = '0' * 64
+        with mock.patch('board.images.cache') as cache, \
+                mock.patch('board.images.render_variants', return_value=[]):
+            cache.get.return_value = None
+            self.assertEqual(images.ensure_variants('board/content/missing.jpg', digest), [])
+        
+        cache.set.assert_called_once_with(f'board_variants:{digest}', [], images.RENDER_RETRY_TIMEOUT)
@@ -0,0 +1,31 @@
+"""
+게시글 본문(HTML) → 평문
+
+목록 요약(excerpt)과 검색 색인에 쓴다. 블록 태그 경계는 공백으로 바꿔
+'<p>첫 줄</p><p>둘째 줄</p>'이 '첫 줄둘째 줄'로 붙지 않게 한다.
+"""
+import html
+import re
+
+from django.utils.html import strip_tags
+
+
+BLOCK_BOUNDARY = re.compile(r'<(?:br|/p|/div|/li|/h[1-6]|/blockquote|/pre)\b[^>]*>', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+EXCERPT_LENGTH = 100
+
+
+def html_to_text(value):
+    if not value:
+        return ''
+    text = strip_tags(BLOCK_BOUNDARY.sub(' ', value))
+    return WHITESPACE.sub(' ', html.unescape(text)).strip()
+
+
+def make_excerpt(value, length=EXCERPT_LENGTH):
+    """본문 앞부분 평문 (length자 초과 시 '...')"""
+    text = html_to_text(value)
+    if len(text) > length:
+        return text[:length].rstrip() + '...'
+    return text
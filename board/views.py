@@ -2,10 +2,11 @@ from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.core.paginator import Paginator
-from django.db.models import Q
 import json
 
+from .images import ingest_inline_images
 from .models import Post, PostImage, Comment
+from .search import search_posts
 from members.models import Member
 
 
@@ -16,19 +17,14 @@ def board_list(request):
     search = request.GET.get('search', '')
     page = request.GET.get('page', 1)
     
-    # 카테고리 필터링
-    if category == 'all':
-        posts = Post.objects.all()
-    else:
-        posts = Post.objects.filter(category=category)
+    # 카테고리 필터링 (목록 컬럼만 읽음)
+    posts = Post.objects.only(*Post.LIST_FIELDS)
+    if category != 'all':
+        posts = posts.filter(category=category)
     
-    # 검색
+    # 검색 (관련도순)
     if search:
-        posts = posts.filter(
-            Q(title__icontains=search) | 
-            Q(content__icontains=search) |
-            Q(author_name__icontains=search)
-        )
+        posts = search_posts(posts, search)
     
     # 페이지네이션
     paginator = Paginator(posts, 12)  # 12개씩
@@ -120,6 +116,9 @@ def post_create(request):
         if not author_name:
             author_name = '익명'
         
+        # 본문의 base64 이미지는 파일로 저장하고 URL로 교체
+        content, _ = ingest_inline_images(content)
+        
         # 게시글 생성
         post = Post.objects.create(
             title=title,
@@ -172,7 +171,7 @@ def post_update(request, post_id):
             return JsonResponse({'success': False, 'error': '제목을 입력해주세요.'})
         
         post.title = title
-        post.content = content
+        post.content, _ = ingest_inline_images(content)
         if category:
             post.category = category
         post.is_pinned = is_pinned
@@ -314,34 +313,31 @@ def api_posts(request):
     page = request.GET.get('page', 1)
     search = request.GET.get('search', '')
     
-    if category == 'all':
-        posts = Post.objects.all()
-    else:
-        posts = Post.objects.filter(category=category)
+    posts = Post.objects.only(*Post.LIST_FIELDS)
+    if category != 'all':
+        posts = posts.filter(category=category)
     
     if search:
-        posts = posts.filter(
-            Q(title__icontains=search) | 
-            Q(content__icontains=search)
-        )
+        posts = search_posts(posts, search)
     
     paginator = Paginator(posts, 12)
     page_obj = paginator.get_page(page)
     
     posts_data = []
     for post in page_obj:
-        first_image = post.images.first()
+        thumbnail = post.get_thumbnail()
         posts_data.append({
             'id': post.id,
             'title': post.title,
-            'content': post.content[:100] + '...' if len(post.content) > 100 else post.content,
+            'content': post.excerpt,
             'category': post.category,
             'category_display': post.get_category_display(),
             'author_name': post.author_name,
             'view_count': post.view_count,
-            'comment_count': post.comments.count(),
-            'image_count': post.images.count(),
-            'first_image': first_image.image.url if first_image else None,
+            'comment_count': post.comment_count,
+            'image_count': post.image_count,
+            'first_image': post.thumbnail_url or None,
+            'thumbnail': thumbnail._asdict() if thumbnail else None,
             'is_pinned': post.is_pinned,
             'created_at': post.created_at.strftime('%Y-%m-%d %H:%M'),
         })
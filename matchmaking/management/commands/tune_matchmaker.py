@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from matchmaking.matchmaker import ScoringWeights
+from matchmaking.tuning import (
+    build_corpus,
+    grid_candidates,
+    random_candidates,
+    run_search,
+    weights_diff,
+)
+
+
+class Command(BaseCommand):
+    help = '합성 세션 코퍼스로 대진표 가중치 조합을 비교합니다 (품질/실행 시간)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['grid', 'random'], default='random')
+        parser.add_argument(
+            '--param', action='append', default=[],
+            help='그리드 탐색 값 (예: --param ntrp_diff=5,20,50)',
+        )
+        parser.add_argument('--samples', type=int, default=20, help='랜덤 탐색 후보 수')
+        parser.add_argument('--spread', type=float, default=4.0, help='랜덤 탐색 배율 범위')
+        parser.add_argument('--sessions', type=int, default=30, help='코퍼스 세션 수')
+        parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--top', type=int, default=10, help='출력할 상위 결과 수')
+    
+    def handle(self, *args, **options):
+        corpus = build_corpus(options['sessions'], seed=options['seed'])
+        
+        if options['mode'] == 'grid':
+            if not options['param']:
+                raise CommandError('그리드 탐색에는 --param이 필요합니다.')
+            candidates = list(grid_candidates(self._parse_grid(options['param'])))
+        else:
+            candidates = list(random_candidates(
+                options['samples'], seed=options['seed'], spread=options['spread'],
+            ))
+        
+        self.stdout.write(
+            f"가중치 {len(candidates)}개 × 세션 {len(corpus)}개 평가 중..."
+        )
+        results = run_search(candidates, corpus, max_workers=options['workers'], seed=options['seed'])
+        
+        for rank, result in enumerate(results[:options['top']], 1):
+            metrics = result['metrics']
+            # 품질 점수 × 실행 시간: 낮을수록 계산량 대비 품질이 좋음
+            cost = result['quality'] * result['runtime']
+            self.stdout.write(
+                f"{rank:>2}. 품질 {result['quality']:8.2f} | {result['runtime']:6.2f}s | "
+                f"품질×시간 {cost:8.2f} | "
+                f"연속휴식 {metrics['consecutive_rests']:.2f} 빈코트 {metrics['empty_courts']:.2f} "
+                f"편차 {metrics['gender_spread_excess']:.2f} 파트너반복 {metrics['repeat_partners']:.2f} "
+                f"NTRP차 {metrics['avg_ntrp_gap']:.2f}"
+            )
+            diff = weights_diff(result['weights'])
+            self.stdout.write(f"    {diff if diff else '(기본 가중치)'}")
+    
+    def _parse_grid(self, params):
+        valid = ScoringWeights.__dataclass_fields__
+        grid = {}
+        for param in params:
+            name, sep, values = param.partition('=')
+            if not sep or name not in valid:
+                raise CommandError(f'잘못된 --param: {param}')
+            cast = int if valid[name].type is int else float
+            try:
+                grid[name] = [cast(v) for v in values.split(',') if v]
+            except ValueError:
+                raise CommandError(f'잘못된 값: {param}')
+        return grid
@@ -19,12 +19,85 @@ HumbleB 테니스 클럽 대진표 생성 알고리즘 v7
 - 남복: 남자 4명 필요
 - 혼복: 남자 2명 + 여자 2명 필요
 - 같은 라운드에 동일인 중복 참여 불가
+
+=== 대규모 모드 (Pod 분할) ===
+- 60명+/10코트+ 오픈 모임은 전체를 한 번에 탐색하면 후보 수가 폭증
+- 참가자를 NTRP/성별 균형이 맞는 pod(코트 2~3면 단위)로 나눠 각각 독립적으로 생성
+- pod들은 프로세스 풀에서 병렬 처리
+- 마지막에 pod 경계를 넘어 연속 휴식/게임 수 편차를 교체(swap)로 보정
 """
+import os
 import random
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from itertools import combinations
 
 
+# Pod 모드 설정
+COURTS_PER_POD = 2  # pod 하나가 담당하는 코트 수 (홀수 코트면 마지막 pod가 3면)
+POD_MIN_PARTICIPANTS = 40  # 자동 모드에서 pod 분할을 시작하는 인원
+POD_MIN_COURTS = 4  # 자동 모드에서 pod 분할을 시작하는 코트 수
+
+# 코트 배치 순서: 남복 > 혼복 > 여복
+COURT_TYPE_PRIORITY = {'male': 0, 'mixed': 1, 'female': 2}
+
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """
+    매치 평가 가중치 (낮은 점수가 좋은 매치)
+    
+    기본값은 v7 알고리즘에 하드코딩되어 있던 값 그대로.
+    tuning.py의 탐색 하네스로 조합을 비교할 수 있다.
+    """
+    
+    # 0. 최대 게임수 도달 선수 포함 페널티 (1인당)
+    over_max: float = 5000
+    
+    # 1. 게임 수 균형
+    games_over_target: float = 10000  # 목표 초과 게임 1개당
+    games_at_target: float = 500  # 목표 달성
+    games_under_target: float = 200  # 부족 게임 1개당 보너스
+    games_deficit_bonus: float = 100  # 부족 게임 합계 보너스 (1인당 부족분)
+    
+    # 1.1 같은 성별 내 편차
+    gender_diff_from_min: float = 50000  # 같은 성별 최소 게임수보다 많은 1게임당
+    gender_gap: float = 100000  # 같은 성별 편차 2 이상일 때
+    
+    # 1.5 매치 타입 목표
+    type_over_target: float = 5000
+    type_at_target: float = 300
+    type_under_target: float = 300
+    type_deficit_bonus: float = 150
+    
+    # 2. 늦참/일퇴 긴급도 (urgency >= 1, >= 0.5, 그 외)
+    urgency_high: float = 2000
+    urgency_mid: float = 1000
+    urgency_low: float = 500
+    limited_multiplier: float = 2.0
+    limited_minority_multiplier: float = 3.0
+    
+    # 3. 연속 휴식 방지
+    must_play_bonus: float = 100000  # 2라운드 이상 휴식
+    rested_bonus: float = 3000  # 1라운드 휴식
+    
+    # 4~6. 조합 항목
+    ntrp_diff: float = 5  # 팀 NTRP 합 차이 1.0당
+    repeat_partner: float = 200
+    repeat_opponent: float = 30
+    
+    # 7. 랜덤 요소 범위 (±)
+    noise: float = 30
+    
+    # 매치 타입별 평가 후보 수 (품질 vs 계산량)
+    candidate_limit: int = 50
+
+
+DEFAULT_WEIGHTS = ScoringWeights()
+
+
 def get_match_type(players):
     """플레이어 리스트로 매치 타입 결정"""
     genders = [p.gender for p in players]
@@ -44,16 +117,48 @@ def get_match_type(players):
 class MatchMaker:
     """대진표 생성기 v7"""
     
-    def __init__(self, participants, num_courts=2, num_rounds=6):
+    def __init__(self, participants, num_courts=2, num_rounds=6, max_ntrp_gap=None, weights=None):
         self.participants = participants
         self.num_courts = num_courts
         self.num_rounds = num_rounds
         self.total_matches = num_courts * num_rounds
         
+        # 매치 평가 가중치
+        self.weights = weights or DEFAULT_WEIGHTS
+        
+        # 팀 NTRP 합 차이 허용치 (None이면 가지치기 없이 전체 탐색)
+        self.max_ntrp_gap = max_ntrp_gap
+        
         # 성별 분류
         self.males = [p for p in participants if p.gender == 'M']
         self.females = [p for p in participants if p.gender == 'F']
         
+        # 선수 인덱스 (후보 조합은 인덱스 4개를 정수 하나로 압축해서 다룸)
+        self.players = list(participants)
+        self.player_index = {p.id: i for i, p in enumerate(self.players)}
+        self._ids = [p.id for p in self.players]
+        self._slot_bits = 8 if len(self.players) <= 256 else 16
+        self._slot_mask = (1 << self._slot_bits) - 1
+        self._player_bits = [1 << i for i in range(len(self.players))]
+        
+        # NTRP 값 미리 변환 (_ntrp_raw: 변환 실패 시 None, _ntrp_key: 정렬용)
+        self._ntrp_raw = []
+        for p in self.players:
+            try:
+                self._ntrp_raw.append(float(p.ntrp))
+            except (TypeError, ValueError):
+                self._ntrp_raw.append(None)
+        self._ntrp_key = [_safe_ntrp(p.ntrp) for p in self.players]
+        
+        # 성별별 NTRP 오름차순 인덱스 (후보 생성 시 팀 합 차이를 미리 제한)
+        self.ntrp_order = {
+            gender: sorted(
+                (i for i, p in enumerate(self.players) if p.gender == gender),
+                key=lambda i: self._ntrp_key[i],
+            )
+            for gender in ('M', 'F')
+        }
+        
         # 추적 데이터
         self.games_played = {p.id: 0 for p in participants}
         self.match_type_count = {p.id: {'male': 0, 'female': 0, 'mixed': 0} for p in participants}
@@ -61,6 +166,18 @@ class MatchMaker:
         self.opponent_history = defaultdict(set)
         self.last_played_round = {p.id: 0 for p in participants}
         
+        # 라운드와 무관한 선수별 값 (가용 라운드 수, 소수 성별)
+        self.total_available_rounds = {
+            p.id: sum(1 for r in range(1, num_rounds + 1) if p.is_available_for_round(r))
+            for p in participants
+        }
+        self.minority_gender = 'F' if len(self.females) < len(self.males) else 'M' if len(self.males) < len(self.females) else None
+        
+        # 선수별 점수 캐시 (코트 하나를 정하는 동안 유효, update_history에서 무효화)
+        self._score_cache = {}
+        self._score_cache_round = None
+        self._gender_games_range = {}
+        
         # 매치 타입 계획 (가용 인원 고려)
         self.match_plan = self._create_match_plan_considering_availability()
         self.match_plan_original = self.match_plan.copy()
@@ -547,7 +664,30 @@ class MatchMaker:
             return 5.0
     
     def generate_valid_teams(self, match_type, players, strict_max_games=True, round_num=None):
-        """주어진 매치 타입에 맞는 유효한 팀 조합 생성"""
+        """주어진 매치 타입에 맞는 유효한 팀 조합 생성 → [(team_a, team_b, match_type), ...]"""
+        return [
+            self.unpack_candidate(candidate) + (match_type,)
+            for candidate in self._generate_candidates(match_type, players, strict_max_games, round_num)
+        ]
+    
+    def unpack_candidate(self, candidate):
+        """정수로 압축된 후보 → (team_a, team_b)"""
+        bits = self._slot_bits
+        mask = self._slot_mask
+        p = self.players
+        return (
+            (p[candidate & mask], p[candidate >> bits & mask]),
+            (p[candidate >> 2 * bits & mask], p[candidate >> 3 * bits]),
+        )
+    
+    def _generate_candidates(self, match_type, players, strict_max_games=True, round_num=None):
+        """
+        유효한 팀 조합을 정수 하나로 압축해서 생성
+        
+        선수 인덱스 4개(team_a[0], team_a[1], team_b[0], team_b[1])를 _slot_bits씩
+        하위 비트부터 채운다. 후보마다 튜플/리스트를 만들지 않으므로 탐색 루프의
+        할당이 거의 없다.
+        """
         # strict_max_games=True면 최대 게임수 도달 선수 제외
         # strict_max_games=False면 매치 타입 목표를 위해 허용
         # 단, 연속 휴식 중인 선수는 항상 포함!
@@ -565,236 +705,384 @@ class MatchMaker:
             
             return True
         
-        available = [p for p in players if should_include(p)]
+        # NTRP 인덱스 순서를 유지한 채 후보 선수 필터링 (선수 인덱스 리스트)
+        player_ids = {p.id for p in players}
+        males = [i for i in self.ntrp_order['M'] if self._ids[i] in player_ids and should_include(self.players[i])]
+        females = [i for i in self.ntrp_order['F'] if self._ids[i] in player_ids and should_include(self.players[i])]
+        
+        if self.max_ntrp_gap is not None:
+            banded = self._generate_banded_candidates(match_type, males, females)
+            # 허용치가 너무 좁아 후보가 없거나, 연속 휴식 중인 선수가 든 후보가
+            # 하나도 없으면 전체 탐색으로 대체 (가지치기로 우선 선수가 빠지지 않도록)
+            if banded and self._includes_must_play(banded, match_type, males, females, round_num):
+                return banded
+        
+        s1 = self._slot_bits
+        s2 = 2 * s1
+        s3 = 3 * s1
+        candidates = []
+        
+        if match_type in ('male', 'female'):
+            group = males if match_type == 'male' else females
+            if len(group) < 4:
+                return []
+            for a, b, c, d in combinations(group, 4):
+                candidates.append(a | b << s1 | c << s2 | d << s3)  # (a, b) vs (c, d)
+                candidates.append(a | c << s1 | b << s2 | d << s3)  # (a, c) vs (b, d)
+                candidates.append(a | d << s1 | b << s2 | c << s3)  # (a, d) vs (b, c)
+        
+        elif match_type == 'mixed':
+            if len(males) < 2 or len(females) < 2:
+                return []
+            for m1, m2 in combinations(males, 2):
+                for f1, f2 in combinations(females, 2):
+                    candidates.append(m1 | f1 << s1 | m2 << s2 | f2 << s3)  # (m1, f1) vs (m2, f2)
+                    candidates.append(m1 | f2 << s1 | m2 << s2 | f1 << s3)  # (m1, f2) vs (m2, f1)
+        
+        return candidates
+    
+    def _includes_must_play(self, candidates, match_type, males, females, round_num):
+        """이 매치 타입에 나올 수 있는 연속 휴식 선수가 없거나, 그중 누군가가 든 후보가 있는지"""
+        if not round_num:
+            return True
+        
+        if match_type == 'male':
+            group = males
+        elif match_type == 'female':
+            group = females
+        else:
+            group = males + females
+        
+        must_play_mask = 0
+        for i in group:
+            if round_num - self.last_played_round.get(self._ids[i], 0) >= 2:
+                must_play_mask |= self._player_bits[i]
+        if not must_play_mask:
+            return True
         
-        males = [p for p in available if p.gender == 'M']
-        females = [p for p in available if p.gender == 'F']
+        s1 = self._slot_bits
+        s2 = 2 * s1
+        s3 = 3 * s1
+        mask = self._slot_mask
+        bits = self._player_bits
+        return any(
+            (bits[c & mask] | bits[c >> s1 & mask] | bits[c >> s2 & mask] | bits[c >> s3]) & must_play_mask
+            for c in candidates
+        )
+    
+    def _generate_banded_candidates(self, match_type, males, females):
+        """
+        팀 NTRP 합 차이가 max_ntrp_gap 이하인 조합만 생성
         
-        valid_matches = []
+        가능한 팀(2인)을 NTRP 합 순으로 정렬한 뒤, 각 팀에 대해 합 차이가
+        허용치 안에 있는 구간만 훑는다. 최선의 조합조차 허용치를 넘는
+        4인 조합은 아예 만들어지지 않는다.
+        """
+        gap = self.max_ntrp_gap
+        ntrp = self._ntrp_key
         
         if match_type == 'male':
             if len(males) < 4:
                 return []
-            for four_males in combinations(males, 4):
-                m = list(four_males)
-                random.shuffle(m)  # 랜덤하게 섞기
-                arrangements = [
-                    ((m[0], m[1]), (m[2], m[3])),
-                    ((m[0], m[2]), (m[1], m[3])),
-                    ((m[0], m[3]), (m[1], m[2])),
-                ]
-                for team_a, team_b in arrangements:
-                    valid_matches.append((team_a, team_b, 'male'))
-        
+            teams = list(combinations(males, 2))
         elif match_type == 'female':
             if len(females) < 4:
                 return []
-            for four_females in combinations(females, 4):
-                f = list(four_females)
-                random.shuffle(f)  # 랜덤하게 섞기
-                arrangements = [
-                    ((f[0], f[1]), (f[2], f[3])),
-                    ((f[0], f[2]), (f[1], f[3])),
-                    ((f[0], f[3]), (f[1], f[2])),
-                ]
-                for team_a, team_b in arrangements:
-                    valid_matches.append((team_a, team_b, 'female'))
-        
+            teams = list(combinations(females, 2))
         elif match_type == 'mixed':
             if len(males) < 2 or len(females) < 2:
                 return []
-            for two_males in combinations(males, 2):
-                for two_females in combinations(females, 2):
-                    m = list(two_males)
-                    f = list(two_females)
-                    random.shuffle(m)
-                    random.shuffle(f)
-                    arrangements = [
-                        ((m[0], f[0]), (m[1], f[1])),
-                        ((m[0], f[1]), (m[1], f[0])),
-                    ]
-                    for team_a, team_b in arrangements:
-                        valid_matches.append((team_a, team_b, 'mixed'))
-        
-        return valid_matches
+            teams = [(m, f) for m in males for f in females]
+        else:
+            return []
+        
+        teams.sort(key=lambda t: ntrp[t[0]] + ntrp[t[1]])
+        sums = [ntrp[a] + ntrp[b] for a, b in teams]
+        
+        s1 = self._slot_bits
+        s2 = 2 * s1
+        s3 = 3 * s1
+        candidates = []
+        for i, (a0, a1) in enumerate(teams):
+            j = i + 1
+            while j < len(teams) and sums[j] - sums[i] <= gap:
+                b0, b1 = teams[j]
+                if b0 != a0 and b0 != a1 and b1 != a0 and b1 != a1:
+                    candidates.append(a0 | a1 << s1 | b0 << s2 | b1 << s3)
+                j += 1
+        
+        return candidates
     
-    def evaluate_match(self, team_a, team_b, match_type, round_num, allow_over_max=False):
-        """매치 품질 평가 (낮을수록 좋음) - 게임수 균등화 + 매치타입 분배 최우선"""
+    def _reset_score_cache(self, round_num):
+        """선수별 점수 캐시 초기화 + 같은 성별 게임수 범위 재계산"""
+        self._score_cache = {}
+        self._score_cache_round = round_num
+        
+        self._gender_games_range = {}
+        for gender, group in (('M', self.males), ('F', self.females)):
+            if group:
+                played = [self.games_played.get(p.id, 0) for p in group]
+                self._gender_games_range[gender] = (min(played), max(played))
+    
+    def _score_row(self, match_type, round_num):
+        """
+        매치 타입별 선수 점수 캐시 (선수 인덱스 → (최대 게임수 도달 여부, 점수))
+        
+        게임 수/같은 성별 편차/매치 타입/긴급도/연속 휴식 항목은 모두 선수별로
+        더해지므로 4인 조합과 무관하게 계산할 수 있다. 한 코트를 정하는 동안
+        라운드 상태는 변하지 않으므로 캐시해 두고 update_history에서 무효화한다.
+        """
+        if self._score_cache_round != round_num:
+            self._reset_score_cache(round_num)
+        
+        row = self._score_cache.get(match_type)
+        if row is None:
+            row = self._score_cache[match_type] = [None] * len(self.players)
+        return row
+    
+    def _player_score(self, p, match_type, round_num, allow_over_max=False):
+        """매치 평가 중 선수 한 명에만 의존하는 항목의 합 (캐시 사용)"""
+        row = self._score_row(match_type, round_num)
+        idx = self.player_index[p.id]
+        
+        cached = row[idx]
+        if cached is None:
+            cached = row[idx] = self._compute_player_score(p, match_type, round_num)
+        
+        at_max, score = cached
+        if at_max and not allow_over_max:
+            return float('inf')  # 절대 선택 안 함
+        return score
+    
+    def _compute_player_score(self, p, match_type, round_num):
+        """선수별 점수 계산 → (최대 게임수 도달 여부, 점수)"""
+        w = self.weights
         score = 0
-        all_players = list(team_a) + list(team_b)
         
         # 0. 최대 게임수 초과 방지 (매치 타입 달성을 위해 allow_over_max=True면 완화)
-        over_max_count = sum(1 for p in all_players if self.is_at_max_games(p))
-        if over_max_count > 0:
-            if not allow_over_max:
-                return float('inf')  # 절대 선택 안 함
-            else:
-                # 매치 타입 목표 달성을 위해 허용하되, 큰 페널티 부과
-                score += over_max_count * 5000
+        at_max = self.is_at_max_games(p)
+        if at_max:
+            # 매치 타입 목표 달성을 위해 허용하되, 큰 페널티 부과
+            score += w.over_max
         
         # 1. 게임 수 균형 (최우선!)
-        total_deficit = 0
-        for p in all_players:
-            deficit = self.get_games_deficit(p)
-            total_deficit += deficit
-            
-            if deficit < 0:  # 이미 목표 초과
-                score += abs(deficit) * 10000  # 매우 큰 페널티
-            elif deficit == 0:  # 목표 달성
-                score += 500  # 페널티 (아직 부족한 사람 우선)
-            else:  # 아직 부족
-                score -= deficit * 200  # 큰 보너스
+        deficit = self.get_games_deficit(p)
+        if deficit < 0:  # 이미 목표 초과
+            score += abs(deficit) * w.games_over_target  # 매우 큰 페널티
+        elif deficit == 0:  # 목표 달성
+            score += w.games_at_target  # 페널티 (아직 부족한 사람 우선)
+        else:  # 아직 부족
+            score -= deficit * w.games_under_target  # 큰 보너스
         
         # 게임이 가장 부족한 사람들 조합에 보너스
-        score -= total_deficit * 100
+        score -= deficit * w.games_deficit_bonus
         
         # 1.1 같은 성별 내 게임수 편차 페널티 (균등화 강화!)
-        for p in all_players:
-            same_gender = self.females if p.gender == 'F' else self.males
-            played = self.games_played.get(p.id, 0)
-            
-            # 같은 성별 중 가장 적게 한 사람의 게임수
-            min_games_same_gender = min(self.games_played.get(sp.id, 0) for sp in same_gender)
-            max_games_same_gender = max(self.games_played.get(sp.id, 0) for sp in same_gender)
-            
-            # 내가 같은 성별 최소보다 많이 했으면 페널티
-            diff_from_min = played - min_games_same_gender
-            if diff_from_min >= 1:
-                score += diff_from_min * 50000  # 매우 큰 페널티 (균등화 최우선!)
-            
-            # 같은 성별 내 편차가 2 이상이면 최소 게임수인 사람만 선택
-            gender_gap = max_games_same_gender - min_games_same_gender
-            if gender_gap >= 2 and played > min_games_same_gender:
-                score += 100000  # 사실상 불가능
+        played = self.games_played.get(p.id, 0)
+        
+        # 같은 성별 중 가장 적게/많이 한 사람의 게임수
+        min_games_same_gender, max_games_same_gender = self._gender_games_range.get(
+            'F' if p.gender == 'F' else 'M', (played, played)
+        )
+        
+        # 내가 같은 성별 최소보다 많이 했으면 페널티
+        diff_from_min = played - min_games_same_gender
+        if diff_from_min >= 1:
+            score += diff_from_min * w.gender_diff_from_min  # 매우 큰 페널티 (균등화 최우선!)
+        
+        # 같은 성별 내 편차가 2 이상이면 최소 게임수인 사람만 선택
+        gender_gap = max_games_same_gender - min_games_same_gender
+        if gender_gap >= 2 and played > min_games_same_gender:
+            score += w.gender_gap  # 사실상 불가능
         
         # 1.5. 매치 타입별 목표 달성 (중요!)
-        total_type_deficit = 0
-        for p in all_players:
-            type_deficit = self.get_match_type_deficit(p, match_type)
-            total_type_deficit += type_deficit
-            
-            if type_deficit < 0:  # 이 타입 목표 초과
-                score += abs(type_deficit) * 5000  # 큰 페널티
-            elif type_deficit == 0:  # 이 타입 목표 달성
-                score += 300  # 페널티
-            else:  # 아직 부족
-                score -= type_deficit * 300  # 보너스
+        type_deficit = self.get_match_type_deficit(p, match_type)
+        if type_deficit < 0:  # 이 타입 목표 초과
+            score += abs(type_deficit) * w.type_over_target  # 큰 페널티
+        elif type_deficit == 0:  # 이 타입 목표 달성
+            score += w.type_at_target  # 페널티
+        else:  # 아직 부족
+            score -= type_deficit * w.type_under_target  # 보너스
         
         # 매치 타입 부족한 사람들 조합에 보너스
-        score -= total_type_deficit * 150
+        score -= type_deficit * w.type_deficit_bonus
         
         # 2. 늦참/일퇴 참가자 우선 (긴급도) - 더 강화!
-        for p in all_players:
-            total_available = sum(1 for r in range(1, self.num_rounds + 1) 
-                                  if p.is_available_for_round(r))
-            remaining_rounds = sum(1 for r in range(round_num, self.num_rounds + 1) 
-                                   if p.is_available_for_round(r))
-            deficit = self.get_games_deficit(p)
+        total_available = self.total_available_rounds.get(p.id, self.num_rounds)
+        remaining_rounds = sum(1 for r in range(round_num, self.num_rounds + 1) 
+                               if p.is_available_for_round(r))
+        
+        # 가용 라운드가 전체보다 적은 선수 (늦참/일퇴)
+        is_limited = total_available < self.num_rounds
+        
+        if remaining_rounds > 0 and deficit > 0:
+            urgency = deficit / remaining_rounds
             
-            # 가용 라운드가 전체보다 적은 선수 (늦참/일퇴)
-            is_limited = total_available < self.num_rounds
+            # 늦참/일퇴 선수에게 더 큰 보너스
+            multiplier = w.limited_multiplier if is_limited else 1.0
             
-            if remaining_rounds > 0 and deficit > 0:
-                urgency = deficit / remaining_rounds
-                
-                # 늦참/일퇴 선수에게 더 큰 보너스
-                multiplier = 2.0 if is_limited else 1.0
-                
-                # 소수 성별이면서 제한된 참가자면 더 큰 보너스
-                minority_gender = 'F' if len(self.females) < len(self.males) else 'M' if len(self.males) < len(self.females) else None
-                if is_limited and minority_gender and p.gender == minority_gender:
-                    multiplier = 3.0
-                
-                if urgency >= 1:
-                    score -= urgency * 2000 * multiplier  # 매우 높은 보너스
-                elif urgency >= 0.5:
-                    score -= urgency * 1000 * multiplier
-                else:
-                    score -= urgency * 500 * multiplier
+            # 소수 성별이면서 제한된 참가자면 더 큰 보너스
+            if is_limited and self.minority_gender and p.gender == self.minority_gender:
+                multiplier = w.limited_minority_multiplier
+            
+            if urgency >= 1:
+                score -= urgency * w.urgency_high * multiplier  # 매우 높은 보너스
+            elif urgency >= 0.5:
+                score -= urgency * w.urgency_mid * multiplier
+            else:
+                score -= urgency * w.urgency_low * multiplier
         
         # 3. 연속 휴식 방지 (강제!)
-        for p in all_players:
-            rounds_since = round_num - self.last_played_round.get(p.id, 0)
-            if rounds_since >= 2:  # 2라운드 이상 쉬었으면 반드시 참여
-                score -= 100000  # 매우 큰 보너스
-            elif rounds_since == 1:  # 1라운드 쉬었으면 우선
-                score -= 3000
+        rounds_since = round_num - self.last_played_round.get(p.id, 0)
+        if rounds_since >= 2:  # 2라운드 이상 쉬었으면 반드시 참여
+            score -= w.must_play_bonus  # 매우 큰 보너스
+        elif rounds_since == 1:  # 1라운드 쉬었으면 우선
+            score -= w.rested_bonus
         
-        # 4. NTRP 밸런스
+        return at_max, score
+    
+    def _ntrp_score(self, team_a, team_b):
+        """4. NTRP 밸런스"""
         ntrp_diff = abs(self.calculate_team_ntrp(*team_a) - self.calculate_team_ntrp(*team_b))
-        score += ntrp_diff * 5
+        return ntrp_diff * self.weights.ntrp_diff
+    
+    def _team_ntrp_at(self, i, j):
+        """calculate_team_ntrp의 선수 인덱스 버전 (NTRP 값은 미리 변환해 둠)"""
+        a = self._ntrp_raw[i]
+        b = self._ntrp_raw[j]
+        if a is None or b is None:
+            return 5.0
+        return a + b
+    
+    def _history_score(self, team_a, team_b):
+        """파트너/상대 중복 페널티"""
+        return self._history_score_ids(team_a[0].id, team_a[1].id, team_b[0].id, team_b[1].id)
+    
+    def _history_score_ids(self, a0, a1, b0, b1):
+        w = self.weights
+        score = 0
+        empty = frozenset()
         
         # 5. 파트너 중복 방지
-        if team_a[1].id in self.partner_history.get(team_a[0].id, set()):
-            score += 200
-        if team_b[1].id in self.partner_history.get(team_b[0].id, set()):
-            score += 200
+        if a1 in self.partner_history.get(a0, empty):
+            score += w.repeat_partner
+        if b1 in self.partner_history.get(b0, empty):
+            score += w.repeat_partner
         
         # 6. 상대 중복 방지
-        for pa in team_a:
-            for pb in team_b:
-                if pb.id in self.opponent_history.get(pa.id, set()):
-                    score += 30
+        for pa in (a0, a1):
+            opponents = self.opponent_history.get(pa, empty)
+            if b0 in opponents:
+                score += w.repeat_opponent
+            if b1 in opponents:
+                score += w.repeat_opponent
+        
+        return score
+    
+    def evaluate_match(self, team_a, team_b, match_type, round_num, allow_over_max=False):
+        """매치 품질 평가 (낮을수록 좋음) - 게임수 균등화 + 매치타입 분배 최우선"""
+        score = 0
+        for p in list(team_a) + list(team_b):
+            score += self._player_score(p, match_type, round_num, allow_over_max)
+        
+        if score == float('inf'):
+            return score
+        
+        score += self._ntrp_score(team_a, team_b)
+        score += self._history_score(team_a, team_b)
         
         # 7. 랜덤 요소 (균등화를 깨지 않는 범위에서만!)
-        score += random.uniform(-30, 30)
+        score += random.uniform(-self.weights.noise, self.weights.noise)
         
         return score
     
     def find_best_match_for_type(self, players, round_num, match_type):
         """특정 매치 타입에 대해 최적의 매치 찾기"""
-        # 연속 휴식 중인 선수 파악
-        must_play = [
-            p for p in players 
-            if round_num - self.last_played_round.get(p.id, 0) >= 2
-        ]
+        # 연속 휴식 중인 선수 비트마스크 (선수 인덱스 기준)
+        must_play_mask = 0
+        for p in players:
+            if round_num - self.last_played_round.get(p.id, 0) >= 2:
+                must_play_mask |= self._player_bits[self.player_index[p.id]]
         
         # 먼저 strict mode로 시도 (연속 휴식 중인 선수는 항상 포함)
-        valid_matches = self.generate_valid_teams(match_type, players, strict_max_games=True, round_num=round_num)
+        candidates = self._generate_candidates(match_type, players, strict_max_games=True, round_num=round_num)
         
         # strict mode에서 불가능하면 완화해서 재시도
-        if not valid_matches:
-            valid_matches = self.generate_valid_teams(match_type, players, strict_max_games=False, round_num=round_num)
+        if not candidates:
+            candidates = self._generate_candidates(match_type, players, strict_max_games=False, round_num=round_num)
         
-        if not valid_matches:
+        if not candidates:
             return None, float('inf')
         
+        s1 = self._slot_bits
+        s2 = 2 * s1
+        s3 = 3 * s1
+        mask = self._slot_mask
+        
         # 연속 휴식 중인 선수가 있으면 해당 선수가 포함된 매치를 우선!
-        if must_play:
-            must_play_ids = {p.id for p in must_play}
-            prioritized = []
-            others = []
-            
-            for match in valid_matches:
-                team_a, team_b, mtype = match
-                all_in_match = list(team_a) + list(team_b)
-                match_player_ids = {p.id for p in all_in_match}
-                
-                # 연속 휴식 중인 선수가 포함되어 있으면 우선
-                if match_player_ids & must_play_ids:
-                    prioritized.append(match)
-                else:
-                    others.append(match)
+        if must_play_mask:
+            bits = self._player_bits
+            prioritized = [
+                c for c in candidates
+                if (bits[c & mask] | bits[c >> s1 & mask] | bits[c >> s2 & mask] | bits[c >> s3]) & must_play_mask
+            ]
             
             # 우선 매치가 있으면 그것만 평가
             if prioritized:
-                valid_matches = prioritized
+                candidates = prioritized
         
         # 완전히 랜덤하게 섞기!
-        random.shuffle(valid_matches)
+        random.shuffle(candidates)
         
-        best_match = None
+        # 이번 탐색에 나올 수 있는 선수 점수를 미리 채움 (코트 결정 동안 재사용)
+        row = self._score_row(match_type, round_num)
+        for p in players:
+            idx = self.player_index[p.id]
+            if row[idx] is None:
+                row[idx] = self._compute_player_score(p, match_type, round_num)
+        
+        ids = self._ids
+        team_ntrp = self._team_ntrp_at
+        ntrp_weight = self.weights.ntrp_diff
+        noise = self.weights.noise
+        
+        best_candidate = None
         best_score = float('inf')
         
-        # 상위 N개만 평가
-        for team_a, team_b, mtype in valid_matches[:50]:
-            score = self.evaluate_match(team_a, team_b, mtype, round_num, allow_over_max=True)
+        # 상위 N개만 평가 (선수별 점수는 캐시된 값 4개의 합)
+        for c in candidates[:self.weights.candidate_limit]:
+            a0 = c & mask
+            a1 = c >> s1 & mask
+            b0 = c >> s2 & mask
+            b1 = c >> s3
+            
+            score = row[a0][1] + row[a1][1] + row[b0][1] + row[b1][1]
+            score += abs(team_ntrp(a0, a1) - team_ntrp(b0, b1)) * ntrp_weight
+            
+            # 하한(파트너/상대 페널티 0, 랜덤 최솟값)으로도 현재 최선을 못 이기면 건너뜀
+            if score - noise >= best_score:
+                continue
+            
+            score += self._history_score_ids(ids[a0], ids[a1], ids[b0], ids[b1])
+            score += random.uniform(-noise, noise)
             
             if score < best_score:
                 best_score = score
-                best_match = (team_a, team_b, mtype)
+                best_candidate = c
+        
+        if best_candidate is None:
+            return None, float('inf')
+        
+        # 최종 매치만 선수 객체로 풀고, 팀/파트너 순서는 랜덤하게
+        team_a, team_b = self.unpack_candidate(best_candidate)
+        if random.random() < 0.5:
+            team_a, team_b = team_b, team_a
+        if random.random() < 0.5:
+            team_a = (team_a[1], team_a[0])
+        if random.random() < 0.5:
+            team_b = (team_b[1], team_b[0])
         
-        return best_match, best_score
+        return (team_a, team_b, match_type), best_score
     
     def find_any_valid_match(self, players, round_num):
         """가능한 아무 매치나 찾기 (계획된 타입이 불가능할 때)"""
@@ -839,6 +1127,9 @@ class MatchMaker:
         """매치 기록 업데이트"""
         all_players = list(team_a) + list(team_b)
         
+        # 라운드 상태가 바뀌므로 선수별 점수 캐시 무효화
+        self._score_cache_round = None
+        
         for p in all_players:
             self.games_played[p.id] += 1
             self.match_type_count[p.id][match_type] += 1
@@ -876,11 +1167,11 @@ class MatchMaker:
                 can_play.append(p)
         
         # 소수 성별 확인
-        minority_gender = 'F' if len(self.females) < len(self.males) else 'M' if len(self.males) < len(self.females) else None
+        minority_gender = self.minority_gender
         
         def player_priority(p):
             deficit = self.get_games_deficit(p)
-            total_available = sum(1 for r in range(1, self.num_rounds + 1) if p.is_available_for_round(r))
+            total_available = self.total_available_rounds[p.id]
             remaining_rounds = sum(1 for r in range(round_num, self.num_rounds + 1) if p.is_available_for_round(r))
             
             # 연속 휴식 체크 (최우선!)
@@ -958,8 +1249,7 @@ class MatchMaker:
         if len(matches) <= 1:
             return matches
         
-        type_priority = {'male': 0, 'mixed': 1, 'female': 2}
-        sorted_matches = sorted(matches, key=lambda m: type_priority.get(m.get('match_type', 'mixed'), 2))
+        sorted_matches = sorted(matches, key=lambda m: COURT_TYPE_PRIORITY.get(m.get('match_type', 'mixed'), 2))
         
         for i, match in enumerate(sorted_matches):
             match['court'] = i + 1
@@ -981,7 +1271,333 @@ class MatchMaker:
         return schedule
 
 
-def generate_match_schedule(participants, num_courts=2, num_rounds=6):
-    """대진표 생성 헬퍼 함수"""
-    maker = MatchMaker(participants, num_courts, num_rounds)
+class PlayerSnapshot:
+    """
+    프로세스 간 전달용 참가자 스냅샷
+    
+    Participant는 gender/ntrp 접근 시 member를 조회하므로 워커 프로세스에서
+    DB를 건드리지 않도록 필요한 값만 복사해서 넘긴다.
+    """
+    
+    __slots__ = ('id', 'gender', 'ntrp', 'available_rounds')
+    
+    def __init__(self, id, gender, ntrp, available_rounds):
+        self.id = id
+        self.gender = gender
+        self.ntrp = ntrp
+        self.available_rounds = available_rounds
+    
+    @classmethod
+    def from_participant(cls, participant, num_rounds):
+        available = frozenset(
+            r for r in range(1, num_rounds + 1) if participant.is_available_for_round(r)
+        )
+        return cls(participant.id, participant.gender, participant.ntrp, available)
+    
+    def is_available_for_round(self, round_num):
+        return round_num in self.available_rounds
+
+
+def _solve_pod(job):
+    """
+    pod 하나의 대진 생성 (프로세스 풀 워커)
+    
+    결과는 피클 비용을 줄이기 위해 참가자 id만으로 반환:
+    [(라운드, [(team_a_ids, team_b_ids, match_type), ...], resting_ids), ...]
+    """
+    snapshots, num_courts, num_rounds, max_ntrp_gap, weights, seed = job
+    random.seed(seed)
+    
+    maker = MatchMaker(snapshots, num_courts, num_rounds, max_ntrp_gap=max_ntrp_gap, weights=weights)
+    result = []
+    for round_data in maker.generate_matches():
+        matches = [
+            (
+                tuple(p.id for p in m['team_a']),
+                tuple(p.id for p in m['team_b']),
+                m['match_type'],
+            )
+            for m in round_data['matches']
+        ]
+        resting = [p.id for p in round_data['resting']]
+        result.append((round_data['round'], matches, resting))
+    return result
+
+
+class PodMatchMaker:
+    """
+    대규모 모임용 대진표 생성기 (pod 분할 + 병렬 처리 + 경계 보정)
+    
+    1. 코트를 COURTS_PER_POD 단위로 묶고, 코트 수 비율대로 성별별 인원 배분
+    2. 성별 안에서 NTRP 순 스네이크 드래프트로 pod 간 실력 균형 유지
+    3. 각 pod를 MatchMaker로 독립 생성 (프로세스 풀)
+    4. 합친 뒤 pod 경계를 넘는 교체로 연속 휴식/게임 수 편차 보정
+    """
+    
+    def __init__(self, participants, num_courts=2, num_rounds=6, max_workers=None, max_ntrp_gap=None,
+                 weights=None):
+        self.participants = participants
+        self.num_courts = num_courts
+        self.num_rounds = num_rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_ntrp_gap = max_ntrp_gap
+        self.weights = weights
+        
+        self.by_id = {p.id: p for p in participants}
+        self.snapshots = {p.id: PlayerSnapshot.from_participant(p, num_rounds) for p in participants}
+    
+    def _pod_court_counts(self):
+        """pod별 코트 수 (남는 코트는 마지막 pod에 합침)"""
+        num_pods = max(1, self.num_courts // COURTS_PER_POD)
+        counts = [COURTS_PER_POD] * num_pods
+        counts[-1] += self.num_courts - COURTS_PER_POD * num_pods
+        return counts
+    
+    @staticmethod
+    def _allocate_in_pairs(total, weights):
+        """
+        인원을 가중치 비율대로 2명 단위로 배분 (최대 나머지 방식)
+        
+        혼복에는 같은 성별 2명이 필요하므로 1명만 있는 pod가 생기지 않게 한다.
+        홀수로 남는 1명은 가장 많이 배정된 pod에 추가.
+        """
+        pairs = total // 2
+        weight_sum = sum(weights)
+        exact = [pairs * w / weight_sum for w in weights]
+        alloc = [int(x) for x in exact]
+        
+        leftover = pairs - sum(alloc)
+        by_remainder = sorted(range(len(weights)), key=lambda i: exact[i] - alloc[i], reverse=True)
+        for i in by_remainder[:leftover]:
+            alloc[i] += 1
+        
+        alloc = [a * 2 for a in alloc]
+        if total % 2:
+            alloc[max(range(len(alloc)), key=lambda i: alloc[i])] += 1
+        return alloc
+    
+    def _partition(self, court_counts):
+        """NTRP/성별 균형 pod 분할 → [[snapshot, ...], ...]"""
+        pods = [[] for _ in court_counts]
+        
+        for gender in ('M', 'F'):
+            players = [s for s in self.snapshots.values() if s.gender == gender]
+            quotas = self._allocate_in_pairs(len(players), court_counts)
+            
+            # 늦참/일퇴 선수를 먼저 고르게 뿌리고, 그 안에서는 NTRP 내림차순
+            random.shuffle(players)
+            players.sort(key=lambda s: (
+                len(s.available_rounds) >= self.num_rounds,
+                -_safe_ntrp(s.ntrp),
+            ))
+            
+            # 스네이크 드래프트 (정원이 찬 pod는 건너뜀)
+            order = list(range(len(pods)))
+            assigned = [0] * len(pods)
+            remaining = list(players)
+            while remaining:
+                for pod_idx in order:
+                    if remaining and assigned[pod_idx] < quotas[pod_idx]:
+                        pods[pod_idx].append(remaining.pop(0))
+                        assigned[pod_idx] += 1
+                order.reverse()
+        
+        return pods
+    
+    def _run_pods(self, jobs):
+        """pod들을 프로세스 풀에서 병렬 생성 (풀 사용 불가 시 순차 처리)"""
+        workers = min(len(jobs), self.max_workers)
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(_solve_pod, jobs))
+            except (OSError, BrokenProcessPool):
+                pass
+        return [_solve_pod(job) for job in jobs]
+    
+    def _repair(self, rounds):
+        """
+        pod 경계를 넘는 보정
+        
+        rounds: {라운드: {'matches': [[team_a_ids, team_b_ids, type], ...], 'resting': set(ids)}}
+        
+        - pod 안에서 인원이 모자라 비어 있는 코트를 다른 pod의 휴식 선수로 채움
+        - 연속 휴식 중인 선수를 같은 성별의, 직전/다음 라운드에 쉬지 않는 선수와 교체
+        - 전체 게임 수 편차가 2 이상이면 같은 방식으로 교체해 평탄화
+        """
+        games = defaultdict(int)
+        for data in rounds.values():
+            for team_a, team_b, _ in data['matches']:
+                for pid in team_a + team_b:
+                    games[pid] += 1
+        
+        def build_extra_match(resting_ids):
+            """휴식 선수 중 게임 수가 가장 적은 4명으로 매치 구성"""
+            by_gender = {'M': [], 'F': []}
+            for pid in sorted(resting_ids, key=lambda i: (games[i], random.random())):
+                by_gender.setdefault(self.snapshots[pid].gender, []).append(pid)
+            
+            options = []
+            if len(by_gender['M']) >= 4:
+                options.append(('male', by_gender['M'][:4]))
+            if len(by_gender['F']) >= 4:
+                options.append(('female', by_gender['F'][:4]))
+            if len(by_gender['M']) >= 2 and len(by_gender['F']) >= 2:
+                options.append(('mixed', by_gender['M'][:2] + by_gender['F'][:2]))
+            if not options:
+                return None
+            
+            match_type, ids = min(options, key=lambda o: sum(games[i] for i in o[1]))
+            if match_type == 'mixed':
+                m1, m2, f1, f2 = sorted(ids[:2], key=lambda i: _safe_ntrp(self.snapshots[i].ntrp)) + \
+                    sorted(ids[2:], key=lambda i: _safe_ntrp(self.snapshots[i].ntrp))
+                return [(m1, f2), (m2, f1), match_type]
+            # NTRP 정렬 후 (최고+최저) vs (중간 두 명)이 가장 균형 잡힌 조합
+            a, b, c, d = sorted(ids, key=lambda i: _safe_ntrp(self.snapshots[i].ntrp))
+            return [(a, d), (b, c), match_type]
+        
+        def find_swap(round_num, resting_id, require_gap):
+            resting_player = self.snapshots[resting_id]
+            prev_resting = rounds.get(round_num - 1, {}).get('resting', set())
+            next_resting = rounds.get(round_num + 1, {}).get('resting', set())
+            
+            best = None
+            best_key = None
+            for match in rounds[round_num]['matches']:
+                for team_idx in (0, 1):
+                    for slot, pid in enumerate(match[team_idx]):
+                        candidate = self.snapshots[pid]
+                        if candidate.gender != resting_player.gender:
+                            continue
+                        # 교체로 빠지는 선수가 연속 휴식이 되면 안 됨
+                        if pid in prev_resting or pid in next_resting:
+                            continue
+                        if require_gap and games[pid] - games[resting_id] < 2:
+                            continue
+                        ntrp_gap = abs(_safe_ntrp(candidate.ntrp) - _safe_ntrp(resting_player.ntrp))
+                        key = (-games[pid], ntrp_gap)
+                        if best_key is None or key < best_key:
+                            best_key = key
+                            best = (match, team_idx, slot)
+            return best
+        
+        def apply_swap(round_num, resting_id, swap):
+            match, team_idx, slot = swap
+            team = list(match[team_idx])
+            out_id = team[slot]
+            team[slot] = resting_id
+            match[team_idx] = tuple(team)
+            
+            resting = rounds[round_num]['resting']
+            resting.discard(resting_id)
+            resting.add(out_id)
+            games[resting_id] += 1
+            games[out_id] -= 1
+        
+        # 1단계: 빈 코트 채우기
+        for round_num in range(1, self.num_rounds + 1):
+            data = rounds[round_num]
+            while len(data['matches']) < self.num_courts:
+                match = build_extra_match(data['resting'])
+                if not match:
+                    break
+                data['matches'].append(match)
+                for pid in match[0] + match[1]:
+                    data['resting'].discard(pid)
+                    games[pid] += 1
+        
+        # 2단계: 연속 휴식 해소
+        for round_num in range(2, self.num_rounds + 1):
+            prev_resting = rounds[round_num - 1]['resting']
+            for pid in sorted(rounds[round_num]['resting'] & prev_resting, key=lambda i: games[i]):
+                swap = find_swap(round_num, pid, require_gap=False)
+                if swap:
+                    apply_swap(round_num, pid, swap)
+        
+        # 3단계: 게임 수 편차 평탄화
+        for round_num in range(1, self.num_rounds + 1):
+            for pid in sorted(rounds[round_num]['resting'], key=lambda i: games[i]):
+                swap = find_swap(round_num, pid, require_gap=True)
+                if swap:
+                    apply_swap(round_num, pid, swap)
+    
+    def generate_matches(self):
+        """전체 대진표 생성 (MatchMaker.generate_matches와 같은 형식)"""
+        court_counts = self._pod_court_counts()
+        pods = self._partition(court_counts)
+        
+        jobs = [
+            (pod, courts, self.num_rounds, self.max_ntrp_gap, self.weights, random.randrange(2 ** 32))
+            for pod, courts in zip(pods, court_counts)
+        ]
+        pod_results = self._run_pods(jobs)
+        
+        # pod 결과 병합
+        rounds = {
+            r: {'matches': [], 'resting': set()}
+            for r in range(1, self.num_rounds + 1)
+        }
+        for pod_result in pod_results:
+            for round_num, matches, resting in pod_result:
+                rounds[round_num]['matches'].extend([list(m) for m in matches])
+                rounds[round_num]['resting'].update(resting)
+        
+        self._repair(rounds)
+        
+        schedule = []
+        for round_num in range(1, self.num_rounds + 1):
+            data = rounds[round_num]
+            matches = [
+                {
+                    'round': round_num,
+                    'court': 0,
+                    'team_a': tuple(self.by_id[pid] for pid in team_a),
+                    'team_b': tuple(self.by_id[pid] for pid in team_b),
+                    'match_type': match_type,
+                }
+                for team_a, team_b, match_type in data['matches']
+            ]
+            matches.sort(key=lambda m: COURT_TYPE_PRIORITY.get(m['match_type'], 2))
+            for i, match in enumerate(matches):
+                match['court'] = i + 1
+            
+            # 휴식 순서는 원래 참가자 순서 유지
+            resting = [p for p in self.participants if p.id in data['resting']]
+            schedule.append({
+                'round': round_num,
+                'matches': matches,
+                'resting': resting,
+            })
+        
+        return schedule
+
+
+def _safe_ntrp(ntrp):
+    try:
+        return float(ntrp)
+    except (TypeError, ValueError):
+        return 2.5
+
+
+def should_use_pods(participants, num_courts):
+    """자동 모드: 대규모 모임이면 pod 분할 사용"""
+    return len(participants) >= POD_MIN_PARTICIPANTS and num_courts >= POD_MIN_COURTS
+
+
+def generate_match_schedule(participants, num_courts=2, num_rounds=6, use_pods=None, max_ntrp_gap=None,
+                            weights=None):
+    """
+    대진표 생성 헬퍼 함수
+    
+    use_pods: None이면 인원/코트 수로 자동 결정, True/False면 강제
+    max_ntrp_gap: 팀 NTRP 합 차이 허용치 (None이면 가지치기 없음)
+    weights: ScoringWeights (None이면 기본 가중치)
+    """
+    if use_pods is None:
+        use_pods = should_use_pods(participants, num_courts)
+    
+    if use_pods and num_courts >= 2 * COURTS_PER_POD:
+        maker = PodMatchMaker(participants, num_courts, num_rounds, max_ntrp_gap=max_ntrp_gap, weights=weights)
+    else:
+        maker = MatchMaker(participants, num_courts, num_rounds, max_ntrp_gap=max_ntrp_gap, weights=weights)
     return maker.generate_matches()
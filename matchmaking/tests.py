@@ -0,0 +1,77 @@
+import json
+import random
+
+from django.test import SimpleTestCase, TestCase
+
+from .matchmaker import MatchMaker, PlayerSnapshot
+from .models import MatchSession
+
+
+def snapshot(id, gender, ntrp, num_rounds=6):
+    return PlayerSnapshot(id, gender, ntrp, frozenset(range(1, num_rounds + 1)))
+
+
+class BandedCandidateTests(SimpleTestCase):
+    def setUp(self):
+        random.seed(0)
+        # 3.0 네 명 + 혼자 동떨어진 5.5 (5.5가 든 팀은 어느 팀과도 합 차이 2.5)
+        self.players = [snapshot(i, 'M', '3.0') for i in range(1, 5)] + [snapshot(5, 'M', '5.5')]
+        self.maker = MatchMaker(self.players, num_courts=1, max_ntrp_gap=0.5)
+    
+    def members(self, candidate):
+        team_a, team_b = self.maker.unpack_candidate(candidate)
+        return {p.id for p in team_a + team_b}
+    
+    def test_banded_candidates_stay_within_gap(self):
+        candidates = self.maker._generate_candidates('male', self.players)
+        
+        self.assertTrue(candidates)
+        for candidate in candidates:
+            team_a, team_b = self.maker.unpack_candidate(candidate)
+            gap = abs(self.maker.calculate_team_ntrp(*team_a) - self.maker.calculate_team_ntrp(*team_b))
+            self.assertLessEqual(gap, 0.5)
+            self.assertNotIn(5, self.members(candidate))
+    
+    def test_banded_candidates_are_subset_of_full_enumeration(self):
+        full = MatchMaker(self.players, num_courts=1)
+        
+        def quads(maker):
+            return {
+                frozenset((frozenset(p.id for p in a), frozenset(p.id for p in b)))
+                for a, b in map(maker.unpack_candidate, maker._generate_candidates('male', self.players))
+            }
+        
+        self.assertLess(quads(self.maker), quads(full))
+    
+    def test_falls_back_to_full_enumeration_for_must_play_player(self):
+        # 5.5 선수만 2라운드 이상 쉬었고 나머지는 직전 라운드에 뛰었음
+        round_num = 3
+        for p in self.players[:4]:
+            self.maker.last_played_round[p.id] = 2
+        
+        candidates = self.maker._generate_candidates('male', self.players, round_num=round_num)
+        self.assertTrue(any(5 in self.members(c) for c in candidates))
+        
+        match, _ = self.maker.find_best_match_for_type(self.players, round_num, 'male')
+        team_a, team_b, _ = match
+        self.assertIn(5, {p.id for p in team_a + team_b})
+    
+    def test_keeps_banded_candidates_when_must_play_player_is_covered(self):
+        for p in self.players:
+            if p.id != 1:
+                self.maker.last_played_round[p.id] = 2
+        
+        candidates = self.maker._generate_candidates('male', self.players, round_num=3)
+        self.assertFalse(any(5 in self.members(c) for c in candidates))
+
+
+class ScheduleOptionTests(TestCase):
+    def generate(self, **data):
+        return self.client.post('/matchmaking/api/generate/', json.dumps(data), content_type='application/json')
+    
+    def test_rejects_invalid_options_before_creating_session(self):
+        for options in ({'use_pods': 'yes'}, {'max_ntrp_gap': -1}, {'max_ntrp_gap': 'wide'}, {'max_ntrp_gap': True}):
+            response = self.generate(participants=[], **options)
+            self.assertEqual(response.status_code, 400, options)
+        
+        self.assertFalse(MatchSession.objects.exists())
@@ -0,0 +1,205 @@
+"""
+대진표 가중치 튜닝 하네스
+
+합성 세션 코퍼스에 대해 ScoringWeights 조합들을 그리드/랜덤 탐색으로 돌려
+품질과 실행 시간을 비교한다. 조합 하나를 워커 프로세스 하나가 담당.
+
+=== 품질 점수 (낮을수록 좋음) ===
+- 연속 휴식 1회: 100
+- 빈 코트 1면: 50
+- 같은 성별 게임 수 편차가 1을 넘는 만큼: 20
+- 같은 파트너 반복 1회: 5
+- 팀 NTRP 합 차이 평균: 1.0당 10
+
+사용 예:
+    python manage.py tune_matchmaker --mode random --samples 40
+    python manage.py tune_matchmaker --mode grid --param ntrp_diff=5,20,50 --param repeat_partner=200,1000
+"""
+import math
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields, replace
+from itertools import product
+
+from .matchmaker import DEFAULT_WEIGHTS, MatchMaker, PlayerSnapshot, ScoringWeights
+
+
+NTRP_LEVELS = ['2.0', '2.5', '3.0', '3.5', '4.0', '4.5']
+
+# 품질 점수 항목별 가중치
+QUALITY_WEIGHTS = {
+    'consecutive_rests': 100,
+    'empty_courts': 50,
+    'gender_spread_excess': 20,
+    'repeat_partners': 5,
+    'avg_ntrp_gap': 10,
+}
+
+
+def build_corpus(num_sessions=30, seed=0):
+    """
+    합성 세션 코퍼스 생성
+    
+    실제 정기 모임 분포를 흉내낸다: 8~24명, 2~4코트, 여성 비율 20~70%,
+    약 20%는 늦참 또는 일퇴.
+    Returns: [(players, num_courts, num_rounds), ...]
+    """
+    rnd = random.Random(seed)
+    corpus = []
+    
+    for _ in range(num_sessions):
+        num_courts = rnd.choice([2, 2, 3, 4])
+        num_players = rnd.randint(num_courts * 4, num_courts * 6)
+        num_rounds = rnd.choice([5, 6, 6, 7])
+        num_females = round(num_players * rnd.uniform(0.2, 0.7))
+        
+        players = []
+        for i in range(num_players):
+            available = set(range(1, num_rounds + 1))
+            roll = rnd.random()
+            if roll < 0.1:  # 늦참
+                available -= set(range(1, rnd.randint(2, 3)))
+            elif roll < 0.2:  # 일퇴
+                available -= set(range(rnd.randint(num_rounds - 1, num_rounds), num_rounds + 1))
+            
+            players.append(PlayerSnapshot(
+                id=i + 1,
+                gender='F' if i < num_females else 'M',
+                ntrp=rnd.choice(NTRP_LEVELS),
+                available_rounds=frozenset(available),
+            ))
+        corpus.append((players, num_courts, num_rounds))
+    
+    return corpus
+
+
+def schedule_metrics(schedule, players, num_courts):
+    """생성된 대진표의 품질 지표"""
+    games = {p.id: 0 for p in players}
+    partners = defaultdict(int)
+    consecutive_rests = 0
+    empty_courts = 0
+    ntrp_gaps = []
+    
+    previous_resting = set()
+    for round_data in schedule:
+        empty_courts += num_courts - len(round_data['matches'])
+        
+        for match in round_data['matches']:
+            for team in (match['team_a'], match['team_b']):
+                partners[frozenset(p.id for p in team)] += 1
+                for p in team:
+                    games[p.id] += 1
+            ntrp_gaps.append(abs(
+                sum(float(p.ntrp) for p in match['team_a']) - sum(float(p.ntrp) for p in match['team_b'])
+            ))
+        
+        resting = {p.id for p in round_data['resting']}
+        consecutive_rests += len(resting & previous_resting)
+        previous_resting = resting
+    
+    gender_spread_excess = 0
+    for gender in ('M', 'F'):
+        counts = [games[p.id] for p in players if p.gender == gender]
+        if counts:
+            gender_spread_excess += max(0, max(counts) - min(counts) - 1)
+    
+    return {
+        'consecutive_rests': consecutive_rests,
+        'empty_courts': empty_courts,
+        'gender_spread_excess': gender_spread_excess,
+        'repeat_partners': sum(n - 1 for n in partners.values() if n > 1),
+        'avg_ntrp_gap': sum(ntrp_gaps) / len(ntrp_gaps) if ntrp_gaps else 0,
+    }
+
+
+def quality_score(metrics):
+    """품질 지표 → 단일 점수 (낮을수록 좋음)"""
+    return sum(metrics[key] * weight for key, weight in QUALITY_WEIGHTS.items())
+
+
+def evaluate_weights(job):
+    """
+    가중치 조합 하나를 코퍼스 전체에 적용 (프로세스 풀 워커)
+    
+    Returns: {'weights', 'quality', 'runtime', 'metrics'}
+    """
+    weights, corpus, seed = job
+    random.seed(seed)
+    
+    totals = defaultdict(float)
+    runtime = 0.0
+    for players, num_courts, num_rounds in corpus:
+        start = time.perf_counter()
+        schedule = MatchMaker(players, num_courts, num_rounds, weights=weights).generate_matches()
+        runtime += time.perf_counter() - start
+        
+        for key, value in schedule_metrics(schedule, players, num_courts).items():
+            totals[key] += value
+    
+    metrics = {key: value / len(corpus) for key, value in totals.items()}
+    return {
+        'weights': weights,
+        'quality': quality_score(metrics),
+        'runtime': runtime,
+        'metrics': metrics,
+    }
+
+
+def grid_candidates(grid, base=DEFAULT_WEIGHTS):
+    """{필드명: [값, ...]} 그리드의 모든 조합"""
+    names = list(grid)
+    for values in product(*(grid[name] for name in names)):
+        yield replace(base, **dict(zip(names, values)))
+
+
+def random_candidates(samples, seed=0, spread=4.0, base=DEFAULT_WEIGHTS):
+    """
+    기본값을 중심으로 로그 균등 분포(1/spread ~ spread배)에서 가중치 샘플링
+    
+    첫 번째 후보는 항상 기본 가중치 (비교 기준).
+    """
+    rnd = random.Random(seed)
+    yield base
+    
+    for _ in range(samples - 1):
+        values = {}
+        for field in fields(ScoringWeights):
+            default = getattr(base, field.name)
+            factor = math.exp(rnd.uniform(-math.log(spread), math.log(spread)))
+            if field.type in (int, 'int'):
+                values[field.name] = max(1, round(default * factor))
+            else:
+                values[field.name] = default * factor
+        yield ScoringWeights(**values)
+
+
+def run_search(candidates, corpus, max_workers=None, seed=0):
+    """
+    후보 가중치들을 프로세스 풀에서 평가
+    
+    모든 후보가 같은 랜덤 시드를 쓰므로 가중치 차이만 비교된다.
+    Returns: 품질 오름차순 결과 리스트
+    """
+    jobs = [(weights, corpus, seed) for weights in candidates]
+    
+    if max_workers == 1:
+        results = [evaluate_weights(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(evaluate_weights, jobs))
+    
+    results.sort(key=lambda r: (r['quality'], r['runtime']))
+    return results
+
+
+def weights_diff(weights, base=DEFAULT_WEIGHTS):
+    """기본값과 다른 필드만 추출 (리포트 표시용)"""
+    base_values = asdict(base)
+    return {
+        name: round(value, 2) if isinstance(value, float) else value
+        for name, value in asdict(weights).items()
+        if value != base_values[name]
+    }
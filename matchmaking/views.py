@@ -6,6 +6,7 @@ from .models import MatchSession, Participant, Match
 from .matchmaker import generate_match_schedule
 from members.models import Member
 import json
+import math
 
 
 def get_match_type(team_a, team_b):
@@ -36,6 +37,32 @@ def get_match_type(team_a, team_b):
         return {'type': 'any', 'label': '잡복', 'emoji': '🎾'}
 
 
+def _schedule_options(data):
+    """
+    대진표 옵션 검증 (use_pods, max_ntrp_gap)
+    
+    - use_pods: true/false, 없으면 None (인원/코트 수로 자동 결정)
+    - max_ntrp_gap: 0 이상의 숫자 (숫자 문자열 허용), 없으면 None
+    Returns: (use_pods, max_ntrp_gap) / 잘못된 값이면 ValueError
+    """
+    use_pods = data.get('use_pods')
+    if use_pods is not None and not isinstance(use_pods, bool):
+        raise ValueError('use_pods는 true 또는 false여야 합니다.')
+    
+    max_ntrp_gap = data.get('max_ntrp_gap')
+    if max_ntrp_gap is not None:
+        if isinstance(max_ntrp_gap, bool):
+            raise ValueError('max_ntrp_gap은 숫자여야 합니다.')
+        try:
+            max_ntrp_gap = float(max_ntrp_gap)
+        except (TypeError, ValueError):
+            raise ValueError('max_ntrp_gap은 숫자여야 합니다.') from None
+        if not math.isfinite(max_ntrp_gap) or max_ntrp_gap < 0:
+            raise ValueError('max_ntrp_gap은 0 이상이어야 합니다.')
+    
+    return use_pods, max_ntrp_gap
+
+
 def matchmaking_page(request):
     """대진표 생성 페이지"""
     members = Member.objects.filter(status='active').order_by('name')
@@ -57,6 +84,11 @@ def generate_matches(request):
     try:
         data = json.loads(request.body)
         
+        try:
+            use_pods, max_ntrp_gap = _schedule_options(data)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        
         # 세션 생성 (기존 세션 사용 또는 새로 생성)
         session_id = data.get('session_id')
         if session_id:
@@ -89,8 +121,10 @@ def generate_matches(request):
         participants = list(session.participants.all())
         num_courts = data.get('num_courts', 2)
         num_rounds = data.get('num_rounds', 6)
-        
-        schedule = generate_match_schedule(participants, num_courts, num_rounds)
+        schedule = generate_match_schedule(
+            participants, num_courts, num_rounds,
+            use_pods=use_pods, max_ntrp_gap=max_ntrp_gap,
+        )
         
         # 매치 저장
         for round_data in schedule:
@@ -151,6 +185,11 @@ def regenerate_matches(request):
         if not session_id:
             return JsonResponse({'success': False, 'error': '세션 ID가 필요합니다.'}, status=400)
         
+        try:
+            use_pods, max_ntrp_gap = _schedule_options(data)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        
         session = get_object_or_404(MatchSession, id=session_id)
         
         # 기존 매치 삭제
@@ -160,8 +199,10 @@ def regenerate_matches(request):
         participants = list(session.participants.all())
         num_courts = data.get('num_courts', 2)
         num_rounds = data.get('num_rounds', 6)
-        
-        schedule = generate_match_schedule(participants, num_courts, num_rounds)
+        schedule = generate_match_schedule(
+            participants, num_courts, num_rounds,
+            use_pods=use_pods, max_ntrp_gap=max_ntrp_gap,
+        )
         
         # 매치 저장
         for round_data in schedule:
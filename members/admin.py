@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Member
+from .models import AttendanceRollup, Member
 
 
 @admin.register(Member)
@@ -9,3 +9,11 @@ class MemberAdmin(admin.ModelAdmin):
     search_fields = ['name', 'phone']
     ordering = ['name']
 
+
+
+@admin.register(AttendanceRollup)
+class AttendanceRollupAdmin(admin.ModelAdmin):
+    list_display = ['member', 'month', 'events_held', 'events_attended', 'current_streak', 'last_attended_date']
+    list_filter = ['month']
+    search_fields = ['member__name']
+    ordering = ['-month', 'member__name']
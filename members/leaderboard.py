@@ -0,0 +1,158 @@
+"""
+클럽 전체 참석 리더보드 / 월 × 멤버 히트맵
+
+멤버별로 member_detail을 부르는 대신 참석 중간 테이블에 대한 GROUP BY 두 번
+(월별 일정 수, 멤버 × 월별 참석 수)과 롤업의 연속 참석 조회로 한 번에 만든다.
+
+결과는 캐시하며, 참석/일정/멤버가 바뀌면 캐시 버전을 올려 무효화한다.
+캐시는 프로세스별(LocMemCache)이라 다른 프로세스의 변경(import_members,
+sync_google_calendar 워커 등)은 시그널로 알 수 없으므로 TTL을 짧게 둔다.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from schedule.models import Event
+from schedule.recurrence import virtual_occurrences
+from schedule.signals import attendance_changed, events_changed
+
+from .models import AttendanceRollup, Member
+from .rollup import ensure_rollup_current, month_start
+from .signals import members_bulk_changed
+from .stats import _rate
+
+
+CACHE_VERSION_KEY = 'attendance_leaderboard:version'
+CACHE_TIMEOUT = 60  # 다른 프로세스의 변경도 이 시간 안에 반영
+
+
+def default_range(today):
+    """기본 조회 구간: 최근 12개월 (이번 달 포함)"""
+    start = month_start(today)
+    for _ in range(11):
+        start = month_start(start - timedelta(days=1))
+    return start, today
+
+
+def _cache_version():
+    return cache.get_or_set(CACHE_VERSION_KEY, 1, None)
+
+
+def invalidate_leaderboard():
+    try:
+        cache.incr(CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(CACHE_VERSION_KEY, 1, None)
+
+
+def get_attendance_leaderboard(start, end, include_inactive=False, today=None):
+    """
+    기간 내 멤버별 참석률/연속 참석 + 월 × 멤버 히트맵
+    
+    종료일은 오늘을 넘지 않는다 (과거 일정만 집계).
+    연속 참석은 롤업의 종료일이 속한 달 기준 값.
+    """
+    today = today or timezone.now().date()
+    end = min(end, today)
+    
+    key = f'attendance_leaderboard:{_cache_version()}:{start}:{end}:{int(include_inactive)}'
+    result = cache.get(key)
+    if result is None:
+        result = _build_leaderboard(start, end, include_inactive, today)
+        cache.set(key, result, CACHE_TIMEOUT)
+    return result
+
+
+def _build_leaderboard(start, end, include_inactive, today):
+    Attendance = Event.attendees.through
+    
+    # 월별 일정 수
+    held = dict(
+        Event.objects.filter(date__gte=start, date__lte=end, recurrence_hidden=False)
+        .annotate(month=TruncMonth('date'))
+        .values('month')
+        .annotate(n=Count('id'))
+        .values_list('month', 'n')
+    )
+    # 지난 가상 회차 (참석자 없는 반복 회차)도 열린 일정으로 셈
+    for occurrence in virtual_occurrences(start, end):
+        month = month_start(occurrence.date)
+        held[month] = held.get(month, 0) + 1
+    
+    # 멤버 × 월별 참석 수
+    attended = defaultdict(dict)
+    rows = (
+        Attendance.objects.filter(event__date__gte=start, event__date__lte=end)
+        .annotate(month=TruncMonth('event__date'))
+        .values('member_id', 'month')
+        .annotate(n=Count('id'))
+        .values_list('member_id', 'month', 'n')
+    )
+    for member_id, month, n in rows:
+        attended[member_id][month] = n
+    
+    # 연속 참석: 종료일이 속한 달까지의 마지막 롤업 행
+    # (롤업이 오래 밀렸으면 마지막 반영 기준일 값, catch_up_rollup 이후 최신화)
+    ensure_rollup_current(today)
+    latest_streak = Subquery(
+        AttendanceRollup.objects.filter(
+            member_id=OuterRef('pk'), month__lte=month_start(end),
+        ).order_by('-month').values('current_streak')[:1]
+    )
+    members = Member.objects.annotate(streak=latest_streak).order_by('name')
+    if not include_inactive:
+        members = members.filter(status='active')
+    
+    months = []
+    month = month_start(start)
+    while month <= end:
+        months.append(month)
+        month = month_start(month + timedelta(days=31))
+    total = sum(held.values())
+    
+    entries = []
+    for member in members.values('id', 'name', 'gender', 'streak'):
+        by_month = attended.get(member['id'], {})
+        count = sum(by_month.values())
+        entries.append({
+            'id': member['id'],
+            'name': member['name'],
+            'gender': member['gender'],
+            'attended': count,
+            'total': total,
+            'rate': _rate(count, total),
+            'streak': member['streak'] or 0,
+            'heatmap': [by_month.get(month, 0) for month in months],
+        })
+    
+    entries.sort(key=lambda e: (-e['rate'], -e['streak'], e['name']))
+    for rank, entry in enumerate(entries, 1):
+        entry['rank'] = rank
+    
+    return {
+        'start': start.strftime('%Y-%m-%d'),
+        'end': end.strftime('%Y-%m-%d'),
+        'months': [month.strftime('%Y-%m') for month in months],
+        'events_per_month': [held.get(month, 0) for month in months],
+        'total_events': total,
+        'members': entries,
+    }
+
+
+@receiver(attendance_changed)
+@receiver(events_changed)
+def invalidate_on_attendance(sender, **kwargs):
+    invalidate_leaderboard()
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+@receiver(members_bulk_changed)
+def invalidate_on_member(sender, **kwargs):
+    invalidate_leaderboard()
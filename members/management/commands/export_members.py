@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from members.models import Member
+from members.transfer import FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = '멤버 명단을 CSV/NDJSON으로 내보냅니다'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--status', choices=[code for code, _ in Member.STATUS_CHOICES])
+        parser.add_argument('--output', '-o', help='출력 파일 (기본: 표준 출력)')
+    
+    def handle(self, *args, **options):
+        members = Member.objects.all()
+        if options['status']:
+            members = members.filter(status=options['status'])
+        
+        out = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            for chunk in stream_export(options['format'], members):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
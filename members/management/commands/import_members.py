@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from members.transfer import FORMATS, import_members, read_records
+
+
+class Command(BaseCommand):
+    help = 'CSV/NDJSON 파일에서 멤버를 일괄 가져옵니다 (id 또는 이름+연락처 기준 upsert)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS, help='기본: 파일 확장자')
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='검증만 하고 저장하지 않음')
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if fmt == 'jsonl':
+            fmt = 'ndjson'
+        if fmt not in FORMATS:
+            raise CommandError(f'형식을 알 수 없습니다: {path} (--format 지정)')
+        
+        try:
+            with open(path, 'rb') as f:
+                result = import_members(
+                    read_records(f, fmt),
+                    chunk_size=options['chunk_size'],
+                    dry_run=options['dry_run'],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+        
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f"{error['line']}행: {' / '.join(error['errors'])}"))
+        
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}생성 {result['created']}명, 수정 {result['updated']}명, 오류 {len(result['errors'])}행"
+        ))
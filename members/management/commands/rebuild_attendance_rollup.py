@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from members.models import AttendanceRollup, Member
+from members.rollup import catch_up_rollup, get_rollup_attendance_stats, rebuild_rollup
+from members.stats import get_member_attendance_stats
+
+
+class Command(BaseCommand):
+    help = '멤버 월별 참석 집계(AttendanceRollup)를 처음부터 다시 계산합니다'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--catch-up', action='store_true',
+            help='전체 재계산 대신 반영 기준일 이후 과거가 된 일정만 반영 (매일 cron용)',
+        )
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='재계산 후 원본 집계와 멤버별로 비교',
+        )
+    
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        
+        if options['catch_up']:
+            count = catch_up_rollup(today)
+        else:
+            AttendanceRollup.objects.all().delete()
+            count = rebuild_rollup(through=today)
+        self.stdout.write(self.style.SUCCESS(f'롤업 {count}행 생성 ({today} 기준)'))
+        
+        if options['verify']:
+            self._verify(today)
+    
+    def _verify(self, today):
+        keys = ['total_events', 'attended_count', 'consecutive_count', 'monthly_stats']
+        mismatches = 0
+        
+        for member in Member.objects.all():
+            rollup = get_rollup_attendance_stats(member, today)
+            live = get_member_attendance_stats(member, today)
+            diff = [key for key in keys if rollup[key] != live[key]]
+            if diff:
+                mismatches += 1
+                self.stdout.write(self.style.WARNING(f'{member.name}: {", ".join(diff)} 불일치'))
+        
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'불일치 멤버 {mismatches}명'))
+        else:
+            self.stdout.write(self.style.SUCCESS('원본 집계와 일치'))
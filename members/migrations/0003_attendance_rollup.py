@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("members", "0002_member_is_admin"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceRollupState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("refreshed_through", models.DateField(verbose_name="반영 기준일")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "참석 집계 상태",
+                "verbose_name_plural": "참석 집계 상태",
+            },
+        ),
+        migrations.CreateModel(
+            name="AttendanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(verbose_name="월")),
+                (
+                    "events_held",
+                    models.PositiveIntegerField(default=0, verbose_name="일정 수"),
+                ),
+                (
+                    "events_attended",
+                    models.PositiveIntegerField(default=0, verbose_name="참석 수"),
+                ),
+                (
+                    "current_streak",
+                    models.PositiveIntegerField(default=0, verbose_name="연속 참석"),
+                ),
+                (
+                    "last_attended_date",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="마지막 참석일"
+                    ),
+                ),
+                (
+                    "member",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_rollups",
+                        to="members.member",
+                        verbose_name="멤버",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "월별 참석 집계",
+                "verbose_name_plural": "월별 참석 집계",
+                "ordering": ["member", "month"],
+                "unique_together": {("member", "month")},
+            },
+        ),
+    ]
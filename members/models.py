@@ -53,3 +53,53 @@ class Member(models.Model):
     def display_info(self):
         return f"{self.name} | {self.get_gender_display()} | 구력 {self.experience_years}년 | NTRP {self.ntrp}"
 
+
+
+class AttendanceRollup(models.Model):
+    """
+    멤버 월별 참석 집계 (머티리얼라이즈드 롤업)
+    
+    과거 일정만 집계하며, 일정이 있었던 달마다 멤버별로 한 행.
+    참석자 변경/일정 생성·삭제 시 해당 월부터 증분 갱신된다 (members/rollup.py).
+    """
+    
+    member = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='attendance_rollups',
+        verbose_name='멤버'
+    )
+    month = models.DateField(verbose_name='월')  # 해당 월 1일
+    events_held = models.PositiveIntegerField(default=0, verbose_name='일정 수')
+    events_attended = models.PositiveIntegerField(default=0, verbose_name='참석 수')
+    # 이 달 마지막 일정 시점의 연속 참석 수 / 마지막 참석일 (이전 달에서 이어짐)
+    current_streak = models.PositiveIntegerField(default=0, verbose_name='연속 참석')
+    last_attended_date = models.DateField(null=True, blank=True, verbose_name='마지막 참석일')
+    
+    class Meta:
+        verbose_name = '월별 참석 집계'
+        verbose_name_plural = '월별 참석 집계'
+        ordering = ['member', 'month']
+        unique_together = [('member', 'month')]
+    
+    def __str__(self):
+        return f"{self.member.name} {self.month:%Y-%m} ({self.events_attended}/{self.events_held})"
+
+
+class AttendanceRollupState(models.Model):
+    """
+    롤업 반영 기준일 (단일 행)
+    
+    refreshed_through 날짜까지의 일정이 AttendanceRollup에 반영되어 있다.
+    날짜가 지나 새로 과거가 된 일정은 조회 시점에 이어서 반영한다.
+    """
+    
+    refreshed_through = models.DateField(verbose_name='반영 기준일')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = '참석 집계 상태'
+        verbose_name_plural = '참석 집계 상태'
+    
+    def __str__(self):
+        return f"{self.refreshed_through} 까지 반영"
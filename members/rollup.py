@@ -0,0 +1,323 @@
+"""
+멤버 참석 집계 롤업
+
+AttendanceRollup에 멤버 × 월 단위 집계를 미리 계산해두고, 프로필 팝업이나
+리더보드는 원본 일정/참석 테이블 대신 이 행들을 읽는다.
+
+=== 갱신 규칙 ===
+- 참석자 변경: 해당 일정의 달부터 해당 멤버들만 재계산
+- 일정 생성/삭제/날짜 변경: 해당 달부터 전체 멤버 재계산
+- 신규 멤버: 해당 멤버 전체 이력 계산
+- 연속 참석은 달을 넘어 이어지므로 변경된 달 이후의 행도 함께 다시 쓴다.
+- 한 트랜잭션 안의 여러 변경(반복 일정 일괄 삭제 등)은 커밋 시 한 번으로 합친다.
+
+저장되지 않은 지난 반복 회차(가상 회차)는 참석자가 없는 일정으로 센다.
+
+집계는 AttendanceRollupState.refreshed_through 날짜까지의 일정만 반영한다.
+- 처음 계산/오래 밀린 구간: migrate 직후(post_migrate) 또는 명령으로 catch_up_rollup()
+- 날짜가 지나 새로 과거가 된 일정: 조회 시 ensure_rollup_current()가 최근
+  READ_CATCH_UP_DAYS일 이내 차이만 이어서 반영 (조회 요청에서 전체 재계산하지 않음)
+- 롤업이 없거나 그보다 오래 밀렸으면 조회는 원본 집계(stats.py)로 대신한다.
+
+밀린 날짜 반영: python manage.py rebuild_attendance_rollup --catch-up (매일 cron)
+전체 재계산: python manage.py rebuild_attendance_rollup
+"""
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+from itertools import groupby
+
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import post_migrate, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from schedule.models import Event
+from schedule.recurrence import virtual_occurrences
+from schedule.signals import attendance_changed, events_changed
+
+from .models import AttendanceRollup, AttendanceRollupState, Member
+from .signals import members_bulk_changed
+from .stats import _rate, get_member_attendance_stats, recent_attended_events, recent_month_windows
+
+
+READ_CATCH_UP_DAYS = 7  # 조회 요청에서 이어서 반영할 최대 일수
+
+
+def month_start(d):
+    return d.replace(day=1)
+
+
+def get_refreshed_through():
+    """롤업 반영 기준일 (한 번도 계산하지 않았으면 None)"""
+    return (
+        AttendanceRollupState.objects.filter(pk=1)
+        .values_list('refreshed_through', flat=True)
+        .first()
+    )
+
+
+def rebuild_rollup(since=None, member_ids=None, through=None):
+    """
+    since가 속한 달부터 through 날짜까지 롤업 재계산
+    
+    since=None이면 전체 이력, member_ids=None이면 전체 멤버.
+    전체 멤버를 재계산한 경우에만 반영 기준일을 through로 올린다.
+    Returns: 생성된 행 수
+    """
+    through = through or timezone.now().date()
+    since = month_start(since) if since else None
+    Attendance = Event.attendees.through
+    
+    members = Member.objects.all()
+    events = Event.objects.filter(date__lte=through, recurrence_hidden=False)
+    attendance = Attendance.objects.filter(event__date__lte=through)
+    if member_ids is not None:
+        members = members.filter(id__in=member_ids)
+        attendance = attendance.filter(member_id__in=member_ids)
+    if since:
+        events = events.filter(date__gte=since)
+        attendance = attendance.filter(event__date__gte=since)
+    
+    target_ids = list(members.values_list('id', flat=True))
+    # 지난 가상 회차도 열린 일정 (id 없음 → 아무도 참석하지 않은 일정)
+    event_rows = list(events.values_list('id', 'date', 'start_time'))
+    event_rows += [
+        (None, occurrence.date, occurrence.start_time)
+        for occurrence in virtual_occurrences(since or date.min, through)
+    ]
+    event_rows.sort(key=lambda row: (row[1], row[2], row[0] or 0))
+    attended = defaultdict(set)
+    for member_id, event_id in attendance.values_list('member_id', 'event_id'):
+        attended[member_id].add(event_id)
+    
+    # since 직전 행에서 연속 참석/마지막 참석일을 이어받음
+    carry = {}
+    if since:
+        previous = AttendanceRollup.objects.filter(
+            month=Subquery(
+                AttendanceRollup.objects.filter(
+                    member_id=OuterRef('member_id'), month__lt=since,
+                ).order_by('-month').values('month')[:1]
+            ),
+        )
+        if member_ids is not None:
+            previous = previous.filter(member_id__in=target_ids)
+        for member_id, streak, last in previous.values_list(
+            'member_id', 'current_streak', 'last_attended_date',
+        ):
+            carry[member_id] = (streak, last)
+    
+    months = [
+        (month, list(rows))
+        for month, rows in groupby(event_rows, key=lambda row: month_start(row[1]))
+    ]
+    
+    rollups = []
+    for member_id in target_ids:
+        streak, last = carry.get(member_id, (0, None))
+        mine = attended.get(member_id, ())
+        
+        for month, month_events in months:
+            count = 0
+            for event_id, event_date, _ in month_events:
+                if event_id in mine:
+                    count += 1
+                    streak += 1
+                    last = event_date
+                else:
+                    streak = 0
+            
+            rollups.append(AttendanceRollup(
+                member_id=member_id,
+                month=month,
+                events_held=len(month_events),
+                events_attended=count,
+                current_streak=streak,
+                last_attended_date=last,
+            ))
+    
+    with transaction.atomic():
+        stale = AttendanceRollup.objects.all()
+        if member_ids is not None:
+            stale = stale.filter(member_id__in=target_ids)
+        if since:
+            stale = stale.filter(month__gte=since)
+        stale.delete()
+        AttendanceRollup.objects.bulk_create(rollups, batch_size=500)
+        
+        if member_ids is None:
+            AttendanceRollupState.objects.update_or_create(
+                pk=1, defaults={'refreshed_through': through},
+            )
+    
+    return len(rollups)
+
+
+def catch_up_rollup(today=None):
+    """
+    반영 기준일 이후 과거가 된 일정을 롤업에 반영 (없으면 전체 계산)
+    
+    migrate 직후와 rebuild_attendance_rollup --catch-up에서 실행한다.
+    Returns: 생성된 행 수
+    """
+    today = today or timezone.now().date()
+    through = get_refreshed_through()
+    
+    if through is None:
+        return rebuild_rollup(through=today)
+    if through < today:
+        return rebuild_rollup(since=through + timedelta(days=1), through=today)
+    return 0
+
+
+def ensure_rollup_current(today=None):
+    """
+    조회 전 롤업을 오늘까지 맞춤 (최근 READ_CATCH_UP_DAYS일 이내 차이만)
+    
+    Returns: 롤업을 그대로 읽어도 되는지 (없거나 더 오래 밀렸으면 False)
+    """
+    today = today or timezone.now().date()
+    through = get_refreshed_through()
+    
+    if through is None or (today - through).days > READ_CATCH_UP_DAYS:
+        return False
+    if through < today:
+        rebuild_rollup(since=through + timedelta(days=1), through=today)
+    return True
+
+
+@receiver(post_migrate)
+def catch_up_after_migrate(sender, app_config, apps, **kwargs):
+    if app_config.label != 'members':
+        return
+    try:
+        apps.get_model('members', 'AttendanceRollupState')
+    except LookupError:
+        return  # 롤업 테이블 마이그레이션 이전으로 되돌린 경우
+    catch_up_rollup()
+
+
+# === 증분 갱신 (트랜잭션 커밋 시 한 번으로 합침) ===
+
+_pending = threading.local()
+
+
+def _is_registered(callback):
+    """callback이 아직 현재 트랜잭션의 커밋 대기 목록에 있는지 (롤백되면 Django가 버림)"""
+    return connection.in_atomic_block and any(
+        entry[1] is callback for entry in connection.run_on_commit
+    )
+
+
+def schedule_rollup_refresh(since, member_ids=None):
+    """
+    since가 속한 달부터 재계산 예약
+    
+    트랜잭션 밖이면 즉시 실행, 안이면 커밋 시 실행.
+    같은 트랜잭션 안의 예약은 (가장 이른 달, 멤버 합집합)으로 병합된다.
+    """
+    pending = getattr(_pending, 'refresh', None)
+    
+    # 롤백(세이브포인트 포함)으로 커밋 콜백이 버려진 예약은 병합하지 않음
+    if pending is not None and not _is_registered(pending['callback']):
+        pending = None
+    
+    if pending is None:
+        pending = {
+            'since': since,
+            'member_ids': None if member_ids is None else set(member_ids),
+        }
+        pending['callback'] = lambda: _flush_rollup_refresh(pending)
+        _pending.refresh = pending
+        transaction.on_commit(pending['callback'])
+        return
+    
+    pending['since'] = min(pending['since'], since)
+    if member_ids is None or pending['member_ids'] is None:
+        pending['member_ids'] = None
+    else:
+        pending['member_ids'].update(member_ids)
+
+
+def _flush_rollup_refresh(pending):
+    if getattr(_pending, 'refresh', None) is pending:
+        _pending.refresh = None
+    
+    # 반영 기준일 이후 일정은 다음 ensure_rollup_current()에서 반영됨
+    through = get_refreshed_through()
+    if through is None or pending['since'] > through:
+        return
+    rebuild_rollup(
+        since=pending['since'] if pending['since'] > date.min else None,
+        member_ids=pending['member_ids'],
+        through=through,
+    )
+
+
+@receiver(attendance_changed)
+def refresh_on_attendance_changed(sender, member_ids, dates, **kwargs):
+    if dates:
+        schedule_rollup_refresh(min(dates), member_ids)
+
+
+@receiver(events_changed)
+def refresh_on_events_changed(sender, dates, **kwargs):
+    if dates:
+        schedule_rollup_refresh(min(dates))
+
+
+@receiver(post_save, sender=Member)
+def rollup_new_member(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        schedule_rollup_refresh(date.min, [instance.pk])
+
+
+@receiver(members_bulk_changed)
+def rollup_imported_members(sender, created_ids, **kwargs):
+    if created_ids:
+        schedule_rollup_refresh(date.min, created_ids)
+
+
+# === 조회 ===
+
+def get_rollup_attendance_stats(member, today=None):
+    """
+    롤업 행으로 멤버 참석 통계 조회 (get_member_attendance_stats와 같은 형식)
+    
+    쿼리 3회: 반영 기준일 확인 + 멤버 롤업 행 + 최근 참석 일정
+    롤업이 없거나 오래 밀렸으면 원본 집계로 대신한다.
+    """
+    today = today or timezone.now().date()
+    if not ensure_rollup_current(today):
+        return get_member_attendance_stats(member, today)
+    
+    rows = list(member.attendance_rollups.all())
+    by_month = {row.month: row for row in rows}
+    total = sum(row.events_held for row in rows)
+    attended = sum(row.events_attended for row in rows)
+    latest = rows[-1] if rows else None
+    
+    monthly_stats = []
+    for label, start, _ in recent_month_windows(today):
+        row = by_month.get(start)
+        month_total = row.events_held if row else 0
+        month_attended = row.events_attended if row else 0
+        monthly_stats.append({
+            'month': label,
+            'total': month_total,
+            'attended': month_attended,
+            'rate': _rate(month_attended, month_total),
+        })
+    
+    last_attended = latest.last_attended_date if latest else None
+    return {
+        'total_events': total,
+        'attended_count': attended,
+        'attendance_rate': _rate(attended, total),
+        'consecutive_count': latest.current_streak if latest else 0,
+        'last_attended_date': last_attended.strftime('%Y-%m-%d') if last_attended else None,
+        'monthly_stats': monthly_stats,
+        'recent_events': recent_attended_events(member, today),
+    }
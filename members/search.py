@@ -0,0 +1,186 @@
+"""
+멤버 이름 자동완성 인덱스
+
+프로세스 메모리에 멤버 이름의 접두사 트라이를 만들어두고 검색한다.
+이름의 모든 접미사를 넣으므로 성을 빼고 이름만 입력해도 찾는다 ("민수" → 김민수).
+
+=== 초성 검색 ===
+질의의 자음(ㄱ, ㄴ, ...)은 그 초성으로 시작하는 음절과 매칭된다.
+"ㄱㅁㅅ", "김ㅁㅅ", "김민ㅅ" 모두 김민수를 찾는다.
+
+=== 갱신 ===
+Member 저장/삭제/일괄 가져오기 시그널에서 인덱스를 버리고, 다음 검색 때 다시 만든다.
+다른 프로세스의 변경은 시그널이 오지 않으므로 INDEX_MAX_AGE초가 지나면 다시 만든다.
+"""
+import heapq
+import threading
+import time
+from itertools import chain
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Member
+from .signals import members_bulk_changed
+
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_CHOSUNG_SET = set(CHOSUNG)
+_HANGUL_BASE = 0xAC00
+_HANGUL_COUNT = 11172
+_CHOSUNG_SPAN = 588  # 중성 21 × 종성 28
+
+INDEX_MAX_AGE = 60
+
+
+def chosung_of(ch):
+    """한글 음절의 초성 (한글이 아니면 그대로)"""
+    code = ord(ch) - _HANGUL_BASE
+    if 0 <= code < _HANGUL_COUNT:
+        return CHOSUNG[code // _CHOSUNG_SPAN]
+    return ch
+
+
+def normalize(text):
+    return ''.join(text.split()).lower()
+
+
+class _Node:
+    __slots__ = ('children', 'prefix', 'inner')
+    
+    def __init__(self):
+        self.children = {}
+        # 이 노드를 지나는 멤버 (이름순 (이름, id)): 이름 첫 글자부터 / 중간부터
+        self.prefix = []
+        self.inner = []
+
+
+class MemberIndex:
+    """
+    멤버 이름 트라이
+    
+    노드마다 그 접두사를 지나는 멤버를 이름순으로 들고 있어, 질의 길이만큼
+    내려간 뒤 도달한 노드들의 목록을 병합하며 필터를 통과한 limit명만 꺼낸다.
+    """
+    
+    def __init__(self, members):
+        self.root = _Node()
+        self.entries = {}
+        
+        for member_id, name, gender, ntrp, status in members:
+            key = normalize(name)
+            self.entries[member_id] = (key, name, gender, ntrp, status)
+            for start in range(len(key)):
+                self._insert(key[start:], (name, member_id), start == 0)
+        
+        self.by_name = sorted((entry[1], member_id) for member_id, entry in self.entries.items())
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            node.prefix.sort()
+            node.inner.sort()
+            stack.extend(node.children.values())
+    
+    def _insert(self, text, item, is_prefix):
+        node = self.root
+        for ch in text:
+            node = node.children.setdefault(ch, _Node())
+            (node.prefix if is_prefix else node.inner).append(item)
+    
+    def _walk(self, query):
+        frontier = [self.root]
+        for ch in query:
+            if ch in _CHOSUNG_SET:
+                frontier = [
+                    child
+                    for node in frontier
+                    for key, child in node.children.items()
+                    if key == ch or chosung_of(key) == ch
+                ]
+            else:
+                frontier = [node.children[ch] for node in frontier if ch in node.children]
+            if not frontier:
+                break
+        return frontier
+    
+    def search(self, query, limit=10, gender=None, ntrp_min=None, ntrp_max=None, status='active'):
+        """
+        이름/초성 검색 상위 limit명
+        
+        이름 첫 글자부터 매칭되는 멤버를 먼저, 그 안에서는 이름순.
+        빈 질의는 필터만 적용한 이름순 목록.
+        """
+        if limit <= 0:
+            return []
+        
+        query = normalize(query)
+        if query:
+            nodes = self._walk(query)
+            ordered = chain(
+                heapq.merge(*(node.prefix for node in nodes)),
+                heapq.merge(*(node.inner for node in nodes)),
+            )
+        else:
+            ordered = self.by_name
+        
+        results = []
+        seen = set()
+        for name, member_id in ordered:
+            if member_id in seen:
+                continue
+            seen.add(member_id)
+            
+            _, _, member_gender, ntrp, member_status = self.entries[member_id]
+            if status and member_status != status:
+                continue
+            if gender and member_gender != gender:
+                continue
+            if ntrp_min is not None and float(ntrp) < ntrp_min:
+                continue
+            if ntrp_max is not None and float(ntrp) > ntrp_max:
+                continue
+            
+            results.append({
+                'id': member_id,
+                'name': name,
+                'gender': member_gender,
+                'ntrp': ntrp,
+                'status': member_status,
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+
+_index = None
+_index_built_at = 0.0
+_lock = threading.Lock()
+
+
+def get_member_index():
+    """현재 인덱스 (없거나 오래됐으면 다시 만듦)"""
+    global _index, _index_built_at
+    
+    index = _index
+    if index is not None and time.monotonic() - _index_built_at < INDEX_MAX_AGE:
+        return index
+    
+    with _lock:
+        if _index is None or time.monotonic() - _index_built_at >= INDEX_MAX_AGE:
+            _index = MemberIndex(
+                Member.objects.values_list('id', 'name', 'gender', 'ntrp', 'status')
+            )
+            _index_built_at = time.monotonic()
+        return _index
+
+
+def invalidate_member_index():
+    global _index
+    _index = None
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+@receiver(members_bulk_changed)
+def invalidate_on_member_change(sender, **kwargs):
+    invalidate_member_index()
@@ -0,0 +1,12 @@
+"""
+멤버 일괄 변경 시그널
+
+bulk_create/bulk_update는 post_save를 발생시키지 않으므로, 일괄 가져오기 같은
+경로는 작업 후 members_bulk_changed를 직접 보낸다.
+
+- members_bulk_changed(sender=Member, created_ids, updated_ids)
+"""
+from django.dispatch import Signal
+
+
+members_bulk_changed = Signal()
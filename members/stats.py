@@ -0,0 +1,133 @@
+"""
+멤버 참석 통계 엔진
+
+전체/월별 참석 수와 연속 참석 기록을 Event.attendees 중간 테이블에 대한
+집계 쿼리 한 번으로 계산한다. 일정 이력이 길어져도 쿼리 수는 일정하다.
+
+화면 조회는 미리 계산된 롤업(members/rollup.py)을 읽고, 이 모듈의
+원본 집계는 롤업 검증(rebuild_attendance_rollup --verify)에 쓰인다.
+"""
+from datetime import date, time, timedelta
+
+from django.db.models import Count, Exists, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from schedule.models import Event
+from schedule.recurrence import virtual_occurrences
+
+
+def recent_month_windows(today, months=3):
+    """
+    최근 N개월 구간 [(라벨, 시작일, 종료일), ...]
+    
+    기존 member_detail과 동일하게 오늘부터 30일씩 거슬러 올라간 날짜의 달을 사용.
+    """
+    windows = []
+    for i in range(months):
+        month_date = today - timedelta(days=30 * i)
+        month_start = month_date.replace(day=1)
+        if month_date.month == 12:
+            month_end = month_date.replace(year=month_date.year + 1, month=1, day=1) - timedelta(days=1)
+        else:
+            month_end = month_date.replace(month=month_date.month + 1, day=1) - timedelta(days=1)
+        
+        windows.append((
+            f"{month_date.year}년 {month_date.month}월",
+            month_start,
+            min(month_end, today),
+        ))
+    return windows
+
+
+def _rate(attended, total):
+    return round((attended / total * 100), 1) if total > 0 else 0
+
+
+def recent_attended_events(member, today, limit=5):
+    """최근 참석한 과거 일정"""
+    recent_attended = (
+        Event.objects.filter(date__lte=today, attendees=member)
+        .order_by('-date')
+        .only('id', 'title', 'date', 'location')[:limit]
+    )
+    return [
+        {
+            'id': e.id,
+            'title': e.title,
+            'date': e.date.strftime('%Y-%m-%d'),
+            'location': e.location,
+        }
+        for e in recent_attended
+    ]
+
+
+def get_member_attendance_stats(member, today=None):
+    """
+    멤버 참석 통계 (과거 일정 기준)
+    
+    쿼리 4회: 가상 회차 펼치기 2회 + 집계 1회 + 최근 참석 일정 1회
+    - 참석 여부는 중간 테이블 EXISTS 서브쿼리로 일정마다 표시
+    - 연속 참석 = 가장 최근에 빠진 일정(날짜, 시작 시간) 이후의 일정 수
+    - 지난 가상 회차(저장되지 않은 반복 회차)는 참석자가 없으므로 빠진 일정으로 센다
+    """
+    today = today or timezone.now().date()
+    Attendance = Event.attendees.through
+    
+    virtual = virtual_occurrences(date.min, today)
+    latest_virtual = max(((o.date, o.start_time) for o in virtual), default=(date.min, time.min))
+    
+    attended = Exists(
+        Attendance.objects.filter(event_id=OuterRef('pk'), member_id=member.id)
+    )
+    past_events = Event.objects.filter(date__lte=today, recurrence_hidden=False).annotate(attended=attended)
+    
+    # 가장 최근에 빠진 일정
+    last_missed = past_events.filter(attended=False).order_by('-date', '-start_time')
+    last_missed_date = Coalesce(
+        Subquery(last_missed.values('date')[:1]), Value(date.min),
+    )
+    last_missed_time = Coalesce(
+        Subquery(last_missed.values('start_time')[:1]), Value(time.min),
+    )
+    after_last_missed = (
+        Q(date__gt=last_missed_date)
+        | Q(date=last_missed_date, start_time__gt=last_missed_time)
+    ) & (
+        Q(date__gt=latest_virtual[0])
+        | Q(date=latest_virtual[0], start_time__gt=latest_virtual[1])
+    )
+    
+    windows = recent_month_windows(today)
+    aggregates = {
+        'total_events': Count('id'),
+        'attended_count': Count('id', filter=Q(attended=True)),
+        'consecutive_count': Count('id', filter=Q(attended=True) & after_last_missed),
+    }
+    for i, (_, start, end) in enumerate(windows):
+        in_month = Q(date__gte=start, date__lte=end)
+        aggregates[f'month_{i}_total'] = Count('id', filter=in_month)
+        aggregates[f'month_{i}_attended'] = Count('id', filter=in_month & Q(attended=True))
+    
+    row = past_events.aggregate(**aggregates)
+    
+    monthly_stats = []
+    for i, (label, start, end) in enumerate(windows):
+        month_total = row[f'month_{i}_total'] + sum(1 for o in virtual if start <= o.date <= end)
+        month_attended = row[f'month_{i}_attended']
+        monthly_stats.append({
+            'month': label,
+            'total': month_total,
+            'attended': month_attended,
+            'rate': _rate(month_attended, month_total),
+        })
+    
+    total_events = row['total_events'] + len(virtual)
+    return {
+        'total_events': total_events,
+        'attended_count': row['attended_count'],
+        'attendance_rate': _rate(row['attended_count'], total_events),
+        'consecutive_count': row['consecutive_count'],
+        'monthly_stats': monthly_stats,
+        'recent_events': recent_attended_events(member, today),
+    }
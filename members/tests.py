@@ -0,0 +1,149 @@
+import json
+from datetime import date, time, timedelta
+
+from django.test import SimpleTestCase, TestCase
+
+from schedule import recurrence
+from schedule.models import Event
+
+from .models import AttendanceRollup, AttendanceRollupState, Member
+from .rollup import (
+    READ_CATCH_UP_DAYS, catch_up_rollup, get_refreshed_through, get_rollup_attendance_stats, rebuild_rollup,
+)
+from .search import MemberIndex
+from .stats import get_member_attendance_stats
+
+
+TODAY = date(2026, 10, 19)
+
+
+class RollupTestCase(TestCase):
+    """매주 토요일 반복 일정 (2026-09-05 ~ 2026-10-31), TODAY까지 지난 회차 7개"""
+    
+    def setUp(self):
+        rebuild_rollup(through=TODAY)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kim = Member.objects.create(name='김민수', gender='M')
+            self.lee = Member.objects.create(name='이지은', gender='F')
+            self.series = Event.objects.create(
+                title='정기 모임', date=date(2026, 9, 5),
+                start_time=time(9), end_time=time(11), location='A코트',
+                recurrence_type='weekly', recurrence_end_date=date(2026, 10, 31),
+            )
+            for day in (date(2026, 9, 12), date(2026, 9, 19)):
+                recurrence.materialize(self.series, day).attendees.add(self.kim)
+    
+    def post(self, url, **data):
+        # 롤업 갱신은 커밋 시 실행되므로 on_commit 콜백까지 실행
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, json.dumps(data), content_type='application/json')
+    
+    def assertMatchesLive(self, member):
+        rollup = get_rollup_attendance_stats(member, TODAY)
+        live = get_member_attendance_stats(member, TODAY)
+        for key in ('total_events', 'attended_count', 'consecutive_count', 'monthly_stats'):
+            self.assertEqual(rollup[key], live[key], key)
+        return rollup
+
+
+class RollupTests(RollupTestCase):
+    def test_counts_past_virtual_occurrences(self):
+        stats = self.assertMatchesLive(self.kim)
+        
+        self.assertEqual(stats['total_events'], 7)
+        self.assertEqual(stats['attended_count'], 2)
+        self.assertEqual(stats['consecutive_count'], 0)
+    
+    def test_cancelled_virtual_occurrence_leaves_rollup(self):
+        response = self.post(
+            f'/schedule/api/event/delete/{self.series.id}/',
+            delete_type='single', occurrence_date='2026-10-03',
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assertMatchesLive(self.kim)['total_events'], 6)
+        self.assertEqual(self.assertMatchesLive(self.lee)['total_events'], 6)
+    
+    def test_future_delete_leaves_rollup(self):
+        response = self.post(
+            f'/schedule/api/event/delete/{self.series.id}/',
+            delete_type='future', occurrence_date='2026-10-10',
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assertMatchesLive(self.kim)['total_events'], 5)
+    
+    def test_incremental_refresh_matches_rebuild(self):
+        self.post(f'/schedule/api/event/{self.series.id}/join/', member_id=self.kim.id, occurrence_date='2026-09-26')
+        self.post(f'/schedule/api/event/{self.series.id}/join/', member_id=self.lee.id, occurrence_date='2026-10-17')
+        self.post(f'/schedule/api/event/{self.series.id}/leave/', member_id=self.kim.id, occurrence_date='2026-09-12')
+        self.post(
+            f'/schedule/api/event/delete/{self.series.id}/',
+            delete_type='single', occurrence_date='2026-10-10',
+        )
+        
+        incremental = list(AttendanceRollup.objects.values_list(
+            'member_id', 'month', 'events_held', 'events_attended', 'current_streak', 'last_attended_date',
+        ))
+        rebuild_rollup(through=TODAY)
+        rebuilt = list(AttendanceRollup.objects.values_list(
+            'member_id', 'month', 'events_held', 'events_attended', 'current_streak', 'last_attended_date',
+        ))
+        
+        self.assertEqual(incremental, rebuilt)
+        self.assertMatchesLive(self.kim)
+        self.assertEqual(self.assertMatchesLive(self.lee)['consecutive_count'], 1)
+
+
+class RollupCatchUpTests(RollupTestCase):
+    def test_read_without_rollup_uses_live_stats_without_writing(self):
+        AttendanceRollupState.objects.all().delete()
+        AttendanceRollup.objects.all().delete()
+        
+        stats = get_rollup_attendance_stats(self.kim, TODAY)
+        
+        self.assertEqual(stats['total_events'], 7)
+        self.assertFalse(AttendanceRollup.objects.exists())
+        self.assertIsNone(get_refreshed_through())
+    
+    def test_read_applies_recent_day_delta(self):
+        rebuild_rollup(through=TODAY - timedelta(days=3))
+        
+        stats = get_rollup_attendance_stats(self.kim, TODAY)
+        
+        self.assertEqual(stats['total_events'], 7)
+        self.assertEqual(get_refreshed_through(), TODAY)
+    
+    def test_read_skips_long_catch_up(self):
+        through = TODAY - timedelta(days=READ_CATCH_UP_DAYS + 1)
+        rebuild_rollup(through=through)
+        
+        stats = get_rollup_attendance_stats(self.kim, TODAY)
+        
+        self.assertEqual(stats['total_events'], 7)
+        self.assertEqual(get_refreshed_through(), through)
+        
+        catch_up_rollup(TODAY)
+        self.assertEqual(get_refreshed_through(), TODAY)
+        self.assertMatchesLive(self.kim)
+
+
+class MemberIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = MemberIndex([
+            (1, '김민수', 'M', '3.0', 'active'),
+            (2, '김민지', 'F', '3.5', 'active'),
+            (3, '박김민', 'M', '2.5', 'active'),
+        ])
+    
+    def test_prefix_matches_first(self):
+        results = self.index.search('김민')
+        
+        self.assertEqual([r['id'] for r in results], [1, 2, 3])
+    
+    def test_chosung_query(self):
+        self.assertEqual([r['id'] for r in self.index.search('ㄱㅁㅅ')], [1])
+    
+    def test_limit(self):
+        self.assertEqual(len(self.index.search('김', limit=1)), 1)
+        self.assertEqual(self.index.search('김', limit=0), [])
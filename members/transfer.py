@@ -0,0 +1,264 @@
+"""
+멤버 일괄 가져오기/내보내기 (CSV, NDJSON)
+
+=== 내보내기 ===
+.iterator()로 한 청크씩 읽어 한 줄씩 내보내므로 명단 크기와 무관하게 메모리가 일정하다.
+
+=== 가져오기 ===
+- 행마다 검증하고, 오류가 있는 행은 건너뛰고 (줄 번호, 오류 목록)으로 보고
+- id가 있으면 해당 멤버 수정, 없으면 (이름, 연락처)가 같은 멤버 수정, 그 외는 새로 생성
+- chunk_size 행씩 트랜잭션 하나에서 bulk_create/bulk_update
+- 성별/상태는 코드('M', 'active')와 표시값('남성', '활동중') 모두 허용
+
+CSV 헤더 = 필드 이름 (EXPORT_FIELDS). 내보낸 파일을 그대로 다시 가져올 수 있다.
+"""
+import csv
+import io
+import json
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Member
+from .signals import members_bulk_changed
+
+
+EXPORT_FIELDS = [
+    'id', 'name', 'gender', 'experience_years', 'ntrp',
+    'status', 'phone', 'is_admin', 'joined_date',
+]
+IMPORT_FIELDS = ['name', 'gender', 'experience_years', 'ntrp', 'status', 'phone', 'is_admin']
+FORMATS = ('csv', 'ndjson')
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'o', '예', '운영진'}
+
+_GENDERS = {code: code for code, _ in Member.GENDER_CHOICES}
+_GENDERS.update({label: code for code, label in Member.GENDER_CHOICES})
+_STATUSES = {code: code for code, _ in Member.STATUS_CHOICES}
+_STATUSES.update({label: code for code, label in Member.STATUS_CHOICES})
+_NTRPS = {code for code, _ in Member.NTRP_CHOICES}
+
+
+# === 내보내기 ===
+
+class _Echo:
+    """csv.writer가 쓴 한 줄을 그대로 돌려주는 버퍼"""
+    
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset=None, chunk_size=500):
+    """멤버를 EXPORT_FIELDS 순서의 dict로 하나씩"""
+    queryset = Member.objects.all() if queryset is None else queryset
+    for values in queryset.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        row = dict(zip(EXPORT_FIELDS, values))
+        row['joined_date'] = row['joined_date'].strftime('%Y-%m-%d') if row['joined_date'] else ''
+        yield row
+
+
+def stream_csv(rows):
+    """CSV 줄 단위 스트림 (엑셀에서 한글이 깨지지 않도록 BOM 포함)"""
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def stream_export(fmt, queryset=None):
+    rows = export_rows(queryset)
+    return stream_csv(rows) if fmt == 'csv' else stream_ndjson(rows)
+
+
+# === 가져오기 ===
+
+def read_records(stream, fmt):
+    """
+    바이너리 스트림 → (줄 번호, dict 또는 파싱 오류 문자열)
+    
+    한 줄씩 읽으므로 파일 전체를 메모리에 올리지 않는다.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    
+    for line_no, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, 'JSON 형식이 올바르지 않습니다.'
+            continue
+        if not isinstance(record, dict):
+            yield line_no, 'JSON 객체가 아닙니다.'
+            continue
+        yield line_no, record
+
+
+def clean_record(record):
+    """
+    한 행 검증 → (정리된 값 dict, 오류 목록)
+    
+    빈 값은 생략한 것으로 보고, 새 멤버는 모델 기본값을 사용한다.
+    """
+    errors = []
+    values = {}
+    
+    def raw(field):
+        value = record.get(field)
+        return '' if value is None else str(value).strip()
+    
+    member_id = raw('id')
+    if member_id:
+        if member_id.isdigit():
+            values['id'] = int(member_id)
+        else:
+            errors.append(f'id 값이 올바르지 않습니다: {member_id}')
+    
+    name = raw('name')
+    if not name:
+        errors.append('이름을 입력해주세요.')
+    elif len(name) > 50:
+        errors.append('이름은 50자 이하여야 합니다.')
+    values['name'] = name
+    
+    gender = raw('gender')
+    if gender not in _GENDERS:
+        errors.append(f'성별 값이 올바르지 않습니다: {gender}')
+    else:
+        values['gender'] = _GENDERS[gender]
+    
+    experience = raw('experience_years')
+    if experience:
+        if experience.isdigit():
+            values['experience_years'] = int(experience)
+        else:
+            errors.append(f'구력 값이 올바르지 않습니다: {experience}')
+    
+    ntrp = raw('ntrp')
+    if ntrp:
+        if ntrp not in _NTRPS:
+            errors.append(f'NTRP 값이 올바르지 않습니다: {ntrp}')
+        else:
+            values['ntrp'] = ntrp
+    
+    status = raw('status')
+    if status:
+        if status not in _STATUSES:
+            errors.append(f'상태 값이 올바르지 않습니다: {status}')
+        else:
+            values['status'] = _STATUSES[status]
+    
+    phone = raw('phone')
+    if len(phone) > 20:
+        errors.append('연락처는 20자 이하여야 합니다.')
+    values['phone'] = phone
+    
+    is_admin = raw('is_admin')
+    if is_admin:
+        values['is_admin'] = is_admin.lower() in TRUE_VALUES
+    
+    return values, errors
+
+
+def import_members(records, chunk_size=500, dry_run=False):
+    """
+    (줄 번호, 레코드) 스트림을 검증 후 청크 단위로 upsert
+    
+    dry_run이면 검증과 매칭만 하고 저장하지 않는다.
+    Returns: {'created', 'updated', 'errors': [{'line', 'errors'}]}
+    """
+    result = {'created': 0, 'updated': 0, 'errors': []}
+    created_ids = []
+    updated_ids = []
+    
+    chunk = []
+    for line_no, record in records:
+        if isinstance(record, str):
+            result['errors'].append({'line': line_no, 'errors': [record]})
+            continue
+        
+        values, errors = clean_record(record)
+        if errors:
+            result['errors'].append({'line': line_no, 'errors': errors})
+            continue
+        
+        chunk.append((line_no, values))
+        if len(chunk) >= chunk_size:
+            _import_chunk(chunk, result, created_ids, updated_ids, dry_run)
+            chunk = []
+    
+    if chunk:
+        _import_chunk(chunk, result, created_ids, updated_ids, dry_run)
+    
+    result['errors'].sort(key=lambda error: error['line'])
+    if not dry_run and (created_ids or updated_ids):
+        members_bulk_changed.send(
+            sender=Member, created_ids=created_ids, updated_ids=updated_ids,
+        )
+    
+    return result
+
+
+def _import_chunk(chunk, result, created_ids, updated_ids, dry_run):
+    ids = {values['id'] for _, values in chunk if 'id' in values}
+    names = {values['name'] for _, values in chunk if 'id' not in values}
+    
+    with transaction.atomic():
+        # 청크의 기존 멤버를 한 번에 조회 (id 또는 이름으로)
+        existing = Member.objects.filter(id__in=ids) | Member.objects.filter(name__in=names)
+        by_id = {}
+        by_key = {}
+        for member in existing.select_for_update():
+            by_id[member.id] = member
+            by_key.setdefault((member.name, member.phone), member)
+        
+        now = timezone.now()
+        to_create = []
+        to_update = {}
+        for line_no, values in chunk:
+            if 'id' in values:
+                member = by_id.get(values.pop('id'))
+                if member is None:
+                    result['errors'].append({
+                        'line': line_no, 'errors': ['해당 id의 멤버가 없습니다.'],
+                    })
+                    continue
+            else:
+                member = by_key.get((values['name'], values['phone']))
+            
+            if member is None:
+                member = Member(**values)
+                # 같은 파일 안에서 다시 나오면 이 행을 갱신
+                by_key[(member.name, member.phone)] = member
+                to_create.append(member)
+                continue
+            
+            for field, value in values.items():
+                setattr(member, field, value)
+            member.updated_at = now
+            if member.pk:
+                to_update[member.pk] = member
+        
+        if dry_run:
+            result['created'] += len(to_create)
+            result['updated'] += len(to_update)
+            return
+        
+        Member.objects.bulk_create(to_create, batch_size=500)
+        Member.objects.bulk_update(list(to_update.values()), IMPORT_FIELDS + ['updated_at'], batch_size=500)
+    
+    result['created'] += len(to_create)
+    result['updated'] += len(to_update)
+    created_ids.extend(member.pk for member in to_create if member.pk)
+    updated_ids.extend(to_update)
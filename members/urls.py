@@ -6,7 +6,11 @@ app_name = 'members'
 urlpatterns = [
     path('', views.member_list, name='list'),
     path('api/list/', views.member_api_list, name='api_list'),
+    path('api/search/', views.member_search, name='search'),
     path('api/detail/<int:member_id>/', views.member_detail, name='detail'),
+    path('api/export/', views.member_export, name='export'),
+    path('api/import/', views.member_import, name='import'),
+    path('api/attendance/', views.attendance_leaderboard, name='attendance_leaderboard'),
     path('api/create/', views.member_create, name='create'),
     path('api/update/<int:member_id>/', views.member_update, name='update'),
     path('api/delete/<int:member_id>/', views.member_delete, name='delete'),
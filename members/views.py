@@ -1,12 +1,15 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
-from django.db.models import Count
-from datetime import datetime, timedelta
 from .models import Member
-from schedule.models import Event
+from .leaderboard import default_range, get_attendance_leaderboard
+from .rollup import get_rollup_attendance_stats
+from .search import get_member_index
+from .transfer import FORMATS, import_members, read_records, stream_export
+import csv
 import json
+from datetime import date
 
 
 def member_list(request):
@@ -115,61 +118,9 @@ def member_api_list(request):
 def member_detail(request, member_id):
     """멤버 상세 정보 API (참석률 통계 포함)"""
     member = get_object_or_404(Member, id=member_id)
-    today = timezone.now().date()
-    
-    # 전체 일정 (과거 일정만)
-    all_past_events = Event.objects.filter(date__lte=today)
-    total_events = all_past_events.count()
-    
-    # 참석한 일정
-    attended_events = all_past_events.filter(attendees=member)
-    attended_count = attended_events.count()
-    
-    # 참석률 계산
-    attendance_rate = round((attended_count / total_events * 100), 1) if total_events > 0 else 0
-    
-    # 최근 3개월 월별 참석률
-    monthly_stats = []
-    for i in range(3):
-        month_date = today - timedelta(days=30 * i)
-        month_start = month_date.replace(day=1)
-        if month_date.month == 12:
-            month_end = month_date.replace(year=month_date.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            month_end = month_date.replace(month=month_date.month + 1, day=1) - timedelta(days=1)
-        
-        month_events = Event.objects.filter(date__gte=month_start, date__lte=min(month_end, today))
-        month_total = month_events.count()
-        month_attended = month_events.filter(attendees=member).count()
-        month_rate = round((month_attended / month_total * 100), 1) if month_total > 0 else 0
-        
-        monthly_stats.append({
-            'month': f"{month_date.year}년 {month_date.month}월",
-            'total': month_total,
-            'attended': month_attended,
-            'rate': month_rate,
-        })
-    
-    # 최근 참석한 일정 (최근 5개)
-    recent_attended = attended_events.order_by('-date')[:5]
-    recent_events_list = [
-        {
-            'id': e.id,
-            'title': e.title,
-            'date': e.date.strftime('%Y-%m-%d'),
-            'location': e.location,
-        }
-        for e in recent_attended
-    ]
     
-    # 연속 참석 기록
-    consecutive_count = 0
-    past_events_ordered = all_past_events.order_by('-date')
-    for event in past_events_ordered:
-        if member in event.attendees.all():
-            consecutive_count += 1
-        else:
-            break
+    # 참석 통계 (미리 계산된 월별 롤업 행 조회)
+    stats = get_rollup_attendance_stats(member)
     
     return JsonResponse({
         'id': member.id,
@@ -181,13 +132,101 @@ def member_detail(request, member_id):
         'status': member.status,
         'status_display': member.get_status_display(),
         'phone': member.phone,
-        'stats': {
-            'total_events': total_events,
-            'attended_count': attended_count,
-            'attendance_rate': attendance_rate,
-            'consecutive_count': consecutive_count,
-            'monthly_stats': monthly_stats,
-            'recent_events': recent_events_list,
-        }
+        'stats': stats,
     })
 
+
+def member_search(request):
+    """
+    멤버 자동완성 검색 API
+    
+    GET 파라미터: q (이름 또는 초성, 예: "ㄱㅁㅅ"), gender, ntrp_min, ntrp_max,
+    status (기본 active, all이면 전체), limit (기본 10, 최대 50)
+    """
+    try:
+        ntrp_min = float(request.GET['ntrp_min']) if request.GET.get('ntrp_min') else None
+        ntrp_max = float(request.GET['ntrp_max']) if request.GET.get('ntrp_max') else None
+        limit = min(int(request.GET.get('limit', 10)), 50)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': '검색 조건이 올바르지 않습니다.'}, status=400)
+    
+    status = request.GET.get('status', 'active')
+    members = get_member_index().search(
+        request.GET.get('q', ''),
+        limit=limit,
+        gender=request.GET.get('gender') or None,
+        ntrp_min=ntrp_min,
+        ntrp_max=ntrp_max,
+        status=None if status == 'all' else status,
+    )
+    return JsonResponse({'members': members})
+
+
+def attendance_leaderboard(request):
+    """
+    클럽 전체 참석 리더보드 + 월별 히트맵 API
+    
+    GET 파라미터: start, end (YYYY-MM-DD, 기본 최근 12개월), include_inactive=1
+    """
+    today = timezone.now().date()
+    default_start, default_end = default_range(today)
+    try:
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else default_start
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else default_end
+    except ValueError:
+        return JsonResponse({'success': False, 'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}, status=400)
+    
+    if start > end:
+        return JsonResponse({'success': False, 'error': '시작일이 종료일보다 늦습니다.'}, status=400)
+    
+    include_inactive = request.GET.get('include_inactive') == '1'
+    return JsonResponse(get_attendance_leaderboard(start, end, include_inactive, today))
+
+
+def member_export(request):
+    """
+    멤버 내보내기 API (스트리밍)
+    
+    GET 파라미터: format=csv|ndjson (기본 csv), status=active|inactive (기본 전체)
+    """
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in FORMATS:
+        return JsonResponse({'success': False, 'error': '지원하지 않는 형식입니다.'}, status=400)
+    
+    members = Member.objects.all()
+    if request.GET.get('status'):
+        members = members.filter(status=request.GET['status'])
+    
+    content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(stream_export(fmt, members), content_type=f'{content_type}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="members.{fmt}"'
+    return response
+
+
+@require_http_methods(["POST"])
+def member_import(request):
+    """
+    멤버 일괄 가져오기 API
+    
+    multipart 'file' 필드 (CSV 또는 NDJSON). 형식은 format 파라미터 또는 파일 확장자.
+    dry_run=1이면 검증 결과만 반환.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'success': False, 'error': '파일을 선택해주세요.'}, status=400)
+    
+    fmt = request.POST.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+    if fmt == 'jsonl':
+        fmt = 'ndjson'
+    if fmt not in FORMATS:
+        return JsonResponse({'success': False, 'error': '지원하지 않는 형식입니다.'}, status=400)
+    
+    try:
+        result = import_members(
+            read_records(upload.file, fmt),
+            dry_run=request.POST.get('dry_run') == '1',
+        )
+    except (UnicodeDecodeError, csv.Error) as e:
+        return JsonResponse({'success': False, 'error': f'파일을 읽을 수 없습니다: {e}'}, status=400)
+    
+    return JsonResponse({'success': True, **result})
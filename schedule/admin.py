@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Event
+from .models import Event, GoogleCalendarSyncState, GoogleCalendarTombstone
 
 
 @admin.register(Event)
@@ -10,3 +10,14 @@ class EventAdmin(admin.ModelAdmin):
     filter_horizontal = ['attendees']
     ordering = ['-date', 'start_time']
 
+
+
+@admin.register(GoogleCalendarSyncState)
+class GoogleCalendarSyncStateAdmin(admin.ModelAdmin):
+    list_display = ['calendar_id', 'last_pulled_at', 'last_pushed_at', 'updated_at']
+    readonly_fields = ['sync_token', 'last_pulled_at', 'last_pushed_at']
+
+
+@admin.register(GoogleCalendarTombstone)
+class GoogleCalendarTombstoneAdmin(admin.ModelAdmin):
+    list_display = ['google_event_id', 'deleted_at']
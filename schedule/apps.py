@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ScheduleConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "schedule"
+    
+    def ready(self):
+        from . import dashboard, feed, signals  # noqa: F401
+        from .gcal import sync  # noqa: F401
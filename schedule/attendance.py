@@ -0,0 +1,53 @@
+"""
+참석 등록/취소 (RSVP)
+
+참석자 목록 전체를 다시 쓰는 attendees.set() 대신 중간 테이블에 멤버별로
+INSERT(충돌 무시) / DELETE 한 번씩만 실행한다. 여러 멤버가 동시에 등록해도
+서로의 변경을 덮어쓰지 않고, 같은 요청을 반복해도 결과가 같다.
+
+bulk_create/QuerySet.delete()는 m2m_changed를 발생시키지 않으므로 attendance_changed를 직접 보낸다.
+"""
+from django.db import transaction
+
+from members.models import Member
+
+from .models import Event
+from .signals import attendance_changed
+
+
+def unknown_member_ids(member_ids):
+    """존재하지 않는 멤버 id 목록"""
+    found = set(Member.objects.filter(id__in=member_ids).values_list('id', flat=True))
+    return sorted(set(member_ids) - found)
+
+
+def change_attendance(event, join=(), leave=()):
+    """
+    참석자 추가/제거 (저장된 일정 행)
+    
+    같은 멤버가 join/leave 모두에 있으면 leave가 우선한다.
+    Returns: {'attendees_count', 'removed'}
+    """
+    Attendance = Event.attendees.through
+    leave = set(leave)
+    join = set(join) - leave
+    
+    with transaction.atomic():
+        removed = 0
+        if leave:
+            removed, _ = Attendance.objects.filter(event_id=event.pk, member_id__in=leave).delete()
+        if join:
+            Attendance.objects.bulk_create(
+                [Attendance(event_id=event.pk, member_id=member_id) for member_id in join],
+                ignore_conflicts=True,
+            )
+        count = Attendance.objects.filter(event_id=event.pk).count()
+    
+    if join or removed:
+        attendance_changed.send(
+            sender=Event,
+            event_ids=[event.pk],
+            member_ids=sorted(join | leave),
+            dates=[event.date],
+        )
+    return {'attendees_count': count, 'removed': removed}
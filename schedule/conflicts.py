@@ -0,0 +1,110 @@
+"""
+장소(코트) 중복 예약 확인
+
+장소 하나에 대해 확인할 날짜 구간의 일정만 읽어 날짜별로 시작 시간 순 정렬 목록을 만들고
+(LocationIndex), 확인할 회차마다 해당 날짜 목록에서 이분 탐색으로 겹치는 일정을 찾는다.
+
+- 저장된 일정은 (location, date) 인덱스 범위 조회 1회, 반복 일정의 가상 회차는 같은 구간만 펼침
+- 반복 일정은 모든 회차를 같은 인덱스로 한 번에 확인
+- 비용은 저장된 전체 일정 수가 아니라 그 장소/구간의 일정 수에 비례
+
+중복은 막지 않고 생성/수정 응답의 conflicts로 알려준다.
+"""
+from bisect import bisect_left
+from datetime import datetime, time
+
+from django.db.models import Q
+
+from .models import Event
+from .recurrence import series_dates, virtual_occurrences
+
+
+def _as_date(value):
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+
+def _as_time(value):
+    if isinstance(value, time):
+        return value
+    return datetime.strptime(value[:5], '%H:%M').time()
+
+
+class LocationIndex:
+    """장소 하나의 [start, end] 구간 일정 (날짜별 시작 시간 순)"""
+    
+    def __init__(self, location, start, end, exclude_series_id=None, exclude_ids=()):
+        rows = Event.objects.filter(
+            location=location, date__gte=start, date__lte=end, recurrence_hidden=False,
+        )
+        if exclude_ids:
+            rows = rows.exclude(pk__in=exclude_ids)
+        if exclude_series_id is not None:
+            rows = rows.exclude(Q(pk=exclude_series_id) | Q(recurrence_parent_id=exclude_series_id))
+        
+        entries = [
+            (row['date'], row['start_time'], row['end_time'], row['id'], row['title'], False)
+            for row in rows.values('id', 'title', 'date', 'start_time', 'end_time')
+        ]
+        entries.extend(
+            (o.date, o.start_time, o.end_time, o.id, o.title, True)
+            for o in virtual_occurrences(start, end, location=location)
+            if o.id != exclude_series_id
+        )
+        entries.sort()
+        
+        self.by_date = {}
+        for entry in entries:
+            self.by_date.setdefault(entry[0], []).append(entry)
+        self.starts = {day: [entry[1] for entry in day_entries] for day, day_entries in self.by_date.items()}
+    
+    def overlapping(self, day, start_time, end_time):
+        """day의 [start_time, end_time)과 겹치는 일정"""
+        entries = self.by_date.get(day)
+        if not entries:
+            return []
+        # end_time 이후에 시작하는 일정은 볼 필요 없음
+        candidates = entries[:bisect_left(self.starts[day], end_time)]
+        return [entry for entry in candidates if entry[2] > start_time]
+
+
+def find_conflicts(location, dates, start_time, end_time, exclude_series_id=None, exclude_ids=()):
+    """
+    dates 각 날짜의 [start_time, end_time)과 같은 장소에서 겹치는 일정
+    
+    Returns: [{'date', 'event_id', 'title', 'start_time', 'end_time', 'is_virtual'}]
+    """
+    dates = sorted(set(dates))
+    if not location or not dates:
+        return []
+    start_time, end_time = _as_time(start_time), _as_time(end_time)
+    
+    index = LocationIndex(location, dates[0], dates[-1], exclude_series_id, exclude_ids)
+    conflicts = []
+    for day in dates:
+        for _, other_start, other_end, event_id, title, is_virtual in index.overlapping(day, start_time, end_time):
+            conflicts.append({
+                'date': day.strftime('%Y-%m-%d'),
+                'event_id': event_id,
+                'title': title,
+                'start_time': other_start.strftime('%H:%M'),
+                'end_time': other_end.strftime('%H:%M'),
+                'is_virtual': is_virtual,
+            })
+    return conflicts
+
+
+def event_conflicts(event):
+    """일정 한 건(또는 반복 시리즈 전체 회차)의 장소 중복"""
+    if event.is_parent_event:
+        skip = event.get_recurrence_exceptions()
+        dates = [day for day in series_dates(event) if day not in skip]
+        if not event.recurrence_hidden:
+            dates.append(event.date)
+        return find_conflicts(
+            event.location, dates, event.start_time, event.end_time, exclude_series_id=event.pk,
+        )
+    return find_conflicts(
+        event.location, [_as_date(event.date)], event.start_time, event.end_time, exclude_ids=[event.pk],
+    )
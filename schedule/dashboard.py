@@ -0,0 +1,113 @@
+"""
+홈 대시보드 집계
+
+홈은 모든 방문자의 첫 페이지라 컨텍스트 전체를 짧은 TTL로 캐시하고,
+일정/참석/멤버가 바뀌면 캐시 버전을 올려 바로 무효화한다.
+
+캐시가 비었을 때 쿼리
+- 멤버 수: 조건부 집계 1회 (활동중 전체/남/여)
+- 이번 달 일정 수: 1회 (date 인덱스 범위)
+- 다가오는 일정: 참석자 수를 annotate한 1회
+- 가상 회차: 이번 달 ~ 다가오는 일정 구간을 한 번에 펼침 (2회)
+"""
+from datetime import timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from members.models import Member
+from members.signals import members_bulk_changed
+
+from .models import Event
+from .recurrence import MAX_OCCURRENCES, virtual_occurrences
+from .signals import attendance_changed, events_changed
+
+
+CACHE_VERSION_KEY = 'home_dashboard:version'
+CACHE_TIMEOUT = 60
+
+UPCOMING_LIMIT = 3
+
+
+def _cache_version():
+    return cache.get_or_set(CACHE_VERSION_KEY, 1, None)
+
+
+def invalidate_dashboard():
+    try:
+        cache.incr(CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(CACHE_VERSION_KEY, 1, None)
+
+
+def get_home_dashboard(today):
+    """홈 템플릿 컨텍스트 (캐시)"""
+    key = f'home_dashboard:{_cache_version()}:{today}'
+    context = cache.get(key)
+    if context is None:
+        context = build_home_dashboard(today)
+        cache.set(key, context, CACHE_TIMEOUT)
+    return context
+
+
+def build_home_dashboard(today):
+    month_start = today.replace(day=1)
+    month_end = month_start + relativedelta(months=1) - timedelta(days=1)
+    
+    active = Q(status='active')
+    members = Member.objects.aggregate(
+        total=Count('id', filter=active),
+        male=Count('id', filter=active & Q(gender='M')),
+        female=Count('id', filter=active & Q(gender='F')),
+    )
+    
+    stored_this_month = Event.objects.filter(
+        date__gte=month_start, date__lte=month_end, recurrence_hidden=False,
+    ).count()
+    
+    rows = list(
+        Event.objects.filter(date__gte=today, recurrence_hidden=False)
+        .annotate(attendees_count=Count('attendees'))
+        .order_by('date', 'start_time')[:UPCOMING_LIMIT]
+    )
+    # 저장된 행이 limit개면 그 마지막 날짜까지만 펼치면 충분
+    if len(rows) == UPCOMING_LIMIT:
+        horizon = rows[-1].date
+    else:
+        horizon = today + timedelta(days=MAX_OCCURRENCES + 1)
+    
+    virtual = virtual_occurrences(month_start, max(month_end, horizon))
+    this_month_events = stored_this_month + sum(
+        1 for occurrence in virtual if month_start <= occurrence.date <= month_end
+    )
+    
+    upcoming = rows + [
+        occurrence for occurrence in virtual if today <= occurrence.date <= horizon
+    ]
+    upcoming.sort(key=lambda e: (e.date, e.start_time))
+    upcoming = upcoming[:UPCOMING_LIMIT]
+    next_event = upcoming[0] if upcoming else None
+    
+    return {
+        'upcoming_events': upcoming,
+        'next_event': next_event,
+        'next_event_attendees': next_event.attendees_count if next_event else 0,
+        'this_month_events': this_month_events,
+        'total_members': members['total'],
+        'male_members': members['male'],
+        'female_members': members['female'],
+    }
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(attendance_changed)
+@receiver(events_changed)
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+@receiver(members_bulk_changed)
+def invalidate_on_change(sender, **kwargs):
+    invalidate_dashboard()
@@ -0,0 +1,119 @@
+"""
+일정 피드 (캘린더 페이지, events_api)
+
+날짜 구간의 일정을 직렬화한 dict 목록으로 만들어 (시작일, 종료일)별로 캐시한다.
+월/주/목록 보기 모두 date 범위 조건이라 (date, start_time) 인덱스 범위 스캔으로 읽힌다.
+저장된 행은 Count('attendees')를 붙인 쿼리 한 번으로 필요한 컬럼만 읽고,
+반복 일정의 가상 회차는 recurrence.virtual_occurrences()로 펼친다.
+
+일정 저장/삭제, 참석자 변경, 일괄 수정(events_changed) 시 캐시 버전을 올려 무효화한다.
+캐시는 프로세스별(CACHES 설정 없음 → LocMemCache)이라 다른 프로세스의 변경
+(sync_google_calendar 워커, import_members 등)은 시그널로 알 수 없으므로 TTL을 짧게 둔다.
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from dateutil.relativedelta import relativedelta
+
+from .models import Event
+from .recurrence import virtual_occurrences
+from .signals import attendance_changed, events_changed
+
+
+CACHE_VERSION_KEY = 'schedule_feed:version'
+CACHE_TIMEOUT = 60  # 다른 프로세스의 변경도 이 시간 안에 반영
+MAX_RANGE_DAYS = 366  # 한 번에 조회할 수 있는 최대 구간
+
+FEED_FIELDS = [
+    'id', 'title', 'date', 'start_time', 'end_time', 'location',
+    'recurrence_type', 'recurrence_parent_id',
+]
+
+
+def _cache_version():
+    return cache.get_or_set(CACHE_VERSION_KEY, 1, None)
+
+
+def invalidate_feed():
+    try:
+        cache.incr(CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(CACHE_VERSION_KEY, 1, None)
+
+
+def month_range(year, month):
+    start = date(year, month, 1)
+    return start, start + relativedelta(months=1) - timedelta(days=1)
+
+
+
+def _serialize(event_id, title, day, start_time, end_time, location,
+               attendees_count, is_recurring, is_virtual):
+    return {
+        'id': event_id,
+        'title': title,
+        'date': day.strftime('%Y-%m-%d'),
+        'start_time': start_time.strftime('%H:%M'),
+        'end_time': end_time.strftime('%H:%M'),
+        'location': location,
+        'attendees_count': attendees_count,
+        'is_recurring': is_recurring,
+        'is_virtual': is_virtual,
+    }
+
+
+def build_feed(start, end):
+    """[start, end] 구간의 일정 dict 목록, (날짜, 시작 시간) 순"""
+    rows = (
+        Event.objects.filter(date__gte=start, date__lte=end, recurrence_hidden=False)
+        .annotate(attendees_count=Count('attendees'))
+        .order_by()
+        .values(*FEED_FIELDS, 'attendees_count')
+    )
+    events = [
+        _serialize(
+            row['id'], row['title'], row['date'], row['start_time'], row['end_time'],
+            row['location'], row['attendees_count'],
+            row['recurrence_type'] != 'none' or row['recurrence_parent_id'] is not None,
+            False,
+        )
+        for row in rows
+    ]
+    events.extend(
+        _serialize(
+            occurrence.id, occurrence.title, occurrence.date, occurrence.start_time,
+            occurrence.end_time, occurrence.location, 0, True, True,
+        )
+        for occurrence in virtual_occurrences(start, end)
+    )
+    events.sort(key=lambda e: (e['date'], e['start_time']))
+    return events
+
+
+def get_feed(start, end):
+    """
+    [start, end] 구간의 일정 피드 (캐시)
+    
+    Returns: {'events': [dict, ...], 'by_date': {'YYYY-MM-DD': [dict, ...]}}
+    """
+    key = f'schedule_feed:{_cache_version()}:{start}:{end}'
+    feed = cache.get(key)
+    if feed is None:
+        events = build_feed(start, end)
+        by_date = {}
+        for event in events:
+            by_date.setdefault(event['date'], []).append(event)
+        feed = {'events': events, 'by_date': by_date}
+        cache.set(key, feed, CACHE_TIMEOUT)
+    return feed
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(attendance_changed)
+@receiver(events_changed)
+def invalidate_on_event_change(sender, **kwargs):
+    invalidate_feed()
@@ -0,0 +1,10 @@
+"""
+구글 캘린더 동기화
+
+- client: API 클라이언트 (google-api-python-client / 가짜 서버용 HTTP), 백오프
+- rrule: 반복 규칙 ↔ RRULE 변환
+- sync: 증분 보내기/가져오기 엔진
+- fake: 로컬 가짜 구글 캘린더 API 서버
+
+실행: python manage.py sync_google_calendar (백그라운드 워커)
+"""
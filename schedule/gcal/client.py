@@ -0,0 +1,315 @@
+"""
+구글 캘린더 API 클라이언트
+
+동기화 엔진(sync.py)은 아래 두 메서드만 사용한다.
+- list_events(calendar_id, sync_token=None, page_token=None)
+  → {'items': [...], 'nextPageToken': ..., 'nextSyncToken': ...}
+- batch(calendar_id, operations) → operations와 같은 순서의 결과 (응답 dict 또는 CalendarApiError)
+  operation: ('insert', None, body) / ('update', event_id, body) / ('delete', event_id, None)
+
+구현
+- GoogleApiCalendarClient: google-api-python-client (운영, 서비스 계정 인증)
+- HttpCalendarClient: 표준 라이브러리만으로 같은 REST/배치 형식을 호출 (로컬 가짜 서버용)
+"""
+import json
+import logging
+import random
+import time
+import uuid
+from urllib.error import HTTPError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50  # 구글 배치 요청 한 번의 최대 요청 수
+PAGE_SIZE = 250
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'backendError'}
+
+
+class CalendarApiError(Exception):
+    def __init__(self, status, reason='', message=''):
+        super().__init__(f'{status} {reason} {message}'.strip())
+        self.status = status
+        self.reason = reason
+    
+    @property
+    def retryable(self):
+        return self.status in RETRYABLE_STATUSES or (
+            self.status == 403 and self.reason in RETRYABLE_REASONS
+        )
+    
+    @property
+    def gone(self):
+        """삭제된 일정 / 만료된 동기화 토큰"""
+        return self.status in (404, 410)
+
+
+def error_from_response(status, content):
+    """구글 오류 응답 본문 → CalendarApiError"""
+    try:
+        error = json.loads(content)['error']
+        reason = (error.get('errors') or [{}])[0].get('reason', '')
+        return CalendarApiError(status, reason, error.get('message', ''))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return CalendarApiError(status)
+
+
+def with_backoff(func, max_retries=5, base_delay=1.0, max_delay=32.0, sleep=time.sleep):
+    """
+    일시적 오류(429, 5xx, 403 rateLimitExceeded, 연결 오류)는 지수 백오프로 재시도
+    
+    대기 시간: min(max_delay, base_delay × 2^n) + 지터
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func()
+        except (CalendarApiError, OSError) as e:
+            retryable = e.retryable if isinstance(e, CalendarApiError) else True
+            if not retryable or attempt == max_retries:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt)
+            delay += random.uniform(0, delay / 2)
+            logger.warning('구글 캘린더 요청 실패 (%s), %.1f초 후 재시도', e, delay)
+            sleep(delay)
+
+
+def run_batch(client, calendar_id, operations, max_retries=5, base_delay=1.0, sleep=time.sleep):
+    """
+    operations를 BATCH_SIZE씩 배치로 보내고, 일시적 오류가 난 요청만 백오프 후 다시 보냄
+    
+    Returns: operations와 같은 순서의 결과 (응답 dict 또는 CalendarApiError)
+    """
+    results = [None] * len(operations)
+    pending = list(range(len(operations)))
+    
+    for attempt in range(max_retries + 1):
+        retry = []
+        for offset in range(0, len(pending), BATCH_SIZE):
+            indexes = pending[offset:offset + BATCH_SIZE]
+            responses = with_backoff(
+                lambda: client.batch(calendar_id, [operations[i] for i in indexes]),
+                max_retries=max_retries, base_delay=base_delay, sleep=sleep,
+            )
+            for index, response in zip(indexes, responses):
+                results[index] = response
+                if isinstance(response, CalendarApiError) and response.retryable:
+                    retry.append(index)
+        
+        if not retry or attempt == max_retries:
+            break
+        delay = base_delay * 2 ** attempt
+        logger.warning('배치 요청 %d건 일시적 오류, %.1f초 후 재시도', len(retry), delay)
+        sleep(delay + random.uniform(0, delay / 2))
+        pending = retry
+    
+    return results
+
+
+# === 배치 요청 (multipart/mixed) 인코딩 ===
+
+def encode_multipart(parts, boundary):
+    """[(Content-ID, HTTP 메시지 bytes)] → multipart/mixed 본문"""
+    chunks = []
+    for content_id, message in parts:
+        chunks.append(
+            f'--{boundary}\r\n'
+            'Content-Type: application/http\r\n'
+            'Content-Transfer-Encoding: binary\r\n'
+            f'Content-ID: <{content_id}>\r\n\r\n'.encode()
+            + message + b'\r\n'
+        )
+    chunks.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(chunks)
+
+
+def split_multipart(body, content_type):
+    """multipart/mixed 본문 → [(Content-ID, HTTP 메시지 bytes)]"""
+    boundary = None
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'boundary':
+            boundary = value.strip('"')
+    if not boundary:
+        raise ValueError('multipart boundary가 없습니다.')
+    
+    parts = []
+    for chunk in body.split(b'--' + boundary.encode())[1:]:
+        if chunk.startswith(b'--'):
+            break
+        headers, _, message = chunk.strip(b'\r\n').partition(b'\r\n\r\n')
+        content_id = ''
+        for line in headers.split(b'\r\n'):
+            name, _, value = line.decode().partition(':')
+            if name.strip().lower() == 'content-id':
+                content_id = value.strip().strip('<>')
+        parts.append((content_id, message))
+    return parts
+
+
+def parse_http_message(message):
+    """'METHOD path HTTP/1.1' 또는 'HTTP/1.1 200 OK' 메시지 → (시작 줄 토큰, 헤더 dict, 본문 bytes)"""
+    head, _, body = message.partition(b'\r\n\r\n')
+    lines = head.decode().split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return lines[0].split(' ', 2), headers, body
+
+
+class HttpCalendarClient:
+    """
+    구글 캘린더 REST 형식을 urllib로 호출하는 클라이언트
+    
+    base_url: 'http://127.0.0.1:8765' (가짜 서버) 처럼 /calendar/v3 앞부분
+    """
+    
+    def __init__(self, base_url, access_token=None, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.access_token = access_token
+        self.timeout = timeout
+    
+    def _events_path(self, calendar_id, event_id=None):
+        path = f'/calendar/v3/calendars/{quote(calendar_id, safe="")}/events'
+        if event_id:
+            path += f'/{quote(event_id, safe="")}'
+        return path
+    
+    def _open(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.access_token:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+        request = Request(self.base_url + path, data=body, method=method, headers=headers)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return response.headers.get('Content-Type', ''), response.read()
+        except HTTPError as e:
+            raise error_from_response(e.code, e.read()) from None
+    
+    def list_events(self, calendar_id, sync_token=None, page_token=None):
+        query = {'showDeleted': 'true', 'maxResults': PAGE_SIZE}
+        if sync_token:
+            query['syncToken'] = sync_token
+        if page_token:
+            query['pageToken'] = page_token
+        _, content = self._open('GET', f'{self._events_path(calendar_id)}?{urlencode(query)}')
+        return json.loads(content)
+    
+    def batch(self, calendar_id, operations):
+        boundary = uuid.uuid4().hex
+        parts = []
+        for index, (action, event_id, body) in enumerate(operations):
+            method, path = {
+                'insert': ('POST', self._events_path(calendar_id)),
+                'update': ('PUT', self._events_path(calendar_id, event_id)),
+                'delete': ('DELETE', self._events_path(calendar_id, event_id)),
+            }[action]
+            message = f'{method} {path} HTTP/1.1\r\n'.encode()
+            if body is not None:
+                message += b'Content-Type: application/json\r\n\r\n' + json.dumps(body).encode()
+            else:
+                message += b'\r\n'
+            parts.append((f'item{index}', message))
+        
+        content_type, content = self._open(
+            'POST', '/batch/calendar/v3', encode_multipart(parts, boundary),
+            {'Content-Type': f'multipart/mixed; boundary={boundary}'},
+        )
+        
+        results = [CalendarApiError(500, 'backendError', '배치 응답 누락')] * len(operations)
+        for content_id, message in split_multipart(content, content_type):
+            index = int(content_id.rsplit('item', 1)[-1])
+            (_, status, *_), _, body = parse_http_message(message)
+            status = int(status)
+            if status >= 400:
+                results[index] = error_from_response(status, body)
+            else:
+                results[index] = json.loads(body) if body.strip() else {}
+        return results
+
+
+class GoogleApiCalendarClient:
+    """
+    google-api-python-client 기반 클라이언트 (서비스 계정 인증)
+    
+    api_endpoint를 주면 인증 없이 해당 주소(가짜 서버)로 보낸다.
+    """
+    
+    def __init__(self, credentials_file=None, api_endpoint=None):
+        try:
+            import httplib2
+            from googleapiclient.discovery import build
+            from googleapiclient.errors import HttpError
+        except ImportError:
+            raise ImproperlyConfigured(
+                '구글 캘린더 동기화에는 google-api-python-client가 필요합니다.'
+            ) from None
+        
+        self._http_error = HttpError
+        if api_endpoint:
+            base = api_endpoint.rstrip('/')
+            self.batch_uri = f'{base}/batch/calendar/v3'
+            self.service = build(
+                'calendar', 'v3', http=httplib2.Http(),
+                client_options={'api_endpoint': f'{base}/calendar/v3/'},
+                cache_discovery=False,
+            )
+            return
+        
+        if not credentials_file:
+            raise ImproperlyConfigured('GOOGLE_CALENDAR_CREDENTIALS가 설정되지 않았습니다.')
+        from google.oauth2 import service_account
+        credentials = service_account.Credentials.from_service_account_file(
+            credentials_file, scopes=['https://www.googleapis.com/auth/calendar'],
+        )
+        self.batch_uri = None
+        self.service = build('calendar', 'v3', credentials=credentials, cache_discovery=False)
+    
+    def _error(self, e):
+        return error_from_response(e.resp.status, e.content)
+    
+    def list_events(self, calendar_id, sync_token=None, page_token=None):
+        params = {'calendarId': calendar_id, 'showDeleted': True, 'maxResults': PAGE_SIZE}
+        if sync_token:
+            params['syncToken'] = sync_token
+        if page_token:
+            params['pageToken'] = page_token
+        try:
+            return self.service.events().list(**params).execute()
+        except self._http_error as e:
+            raise self._error(e) from None
+    
+    def batch(self, calendar_id, operations):
+        results = [None] * len(operations)
+        
+        def callback(request_id, response, exception):
+            index = int(request_id)
+            if exception is None:
+                results[index] = response or {}
+            elif isinstance(exception, self._http_error):
+                results[index] = self._error(exception)
+            else:
+                results[index] = CalendarApiError(500, 'backendError', str(exception))
+        
+        batch = self.service.new_batch_http_request(callback=callback, batch_uri=self.batch_uri)
+        events = self.service.events()
+        for index, (action, event_id, body) in enumerate(operations):
+            if action == 'insert':
+                request = events.insert(calendarId=calendar_id, body=body)
+            elif action == 'update':
+                request = events.update(calendarId=calendar_id, eventId=event_id, body=body)
+            else:
+                request = events.delete(calendarId=calendar_id, eventId=event_id)
+            batch.add(request, request_id=str(index))
+        
+        try:
+            batch.execute()
+        except self._http_error as e:
+            raise self._error(e) from None
+        return results
@@ -0,0 +1,267 @@
+"""
+로컬 가짜 구글 캘린더 API 서버 (오프라인 동기화 테스트용)
+
+동기화에 쓰는 부분만 구글과 같은 주소/형식으로 흉내낸다.
+- GET    /calendar/v3/calendars/{calendarId}/events   (syncToken, pageToken, showDeleted, maxResults)
+- POST   /calendar/v3/calendars/{calendarId}/events
+- GET/PUT/PATCH/DELETE /calendar/v3/calendars/{calendarId}/events/{eventId}
+- POST   /batch/calendar/v3   (multipart/mixed 배치)
+
+동기화 토큰은 변경 일련번호다. expire_sync_tokens()로 이전 토큰을 만료시키면
+410 fullSyncRequired를 돌려준다. flaky 비율만큼 요청(배치는 요청별)을
+503 backendError / 403 rateLimitExceeded로 실패시켜 재시도 동작을 확인할 수 있다.
+
+실행: python manage.py run_fake_google_calendar --port 8765
+"""
+import copy
+import json
+import random
+import threading
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .client import encode_multipart, parse_http_message, split_multipart
+
+
+STATUS_TEXT = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 403: 'Forbidden',
+               404: 'Not Found', 410: 'Gone', 503: 'Service Unavailable'}
+
+
+class FakeApiError(Exception):
+    def __init__(self, status, reason, message=''):
+        super().__init__(message or reason)
+        self.status = status
+        self.reason = reason
+    
+    def body(self):
+        return {'error': {
+            'code': self.status,
+            'message': str(self),
+            'errors': [{'domain': 'global', 'reason': self.reason, 'message': str(self)}],
+        }}
+
+
+class FakeCalendarStore:
+    """캘린더별 일정 저장소 (메모리)"""
+    
+    def __init__(self, flaky=0.0, seed=None):
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.min_sync_token = 0
+        self.events = {}  # (calendarId, eventId) → 일정 dict
+        self.flaky = flaky
+        self.random = random.Random(seed)
+        self.requests = 0
+    
+    def _touch(self, event):
+        self.seq += 1
+        event['etag'] = f'"{self.seq}"'
+        event['updated'] = datetime.now(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        event['_seq'] = self.seq
+    
+    @staticmethod
+    def _public(event):
+        return {key: value for key, value in event.items() if not key.startswith('_')}
+    
+    def _get(self, calendar_id, event_id):
+        event = self.events.get((calendar_id, event_id))
+        if event is None:
+            raise FakeApiError(404, 'notFound', 'Not Found')
+        if event['status'] == 'cancelled':
+            raise FakeApiError(410, 'deleted', 'Resource has been deleted')
+        return event
+    
+    def maybe_fail(self):
+        self.requests += 1
+        if self.flaky and self.random.random() < self.flaky:
+            if self.random.random() < 0.5:
+                raise FakeApiError(503, 'backendError', 'Backend Error')
+            raise FakeApiError(403, 'rateLimitExceeded', 'Rate Limit Exceeded')
+    
+    def expire_sync_tokens(self):
+        with self.lock:
+            self.seq += 1
+            self.min_sync_token = self.seq
+    
+    # === 일정 API ===
+    
+    def insert(self, calendar_id, body):
+        with self.lock:
+            event = copy.deepcopy(body)
+            event.update({
+                'id': event.get('id') or uuid.uuid4().hex,
+                'kind': 'calendar#event',
+                'status': 'confirmed',
+                'created': datetime.now(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            })
+            self.events[(calendar_id, event['id'])] = event
+            self._touch(event)
+            return self._public(event)
+    
+    def get(self, calendar_id, event_id):
+        with self.lock:
+            return self._public(self._get(calendar_id, event_id))
+    
+    def update(self, calendar_id, event_id, body, patch=False):
+        with self.lock:
+            event = self._get(calendar_id, event_id)
+            kept = {key: event[key] for key in ('id', 'kind', 'status', 'created', 'etag')}
+            if not patch:
+                event.clear()
+            event.update(copy.deepcopy(body))
+            event.update(kept)
+            self._touch(event)
+            return self._public(event)
+    
+    def delete(self, calendar_id, event_id):
+        with self.lock:
+            event = self._get(calendar_id, event_id)
+            event['status'] = 'cancelled'
+            self._touch(event)
+    
+    def list(self, calendar_id, sync_token=None, page_token=None, show_deleted=False, max_results=250):
+        with self.lock:
+            if page_token:
+                base, snapshot, offset, deleted = (int(part) for part in page_token.split(':'))
+            else:
+                base = 0
+                if sync_token:
+                    if not sync_token.isdigit() or int(sync_token) < self.min_sync_token:
+                        raise FakeApiError(410, 'fullSyncRequired', 'Sync token is no longer valid')
+                    base = int(sync_token)
+                # 증분 조회는 삭제된 일정도 항상 포함
+                snapshot, offset, deleted = self.seq, 0, int(bool(sync_token) or show_deleted)
+            
+            changed = sorted(
+                (
+                    event for (calendar, _), event in self.events.items()
+                    if calendar == calendar_id and base < event['_seq'] <= snapshot
+                    and (deleted or event['status'] != 'cancelled')
+                ),
+                key=lambda event: event['_seq'],
+            )
+            page = changed[offset:offset + max_results]
+            result = {'kind': 'calendar#events', 'items': [self._public(event) for event in page]}
+            if offset + max_results < len(changed):
+                result['nextPageToken'] = f'{base}:{snapshot}:{offset + max_results}:{deleted}'
+            else:
+                result['nextSyncToken'] = str(snapshot)
+            return result
+    
+    def dispatch(self, method, path, query, body):
+        """(메서드, 경로) → (상태 코드, 응답 dict 또는 None)"""
+        try:
+            self.maybe_fail()
+            parts = [unquote(part) for part in path.strip('/').split('/')]
+            if parts[:3] != ['calendar', 'v3', 'calendars'] or len(parts) not in (5, 6) or parts[4] != 'events':
+                raise FakeApiError(404, 'notFound', 'Not Found')
+            calendar_id = parts[3]
+            event_id = parts[5] if len(parts) == 6 else None
+            
+            if event_id is None and method == 'GET':
+                return 200, self.list(
+                    calendar_id,
+                    sync_token=query.get('syncToken'),
+                    page_token=query.get('pageToken'),
+                    show_deleted=query.get('showDeleted') == 'true',
+                    max_results=int(query.get('maxResults', 250)),
+                )
+            if event_id is None and method == 'POST':
+                return 200, self.insert(calendar_id, body or {})
+            if event_id and method == 'GET':
+                return 200, self.get(calendar_id, event_id)
+            if event_id and method in ('PUT', 'PATCH'):
+                return 200, self.update(calendar_id, event_id, body or {}, patch=method == 'PATCH')
+            if event_id and method == 'DELETE':
+                self.delete(calendar_id, event_id)
+                return 204, None
+            raise FakeApiError(400, 'badRequest', f'{method} {path}')
+        except FakeApiError as e:
+            return e.status, e.body()
+
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    @property
+    def store(self):
+        return self.server.store
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _send(self, status, payload=None, content_type='application/json; charset=UTF-8'):
+        body = payload if isinstance(payload, bytes) else (
+            json.dumps(payload).encode() if payload is not None else b''
+        )
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+    
+    def _handle(self):
+        url = urlsplit(self.path)
+        raw = self._read_body()
+        
+        if url.path.rstrip('/') in ('/batch/calendar/v3', '/batch'):
+            self._handle_batch(raw)
+            return
+        
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            self._send(400, FakeApiError(400, 'parseError', 'Parse Error').body())
+            return
+        status, payload = self.store.dispatch(self.command, url.path, query, body)
+        self._send(status, payload)
+    
+    def _handle_batch(self, raw):
+        responses = []
+        for content_id, message in split_multipart(raw, self.headers.get('Content-Type', '')):
+            (method, target, *_), _, body = parse_http_message(message)
+            url = urlsplit(target)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            status, payload = self.store.dispatch(
+                method, url.path, query, json.loads(body) if body.strip() else None,
+            )
+            content = json.dumps(payload).encode() if payload is not None else b''
+            responses.append((
+                f'response-{content_id}',
+                f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "")}\r\n'
+                'Content-Type: application/json; charset=UTF-8\r\n'
+                f'Content-Length: {len(content)}\r\n\r\n'.encode() + content,
+            ))
+        
+        boundary = f'batch_{uuid.uuid4().hex}'
+        self._send(200, encode_multipart(responses, boundary), f'multipart/mixed; boundary={boundary}')
+    
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class FakeCalendarServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self, host='127.0.0.1', port=0, store=None, verbose=False):
+        super().__init__((host, port), FakeCalendarHandler)
+        self.store = store or FakeCalendarStore()
+        self.verbose = verbose
+    
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def start(self):
+        """백그라운드 스레드에서 실행 (테스트용). Returns: 서버 주소"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self.url
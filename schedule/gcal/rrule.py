@@ -0,0 +1,123 @@
+"""
+반복 규칙 ↔ RFC 5545 RRULE/EXDATE 변환
+
+클럽 일정의 반복 유형을 구글 캘린더 recurrence 줄로 바꾸고, 그 반대로 읽는다.
+- daily  → FREQ=DAILY
+- weekly → FREQ=WEEKLY
+- custom → FREQ=WEEKLY;BYDAY=MO,WE,FR
+
+UNTIL은 규칙의 실제 마지막 회차(MAX_OCCURRENCES 제한 반영) 시작 시각을 UTC로 쓴다.
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+
+from ..recurrence import iter_rule_dates, series_dates
+
+
+BYDAY = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+
+def local_zone():
+    return ZoneInfo(settings.TIME_ZONE)
+
+
+def _local_stamp(day, at):
+    return datetime.combine(day, at).strftime('%Y%m%dT%H%M%S')
+
+
+def build_recurrence(series, exdates=()):
+    """시리즈 → ['RRULE:...', 'EXDATE;TZID=...:...'] (반복이 아니면 빈 목록)"""
+    last = None
+    for last in series_dates(series):
+        pass
+    if last is None:
+        # 원본 이후 회차가 없으면 단일 일정과 같음
+        return []
+    
+    until = datetime.combine(last, series.start_time, tzinfo=local_zone()).astimezone(dt_timezone.utc)
+    rule = 'FREQ=DAILY' if series.recurrence_type == 'daily' else 'FREQ=WEEKLY'
+    if series.recurrence_type == 'custom':
+        weekdays = sorted(series.get_recurrence_weekdays_list())
+        rule += ';BYDAY=' + ','.join(BYDAY[day] for day in weekdays)
+    lines = [f'RRULE:{rule};UNTIL={until.strftime("%Y%m%dT%H%M%SZ")}']
+    
+    if exdates:
+        stamps = ','.join(_local_stamp(day, series.start_time) for day in sorted(exdates))
+        lines.append(f'EXDATE;TZID={settings.TIME_ZONE}:{stamps}')
+    return lines
+
+
+def _parse_stamp(value, tzid=None):
+    """'20261103T180000Z' / '20261103T180000' / '20261103' → 현지 날짜"""
+    if len(value) == 8:
+        return datetime.strptime(value, '%Y%m%d').date()
+    if value.endswith('Z'):
+        moment = datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=dt_timezone.utc)
+    else:
+        moment = datetime.strptime(value, '%Y%m%dT%H%M%S').replace(
+            tzinfo=ZoneInfo(tzid) if tzid else local_zone(),
+        )
+    return moment.astimezone(local_zone()).date()
+
+
+def parse_recurrence(lines, start):
+    """
+    recurrence 줄 → {'recurrence_type', 'recurrence_end_date', 'recurrence_weekdays', 'exceptions'}
+    
+    클럽 일정으로 표현할 수 없는 규칙(INTERVAL, 월/연 반복, 종료 없는 반복 등)이면 None.
+    start: 첫 회차 날짜 (COUNT를 종료일로 바꿀 때 사용)
+    """
+    rule = None
+    exceptions = set()
+    for line in lines:
+        name, _, value = line.partition(':')
+        name, *params = name.split(';')
+        if name == 'RRULE':
+            if rule is not None:
+                return None
+            rule = dict(part.split('=', 1) for part in value.split(';') if '=' in part)
+        elif name == 'EXDATE':
+            tzid = next((p.split('=', 1)[1] for p in params if p.startswith('TZID=')), None)
+            exceptions.update(_parse_stamp(stamp, tzid) for stamp in value.split(','))
+        else:
+            return None
+    
+    if rule is None or rule.get('INTERVAL', '1') != '1':
+        return None
+    if set(rule) - {'FREQ', 'UNTIL', 'COUNT', 'BYDAY', 'INTERVAL', 'WKST'}:
+        return None
+    
+    freq = rule.get('FREQ')
+    weekdays = []
+    if freq == 'DAILY' and 'BYDAY' not in rule:
+        recurrence_type = 'daily'
+    elif freq == 'WEEKLY' and rule.get('BYDAY', BYDAY[start.weekday()]) == BYDAY[start.weekday()]:
+        recurrence_type = 'weekly'
+    elif freq == 'WEEKLY':
+        try:
+            weekdays = sorted(BYDAY.index(day) for day in rule['BYDAY'].split(','))
+        except ValueError:
+            return None
+        recurrence_type = 'custom'
+    else:
+        return None
+    
+    if 'UNTIL' in rule:
+        end_date = _parse_stamp(rule['UNTIL'])
+    elif 'COUNT' in rule and rule['COUNT'].isdigit() and int(rule['COUNT']) > 0:
+        # 첫 회차(start) 포함 COUNT개 → 마지막 회차 날짜
+        end_date = start
+        rule_dates = iter_rule_dates(start, recurrence_type, date.max - timedelta(days=7), weekdays)
+        for _, end_date in zip(range(int(rule['COUNT']) - 1), rule_dates):
+            pass
+    else:
+        return None
+    
+    return {
+        'recurrence_type': recurrence_type,
+        'recurrence_end_date': end_date,
+        'recurrence_weekdays': weekdays,
+        'exceptions': exceptions,
+    }
@@ -0,0 +1,359 @@
+"""
+구글 캘린더 양방향 증분 동기화
+
+요청 처리 중에는 실행하지 않는다. sync_google_calendar 관리 명령(백그라운드 워커)에서만 호출.
+
+=== 보내기 (push) ===
+- 삭제: GoogleCalendarTombstone에 쌓인 구글 ID를 배치 DELETE
+- 변경: google_synced_at 이후 수정된 일정(updated_at)만 배치 insert/update
+  - 반복 원본은 RRULE + EXDATE(제외 날짜, 개별 저장된 회차 날짜, 숨긴 원본 날짜)로 보냄
+  - 개별 저장된 회차는 별도 단일 일정으로 보냄
+  - 저장된 회차가 바뀌면 EXDATE가 달라지므로 그 원본도 함께 보냄
+- 성공한 일정은 보낸 시점의 updated_at을 google_synced_at으로 기록
+  (보내는 동안 다시 수정됐다면 기록하지 않아 다음에 다시 보냄)
+
+=== 가져오기 (pull) ===
+- GoogleCalendarSyncState.sync_token으로 변경분만 조회, 페이지를 다 받은 뒤 새 토큰 저장
+- 토큰이 만료되면 (410) 토큰을 버리고 전체 조회
+- 우리가 보낸 변경(etag 동일)은 건너뜀
+- 충돌: 마지막 동기화 이후 로컬에서도 수정된 일정은 로컬 우선 (다음 보내기에서 덮어씀)
+- 원격 회차 취소(recurringEventId)는 로컬 시리즈의 제외 날짜로,
+  원격 회차 개별 수정은 지원하지 않아 건너뜀
+"""
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, time as dt_time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .. import recurrence
+from ..models import Event, GoogleCalendarSyncState, GoogleCalendarTombstone
+from .client import CalendarApiError, run_batch, with_backoff
+from .rrule import build_recurrence, local_zone, parse_recurrence
+
+
+logger = logging.getLogger(__name__)
+
+# 우리가 만든 구글 일정에 남기는 로컬 일정 id
+LOCAL_ID_PROPERTY = 'tennisClubEventId'
+
+
+class SyncEngine:
+    def __init__(self, client, calendar_id=None, sleep=None):
+        self.client = client
+        self.calendar_id = calendar_id or settings.GOOGLE_CALENDAR_ID
+        self.retry = {'sleep': sleep} if sleep else {}
+    
+    def state(self):
+        state, _ = GoogleCalendarSyncState.objects.get_or_create(calendar_id=self.calendar_id)
+        return state
+    
+    def sync(self):
+        """보내기 후 가져오기. Returns: 통계 dict"""
+        stats = self.push()
+        stats.update(self.pull())
+        return stats
+    
+    # === 보내기 ===
+    
+    def push(self):
+        stats = {'deleted': 0, 'inserted': 0, 'updated': 0, 'failed': 0}
+        self._push_tombstones(stats)
+        self._push_events(stats)
+        GoogleCalendarSyncState.objects.filter(pk=self.state().pk).update(last_pushed_at=timezone.now())
+        return stats
+    
+    def _push_tombstones(self, stats):
+        tombstones = list(GoogleCalendarTombstone.objects.values_list('id', 'google_event_id'))
+        if not tombstones:
+            return
+        
+        results = run_batch(
+            self.client, self.calendar_id,
+            [('delete', google_id, None) for _, google_id in tombstones],
+            **self.retry,
+        )
+        done = []
+        for (pk, google_id), result in zip(tombstones, results):
+            if isinstance(result, CalendarApiError) and not result.gone:
+                logger.warning('구글 일정 삭제 실패 %s: %s', google_id, result)
+                stats['failed'] += 1
+                continue
+            done.append(pk)
+        GoogleCalendarTombstone.objects.filter(pk__in=done).delete()
+        stats['deleted'] += len(done)
+    
+    def _dirty_events(self):
+        dirty = Q(google_synced_at__isnull=True) | Q(updated_at__gt=F('google_synced_at'))
+        events = {event.pk: event for event in Event.objects.filter(dirty)}
+        
+        # 저장된 회차가 바뀐 시리즈는 EXDATE가 달라지므로 원본도 다시 보냄
+        parent_ids = {
+            event.recurrence_parent_id for event in events.values()
+            if event.recurrence_parent_id and event.recurrence_parent_id not in events
+        }
+        events.update((event.pk, event) for event in Event.objects.filter(pk__in=parent_ids))
+        return list(events.values())
+    
+    def _push_events(self, stats):
+        events = self._dirty_events()
+        if not events:
+            return
+        
+        series_ids = [event.pk for event in events if event.is_parent_event]
+        stored_dates = defaultdict(set)
+        for parent_id, day in Event.objects.filter(
+            recurrence_parent_id__in=series_ids, recurrence_date__isnull=False,
+        ).values_list('recurrence_parent_id', 'recurrence_date'):
+            stored_dates[parent_id].add(day)
+        
+        operations = []
+        for event in events:
+            body = event_body(event, stored_dates.get(event.pk, ()))
+            if event.google_event_id:
+                operations.append(('update', event.google_event_id, body))
+            else:
+                operations.append(('insert', None, body))
+        
+        results = run_batch(self.client, self.calendar_id, operations, **self.retry)
+        
+        # 원격에서 지워진 일정은 로컬 수정이 우선이므로 새로 만든다
+        recreate = [
+            index for index, result in enumerate(results)
+            if isinstance(result, CalendarApiError) and result.gone and operations[index][0] == 'update'
+        ]
+        if recreate:
+            retried = run_batch(
+                self.client, self.calendar_id,
+                [('insert', None, operations[index][2]) for index in recreate],
+                **self.retry,
+            )
+            for index, result in zip(recreate, retried):
+                results[index] = result
+                operations[index] = ('insert',) + operations[index][1:]
+        
+        for event, (action, _, _), result in zip(events, operations, results):
+            if isinstance(result, CalendarApiError):
+                logger.warning('구글 일정 보내기 실패 (일정 %s): %s', event.pk, result)
+                stats['failed'] += 1
+                continue
+            self._mark_synced(event.pk, event.updated_at, result['id'], result.get('etag', ''))
+            stats['inserted' if action == 'insert' else 'updated'] += 1
+    
+    def _mark_synced(self, pk, synced_updated_at, google_id, etag):
+        """구글 ID/etag 기록, 그 사이 수정되지 않았으면 동기화 시각도 기록"""
+        Event.objects.filter(pk=pk).update(
+            google_event_id=google_id,
+            google_etag=etag,
+            google_synced_at=Case(
+                When(updated_at=synced_updated_at, then=Value(synced_updated_at)),
+                default=F('google_synced_at'),
+            ),
+        )
+    
+    # === 가져오기 ===
+    
+    def pull(self, full=False):
+        stats = {'pulled': 0, 'created': 0, 'changed': 0, 'removed': 0, 'skipped': 0}
+        state = self.state()
+        sync_token = '' if full else state.sync_token
+        
+        while True:
+            try:
+                next_token = self._pull_pages(sync_token, stats)
+                break
+            except CalendarApiError as e:
+                if not (e.status == 410 and sync_token):
+                    raise
+                logger.warning('구글 캘린더 동기화 토큰 만료, 전체 조회')
+                sync_token = ''
+        
+        GoogleCalendarSyncState.objects.filter(pk=state.pk).update(
+            sync_token=next_token, last_pulled_at=timezone.now(),
+        )
+        return stats
+    
+    def _pull_pages(self, sync_token, stats):
+        page_token = None
+        while True:
+            page = with_backoff(
+                lambda: self.client.list_events(self.calendar_id, sync_token or None, page_token),
+                **self.retry,
+            )
+            with transaction.atomic():
+                for item in page.get('items', []):
+                    stats['pulled'] += 1
+                    stats[self.apply_remote(item)] += 1
+            
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return page.get('nextSyncToken', '')
+    
+    def _find_local(self, item):
+        local_id = (
+            item.get('extendedProperties', {}).get('private', {}).get(LOCAL_ID_PROPERTY)
+        )
+        if local_id and local_id.isdigit():
+            event = Event.objects.filter(pk=int(local_id)).first()
+            if event is not None:
+                return event
+        return Event.objects.filter(google_event_id=item['id']).first()
+    
+    @staticmethod
+    def _locally_modified(event):
+        return event.google_synced_at is None or event.updated_at > event.google_synced_at
+    
+    def apply_remote(self, item):
+        """원격 변경 하나 반영. Returns: 통계 키"""
+        if item.get('recurringEventId'):
+            return self._apply_remote_instance(item)
+        
+        event = self._find_local(item)
+        
+        if item.get('status') == 'cancelled':
+            if event is None:
+                return 'skipped'
+            if self._locally_modified(event):
+                # 로컬 수정 우선: 구글 ID를 떼어 다음 보내기에서 새로 만든다
+                Event.objects.filter(pk=event.pk).update(google_event_id=None, google_etag='')
+                return 'skipped'
+            event._from_google = True
+            event.delete()
+            return 'removed'
+        
+        if event is not None and (event.google_etag == item.get('etag') or self._locally_modified(event)):
+            return 'skipped'
+        
+        values = event_values(item)
+        if values is None:
+            logger.info('지원하지 않는 구글 일정 건너뜀: %s', item.get('id'))
+            return 'skipped'
+        
+        created = event is None
+        exceptions = values.pop('exceptions', None)
+        if exceptions and not created:
+            # 보낼 때 EXDATE에 넣은 저장된 회차/숨긴 원본 날짜는 제외 날짜가 아님
+            exceptions -= set(
+                event.recurrence_children.filter(recurrence_date__isnull=False)
+                .values_list('recurrence_date', flat=True)
+            )
+            exceptions.discard(event.date)
+        event = event or Event()
+        for field, value in values.items():
+            setattr(event, field, value)
+        if exceptions is not None:
+            event.set_recurrence_exceptions(exceptions)
+        event.google_event_id = item['id']
+        event.google_etag = item.get('etag', '')
+        event.save()
+        Event.objects.filter(pk=event.pk).update(google_synced_at=event.updated_at)
+        return 'created' if created else 'changed'
+    
+    def _apply_remote_instance(self, item):
+        """반복 일정의 원격 회차 변경 (취소만 반영)"""
+        if item.get('status') != 'cancelled':
+            return 'skipped'
+        
+        series = Event.objects.filter(google_event_id=item['recurringEventId']).first()
+        original = parse_event_time(item.get('originalStartTime', {}))
+        if series is None or original is None or not series.is_parent_event:
+            return 'skipped'
+        
+        day = original[0]
+        if day in series.get_recurrence_exceptions() or not recurrence.is_rule_date(series, day):
+            return 'skipped'
+        child = Event.objects.filter(recurrence_parent=series, recurrence_date=day).first()
+        if child is not None:
+            child._from_google = True
+            child.delete()
+        recurrence.add_exception(series, day)
+        return 'removed'
+
+
+# === 변환 ===
+
+def _event_time(day, at):
+    return {
+        'dateTime': datetime.combine(day, at).strftime('%Y-%m-%dT%H:%M:%S'),
+        'timeZone': settings.TIME_ZONE,
+    }
+
+
+def event_body(event, stored_dates=()):
+    """로컬 일정 → 구글 일정 본문"""
+    body = {
+        'summary': event.title,
+        'location': event.location,
+        'description': event.description,
+        'start': _event_time(event.date, event.start_time),
+        'end': _event_time(event.date, event.end_time),
+        'extendedProperties': {'private': {LOCAL_ID_PROPERTY: str(event.pk)}},
+    }
+    if event.is_parent_event:
+        exdates = event.get_recurrence_exceptions() | set(stored_dates)
+        if event.recurrence_hidden:
+            exdates.add(event.date)
+        body['recurrence'] = build_recurrence(event, exdates)
+    return body
+
+
+def parse_event_time(value):
+    """구글 start/end → (현지 날짜, 현지 시각). 종일 일정은 시각 None"""
+    if value.get('dateTime'):
+        moment = datetime.fromisoformat(value['dateTime'])
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=local_zone())
+        moment = moment.astimezone(local_zone())
+        return moment.date(), moment.time().replace(tzinfo=None)
+    if value.get('date'):
+        return datetime.strptime(value['date'], '%Y-%m-%d').date(), None
+    return None
+
+
+def event_values(item):
+    """구글 일정 → 로컬 필드 dict (표현할 수 없으면 None)"""
+    start = parse_event_time(item.get('start', {}))
+    end = parse_event_time(item.get('end', {}))
+    if start is None or end is None:
+        return None
+    
+    day, start_time = start
+    end_time = end[1] if end[0] == day else None
+    values = {
+        'title': (item.get('summary') or '(제목 없음)')[:200],
+        'location': (item.get('location') or '')[:200],
+        'description': item.get('description') or '',
+        'date': day,
+        'start_time': start_time or dt_time(0, 0),
+        'end_time': end_time or dt_time(23, 59),
+        'recurrence_type': 'none',
+        'recurrence_end_date': None,
+        'recurrence_weekdays': '',
+    }
+    
+    if item.get('recurrence'):
+        rule = parse_recurrence(item['recurrence'], day)
+        if rule is None:
+            return None
+        values.update(
+            recurrence_type=rule['recurrence_type'],
+            recurrence_end_date=rule['recurrence_end_date'],
+            recurrence_weekdays=(
+                json.dumps(rule['recurrence_weekdays']) if rule['recurrence_weekdays'] else ''
+            ),
+            exceptions=rule['exceptions'],
+        )
+    return values
+
+
+@receiver(post_delete, sender=Event)
+def record_tombstone(sender, instance, **kwargs):
+    """구글에 올라간 일정이 삭제되면 다음 보내기에서 원격 삭제하도록 기록"""
+    if instance.google_event_id and not getattr(instance, '_from_google', False):
+        GoogleCalendarTombstone.objects.get_or_create(google_event_id=instance.google_event_id)
@@ -0,0 +1,153 @@
+"""
+iCalendar(ICS) 구독 피드
+
+휴대폰 캘린더 앱이 주기적으로 가져가는 피드라 한 번에 만들지 않고 VEVENT 단위로 스트리밍한다.
+- 반복 원본: RRULE + EXDATE 한 건 (회차를 펼치지 않음)
+- 개별 저장된 회차: 원본과 같은 UID + RECURRENCE-ID로 해당 회차를 덮어씀
+- 멤버 피드: 그 멤버가 참석하는 (저장된) 일정만, 단일 일정으로
+
+ETag/Last-Modified는 피드 대상 일정의 (개수, id 합, 최대 updated_at) 집계 한 번으로 만든다.
+변경이 없으면 이 쿼리 하나로 304를 돌려준다.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count, Max, Q, Sum
+
+from .gcal.rrule import build_recurrence, local_zone
+from .models import Event
+
+
+WINDOW_DAYS = 365  # 오늘 기준 이만큼 지난 일정까지 포함
+
+CALENDAR_NAME = '테니스 클럽 일정'
+
+
+def feed_events(today, member=None):
+    """피드 대상 일정 쿼리셋"""
+    since = today - timedelta(days=WINDOW_DAYS)
+    if member is not None:
+        return member.events.filter(date__gte=since)
+    return Event.objects.filter(Q(date__gte=since) | Q(recurrence_end_date__gte=since))
+
+
+def feed_version(events):
+    """(ETag, Last-Modified) - 집계 쿼리 1회"""
+    stats = events.aggregate(count=Count('id'), id_sum=Sum('id'), last=Max('updated_at'))
+    last = stats['last']
+    key = f"{stats['count']}:{stats['id_sum']}:{last.isoformat() if last else ''}"
+    return hashlib.md5(key.encode()).hexdigest(), last
+
+
+# === 직렬화 ===
+
+def escape_text(value):
+    return (
+        value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """RFC 5545 줄 접기 (75옥텟, UTF-8 문자 중간에서 자르지 않음)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    
+    parts = []
+    current = ''
+    size = 0
+    limit = 75
+    for ch in line:
+        width = len(ch.encode())
+        if size + width > limit:
+            parts.append(current)
+            current, size, limit = '', 0, 74  # 이어지는 줄은 앞 공백 1옥텟
+        current += ch
+        size += width
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _local(day, at):
+    return f'TZID={settings.TIME_ZONE}:' + datetime.combine(day, at).strftime('%Y%m%dT%H%M%S')
+
+
+def _utc(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def vtimezone():
+    """설정 시간대의 VTIMEZONE (현재 오프셋 고정)"""
+    offset = datetime.now(local_zone()).utcoffset()
+    minutes = int(offset.total_seconds() // 60)
+    sign = '+' if minutes >= 0 else '-'
+    stamp = f'{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}'
+    return [
+        'BEGIN:VTIMEZONE',
+        f'TZID:{settings.TIME_ZONE}',
+        'BEGIN:STANDARD',
+        'DTSTART:19700101T000000',
+        f'TZOFFSETFROM:{stamp}',
+        f'TZOFFSETTO:{stamp}',
+        f'TZNAME:{datetime.now(local_zone()).tzname()}',
+        'END:STANDARD',
+        'END:VTIMEZONE',
+    ]
+
+
+def vevent(event, host, as_single=False):
+    """일정 → VEVENT 줄 목록"""
+    uid_id = event.pk
+    lines = ['BEGIN:VEVENT']
+    
+    parent = event.recurrence_parent if not as_single else None
+    if parent is not None and event.recurrence_date:
+        uid_id = parent.pk
+        lines.append(f'RECURRENCE-ID;{_local(event.recurrence_date, parent.start_time)}')
+    
+    lines += [
+        f'UID:event-{uid_id}@{host}',
+        f'DTSTAMP:{_utc(event.updated_at)}',
+        f'LAST-MODIFIED:{_utc(event.updated_at)}',
+        f'DTSTART;{_local(event.date, event.start_time)}',
+        f'DTEND;{_local(event.date, event.end_time)}',
+        f'SUMMARY:{escape_text(event.title)}',
+    ]
+    if event.location:
+        lines.append(f'LOCATION:{escape_text(event.location)}')
+    if event.description:
+        lines.append(f'DESCRIPTION:{escape_text(event.description)}')
+    
+    if event.is_parent_event and not as_single:
+        exdates = event.get_recurrence_exceptions()
+        if event.recurrence_hidden:
+            exdates.add(event.date)
+        lines += build_recurrence(event, exdates)
+    
+    lines.append('END:VEVENT')
+    return lines
+
+
+def stream_ics(events, host, as_single=False):
+    """VCALENDAR를 VEVENT 단위로 스트리밍"""
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Tennis Club//Schedule//KO',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{CALENDAR_NAME}',
+        f'X-WR-TIMEZONE:{settings.TIME_ZONE}',
+    ] + vtimezone()
+    yield ''.join(fold(line) for line in header)
+    
+    rows = events.select_related('recurrence_parent').order_by('date', 'start_time', 'id')
+    for event in rows.iterator(chunk_size=500):
+        if event.recurrence_hidden and as_single:
+            # 원본 회차가 숨겨진 시리즈 행은 단일 일정으로 내보낼 회차가 없음
+            continue
+        yield ''.join(fold(line) for line in vevent(event, host, as_single))
+    
+    yield 'END:VCALENDAR\r\n'
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from schedule.gcal.fake import FakeCalendarServer, FakeCalendarStore
+
+
+class Command(BaseCommand):
+    help = '오프라인 동기화 테스트용 가짜 구글 캘린더 API 서버를 실행합니다'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--flaky', type=float, default=0.0,
+            help='이 비율만큼 요청을 503/403 rateLimitExceeded로 실패시킴 (0~1)',
+        )
+        parser.add_argument('--verbose-requests', action='store_true', help='요청 로그 출력')
+    
+    def handle(self, *args, **options):
+        server = FakeCalendarServer(
+            options['host'], options['port'],
+            store=FakeCalendarStore(flaky=options['flaky']),
+            verbose=options['verbose_requests'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'가짜 구글 캘린더 API: {server.url}'))
+        self.stdout.write(f'동기화: python manage.py sync_google_calendar --api-url {server.url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,73 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from schedule.gcal.client import CalendarApiError, GoogleApiCalendarClient, HttpCalendarClient
+from schedule.gcal.sync import SyncEngine
+
+
+class Command(BaseCommand):
+    help = '구글 캘린더와 일정을 증분 동기화합니다 (백그라운드 워커)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='N초마다 반복 실행 (0이면 한 번만 실행)',
+        )
+        parser.add_argument(
+            '--calendar-id', default=settings.GOOGLE_CALENDAR_ID,
+            help='동기화할 캘린더 ID (기본 GOOGLE_CALENDAR_ID)',
+        )
+        parser.add_argument(
+            '--api-url',
+            help='구글 대신 이 주소의 캘린더 API로 보냄 (예: 가짜 서버 http://127.0.0.1:8765)',
+        )
+        parser.add_argument(
+            '--use-google-client', action='store_true',
+            help='--api-url에도 google-api-python-client 사용 (기본은 내장 HTTP 클라이언트)',
+        )
+        parser.add_argument('--push-only', action='store_true', help='보내기만')
+        parser.add_argument('--pull-only', action='store_true', help='가져오기만')
+        parser.add_argument(
+            '--full', action='store_true',
+            help='동기화 토큰을 버리고 전체 조회로 가져오기',
+        )
+    
+    def handle(self, *args, **options):
+        if options['api_url'] and not options['use_google_client']:
+            client = HttpCalendarClient(options['api_url'])
+        else:
+            client = GoogleApiCalendarClient(
+                credentials_file=settings.GOOGLE_CALENDAR_CREDENTIALS_FILE,
+                api_endpoint=options['api_url'],
+            )
+        engine = SyncEngine(client, options['calendar_id'])
+        
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+        
+        full = options['full']
+        while True:
+            try:
+                stats = {}
+                if not options['pull_only']:
+                    stats.update(engine.push())
+                if not options['push_only']:
+                    stats.update(engine.pull(full=full))
+                    full = False
+                self.stdout.write(
+                    self.style.SUCCESS(' '.join(f'{key}={value}' for key, value in stats.items()))
+                )
+            except (CalendarApiError, OSError) as e:
+                if not options['interval']:
+                    raise CommandError(f'동기화 실패: {e}')
+                self.stderr.write(f'동기화 실패, 다음 주기에 다시 시도: {e}')
+            
+            if not options['interval']:
+                return
+            for _ in range(options['interval']):
+                if stopping:
+                    return
+                time.sleep(1)
@@ -0,0 +1,91 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:41
+
+import json
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def _rule_dates(start, recurrence_type, end_date, weekdays):
+    # 기존 자식 일정 생성 로직과 동일 (최대 365개)
+    current = start
+    for _ in range(365):
+        if recurrence_type == "daily":
+            current += timedelta(days=1)
+        elif recurrence_type == "weekly":
+            current += timedelta(weeks=1)
+        else:
+            current += timedelta(days=1)
+            while current <= end_date and current.weekday() not in weekdays:
+                current += timedelta(days=1)
+        if current > end_date:
+            return
+        yield current
+
+
+def mark_materialized_series(apps, schema_editor):
+    """
+    기존 반복 일정은 모든 회차가 자식 행으로 저장되어 있으므로,
+    자식에 원래 날짜를 기록하고 자식이 없는 규칙 날짜(개별 삭제된 회차)는 제외 날짜로 옮긴다.
+    """
+    Event = apps.get_model("schedule", "Event")
+
+    parents = Event.objects.filter(recurrence_parent__isnull=True).exclude(
+        recurrence_type="none"
+    )
+    for parent in parents.exclude(recurrence_end_date__isnull=True):
+        children = Event.objects.filter(recurrence_parent=parent)
+        children.update(recurrence_date=models.F("date"))
+        child_dates = set(children.values_list("date", flat=True))
+
+        try:
+            weekdays = (
+                json.loads(parent.recurrence_weekdays)
+                if parent.recurrence_weekdays
+                else []
+            )
+        except ValueError:
+            weekdays = []
+        missing = [
+            d.isoformat()
+            for d in _rule_dates(
+                parent.date,
+                parent.recurrence_type,
+                parent.recurrence_end_date,
+                weekdays,
+            )
+            if d not in child_dates
+        ]
+        if missing:
+            parent.recurrence_exceptions = json.dumps(missing)
+            parent.save(update_fields=["recurrence_exceptions"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0002_event_recurrence_end_date_event_recurrence_parent_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_date",
+            field=models.DateField(
+                blank=True, null=True, verbose_name="원래 반복 날짜"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_exceptions",
+            field=models.TextField(
+                blank=True, default="", verbose_name="반복 제외 날짜"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_hidden",
+            field=models.BooleanField(default=False, verbose_name="원본 회차 숨김"),
+        ),
+        migrations.RunPython(mark_materialized_series, migrations.RunPython.noop),
+    ]
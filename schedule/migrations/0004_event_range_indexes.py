@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0003_event_recurrence_exceptions"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["date", "start_time"], name="event_date_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["recurrence_parent", "date"], name="event_parent_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0004_event_range_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GoogleCalendarSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "calendar_id",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="캘린더 ID"
+                    ),
+                ),
+                (
+                    "sync_token",
+                    models.TextField(
+                        blank=True, default="", verbose_name="동기화 토큰"
+                    ),
+                ),
+                (
+                    "last_pulled_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="마지막 가져오기"
+                    ),
+                ),
+                (
+                    "last_pushed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="마지막 보내기"
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "구글 캘린더 동기화 상태",
+                "verbose_name_plural": "구글 캘린더 동기화 상태",
+            },
+        ),
+        migrations.CreateModel(
+            name="GoogleCalendarTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "google_event_id",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="구글 캘린더 ID"
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="삭제 시각"),
+                ),
+            ],
+            options={
+                "verbose_name": "구글 캘린더 삭제 대기",
+                "verbose_name_plural": "구글 캘린더 삭제 대기",
+                "ordering": ["deleted_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="google_etag",
+            field=models.CharField(
+                blank=True, default="", max_length=255, verbose_name="구글 캘린더 ETag"
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="google_synced_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="구글 캘린더 동기화 시각"
+            ),
+        ),
+    ]
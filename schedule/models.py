@@ -1,3 +1,6 @@
+import json
+from datetime import date
+
 from django.db import models
 from members.models import Member
 
@@ -30,6 +33,9 @@ class Event(models.Model):
     description = models.TextField(blank=True, verbose_name='설명')
     attendees = models.ManyToManyField(Member, blank=True, related_name='events', verbose_name='참석 멤버')
     google_event_id = models.CharField(max_length=255, blank=True, null=True, verbose_name='구글 캘린더 ID')
+    google_etag = models.CharField(max_length=255, blank=True, default='', verbose_name='구글 캘린더 ETag')
+    # 마지막으로 구글 캘린더와 맞춘 시점의 updated_at (이후 수정되면 다시 보냄)
+    google_synced_at = models.DateTimeField(null=True, blank=True, verbose_name='구글 캘린더 동기화 시각')
     
     # 반복 일정 관련 필드
     recurrence_type = models.CharField(
@@ -57,14 +63,42 @@ class Event(models.Model):
         blank=True, 
         verbose_name='반복 요일'
     )
+    # 반복에서 제외된 날짜들 (JSON: ["2025-01-08", ...]) - 개별 삭제된 회차
+    recurrence_exceptions = models.TextField(
+        blank=True,
+        default='',
+        verbose_name='반복 제외 날짜'
+    )
+    # 개별 저장된 회차가 대신하는 원래 반복 날짜 (날짜를 옮겨도 유지)
+    recurrence_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='원래 반복 날짜'
+    )
+    # 원본 일정 자체 회차가 분리/삭제되어 반복 규칙만 남은 경우
+    recurrence_hidden = models.BooleanField(
+        default=False,
+        verbose_name='원본 회차 숨김'
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # 가상 회차(recurrence.Occurrence)와 구분
+    is_virtual = False
+    
     class Meta:
         verbose_name = '일정'
         verbose_name_plural = '일정들'
         ordering = ['date', 'start_time']
+        indexes = [
+            # 구간 조회 (date 범위 + 정렬)
+            models.Index(fields=['date', 'start_time'], name='event_date_start_idx'),
+            # 시리즈의 저장된 회차 조회
+            models.Index(fields=['recurrence_parent', 'date'], name='event_parent_date_idx'),
+            # 장소 중복 확인
+            models.Index(fields=['location', 'date'], name='event_location_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.date})"
@@ -92,3 +126,48 @@ class Event(models.Model):
             except:
                 return []
         return []
+    
+    def get_recurrence_exceptions(self):
+        """반복 제외 날짜 집합 반환"""
+        if not self.recurrence_exceptions:
+            return set()
+        try:
+            return {date.fromisoformat(d) for d in json.loads(self.recurrence_exceptions)}
+        except (ValueError, TypeError):
+            return set()
+    
+    def set_recurrence_exceptions(self, dates):
+        self.recurrence_exceptions = json.dumps(sorted(d.isoformat() for d in dates)) if dates else ''
+
+
+class GoogleCalendarSyncState(models.Model):
+    """캘린더별 구글 캘린더 동기화 커서"""
+    
+    calendar_id = models.CharField(max_length=255, unique=True, verbose_name='캘린더 ID')
+    # events.list 증분 조회 토큰 (비어 있으면 다음 가져오기는 전체 조회)
+    sync_token = models.TextField(blank=True, default='', verbose_name='동기화 토큰')
+    last_pulled_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막 가져오기')
+    last_pushed_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막 보내기')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = '구글 캘린더 동기화 상태'
+        verbose_name_plural = '구글 캘린더 동기화 상태'
+    
+    def __str__(self):
+        return self.calendar_id
+
+
+class GoogleCalendarTombstone(models.Model):
+    """삭제된 일정의 구글 캘린더 ID (다음 보내기에서 원격 삭제)"""
+    
+    google_event_id = models.CharField(max_length=255, unique=True, verbose_name='구글 캘린더 ID')
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name='삭제 시각')
+    
+    class Meta:
+        verbose_name = '구글 캘린더 삭제 대기'
+        verbose_name_plural = '구글 캘린더 삭제 대기'
+        ordering = ['deleted_at']
+    
+    def __str__(self):
+        return self.google_event_id
@@ -0,0 +1,445 @@
+"""
+반복 일정 엔진
+
+반복 일정은 원본 일정(시리즈) 한 행에 규칙(유형, 요일, 종료일, 제외 날짜)만 저장하고,
+회차는 요청된 날짜 구간에서 그때그때 펼친다 (가상 회차).
+
+=== 회차 ===
+- 첫 회차 = 원본 일정 행 자체 (원본 날짜)
+- 이후 회차 = 규칙 날짜 (기존 자식 일정 생성 로직과 같은 계산, 최대 MAX_OCCURRENCES개)
+- 개별 수정되거나 참석자가 있는 회차만 자식 행으로 저장된다 (recurrence_date = 원래 날짜)
+- 저장된 회차와 제외 날짜(recurrence_exceptions)는 펼칠 때 건너뜀
+- 원본 회차를 따로 수정/삭제하면 원본 행은 규칙만 남기고 숨김 (recurrence_hidden)
+
+가상 회차의 id는 원본 일정 id이고, 날짜로 구분한다 (?occurrence=YYYY-MM-DD).
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Event
+from .signals import attendance_changed, events_changed
+
+
+MAX_OCCURRENCES = 365  # 원본 이후 최대 회차 수 (최대 1년치)
+
+# 가상 회차가 원본에서 그대로 가져오는 필드
+SERIES_FIELDS = ['title', 'start_time', 'end_time', 'location', 'description']
+
+
+def iter_rule_dates(start, recurrence_type, end_date, weekdays):
+    """원본 날짜 이후의 규칙 날짜 (원본 날짜 제외)"""
+    if recurrence_type == 'none' or end_date is None:
+        return
+    
+    current = start
+    for _ in range(MAX_OCCURRENCES):
+        if recurrence_type == 'daily':
+            current += timedelta(days=1)
+        elif recurrence_type == 'weekly':
+            current += timedelta(weeks=1)
+        elif recurrence_type == 'custom':
+            current += timedelta(days=1)
+            # 선택된 요일이 아니면 건너뛰기
+            while current <= end_date and current.weekday() not in weekdays:
+                current += timedelta(days=1)
+        else:
+            return
+        
+        if current > end_date:
+            return
+        yield current
+
+
+def series_dates(series):
+    """시리즈의 규칙 날짜 (원본 날짜 제외, 제외/저장 여부와 무관)"""
+    return iter_rule_dates(
+        series.date,
+        series.recurrence_type,
+        series.recurrence_end_date,
+        series.get_recurrence_weekdays_list(),
+    )
+
+
+def is_rule_date(series, day):
+    if day == series.date:
+        return True
+    for rule_date in series_dates(series):
+        if rule_date >= day:
+            return rule_date == day
+    return False
+
+
+class Occurrence:
+    """
+    시리즈의 가상 회차 (DB 행 없음)
+    
+    템플릿/API 직렬화에서 Event 대신 쓸 수 있도록 같은 속성을 제공한다.
+    """
+    
+    is_virtual = True
+    is_recurring = True
+    is_parent_event = False
+    attendees_count = 0
+    
+    def __init__(self, series, day):
+        self.series = series
+        self.date = day
+        self.id = series.id
+        self.recurrence_parent_id = series.id
+        for field in SERIES_FIELDS:
+            setattr(self, field, getattr(series, field))
+        self.recurrence_type = series.recurrence_type
+        self.recurrence_end_date = series.recurrence_end_date
+    
+    def __repr__(self):
+        return f"<Occurrence {self.series.id} {self.date}>"
+    
+    @property
+    def time_range(self):
+        return f"{self.start_time.strftime('%H:%M')} - {self.end_time.strftime('%H:%M')}"
+    
+    def get_recurrence_weekdays_list(self):
+        return self.series.get_recurrence_weekdays_list()
+
+
+def expand_series(series_list, start, end, materialized=()):
+    """
+    시리즈들의 [start, end] 구간 가상 회차
+    
+    materialized: 이미 저장된 회차 {(원본 id, 원래 날짜)}
+    """
+    occurrences = []
+    for series in series_list:
+        skip = series.get_recurrence_exceptions()
+        for day in series_dates(series):
+            if day > end:
+                break
+            if day < start or day in skip or (series.id, day) in materialized:
+                continue
+            occurrences.append(Occurrence(series, day))
+    return occurrences
+
+
+def virtual_occurrences(start, end, location=None):
+    """
+    [start, end] 구간에 걸친 시리즈들의 가상 회차 (location을 주면 그 장소만)
+    
+    쿼리 2회: 구간에 걸친 시리즈 + 시리즈의 저장된 회차 날짜
+    """
+    series = Event.objects.filter(
+        recurrence_parent__isnull=True,
+        date__lt=end,
+        recurrence_end_date__gte=start,
+    ).exclude(recurrence_type='none')
+    if location is not None:
+        series = series.filter(location=location)
+    series_list = list(series)
+    if not series_list:
+        return []
+    
+    materialized = set(
+        Event.objects.filter(
+            recurrence_parent__in=[series.id for series in series_list],
+            recurrence_date__gte=start,
+            recurrence_date__lte=end,
+        ).values_list('recurrence_parent_id', 'recurrence_date')
+    )
+    return expand_series(series_list, start, end, materialized)
+
+
+def expand_events(start, end, events=None):
+    """
+    [start, end] 구간의 일정 (저장된 행 + 가상 회차), (날짜, 시작 시간) 순
+    
+    events: 저장된 행 쿼리셋 (annotate/prefetch 등을 미리 건 쿼리셋 전달 가능)
+    """
+    events = Event.objects.all() if events is None else events
+    rows = list(events.filter(date__gte=start, date__lte=end, recurrence_hidden=False))
+    
+    combined = rows + virtual_occurrences(start, end)
+    combined.sort(key=lambda e: (e.date, e.start_time))
+    return combined
+
+
+def count_events(start, end):
+    """[start, end] 구간의 일정 수 (가상 회차 포함)"""
+    rows = Event.objects.filter(date__gte=start, date__lte=end, recurrence_hidden=False).count()
+    return rows + len(virtual_occurrences(start, end))
+
+
+def upcoming_events(today, limit=3):
+    """오늘 이후 가장 가까운 일정 limit개 (가상 회차 포함)"""
+    rows = list(
+        Event.objects.filter(date__gte=today, recurrence_hidden=False)
+        .order_by('date', 'start_time')[:limit]
+    )
+    # 저장된 행이 limit개면 그 마지막 날짜까지만 펼치면 충분
+    horizon = rows[-1].date if len(rows) == limit else today + timedelta(days=MAX_OCCURRENCES + 1)
+    
+    combined = rows + virtual_occurrences(today, horizon)
+    combined.sort(key=lambda e: (e.date, e.start_time))
+    return combined[:limit]
+
+
+def series_occurrence_count(series, since):
+    """since 이후 시리즈의 회차 수 (저장된 행 + 가상 회차)"""
+    skip = series.get_recurrence_exceptions()
+    skip |= set(
+        Event.objects.filter(recurrence_parent=series, recurrence_date__isnull=False)
+        .values_list('recurrence_date', flat=True)
+    )
+    virtual = sum(1 for day in series_dates(series) if day >= since and day not in skip)
+    rows = children_from(series, since).count()
+    own = 1 if not series.recurrence_hidden and series.date >= since else 0
+    return virtual + rows + own
+
+
+def get_occurrence(series, day):
+    """
+    시리즈의 특정 날짜 회차 (저장된 행 또는 가상 회차, 없으면 None)
+    """
+    if day == series.date:
+        return None if series.recurrence_hidden else series
+    
+    child = Event.objects.filter(recurrence_parent=series, recurrence_date=day).first()
+    if child:
+        return child
+    if day in series.get_recurrence_exceptions() or not is_rule_date(series, day):
+        return None
+    return Occurrence(series, day)
+
+
+def materialize(series, day):
+    """
+    가상 회차를 자식 행으로 저장 (개별 수정/참석 등록 시)
+    
+    원본 날짜면 원본 회차를 분리한다: 자식 행으로 옮기고 원본은 숨김.
+    Returns: 저장된 자식 Event
+    """
+    with transaction.atomic():
+        # 같은 회차가 동시에 두 번 저장되지 않도록 원본 행을 잠근 뒤 확인
+        list(Event.objects.select_for_update().filter(pk=series.pk).values_list('pk', flat=True))
+        existing = Event.objects.filter(recurrence_parent=series, recurrence_date=day).first()
+        if existing:
+            return existing
+        
+        child = Event.objects.create(
+            date=day,
+            recurrence_type='none',
+            recurrence_parent=series,
+            recurrence_date=day,
+            **{field: getattr(series, field) for field in SERIES_FIELDS},
+        )
+        
+        if day == series.date:
+            # 원본 회차의 참석자도 함께 옮김
+            child.attendees.set(series.attendees.all())
+            series.attendees.clear()
+            series.recurrence_hidden = True
+            series.save(update_fields=['recurrence_hidden', 'updated_at'])
+            events_changed.send(sender=Event, dates=[day])
+    
+    return child
+
+
+def bulk_materialize(series, dates, attendee_ids=()):
+    """
+    여러 회차를 자식 행으로 한 번에 저장 (bulk_create + 중간 테이블 일괄 삽입)
+    
+    모델 시그널이 발생하지 않으므로 변경 시그널을 직접 보낸다.
+    호출하는 쪽의 트랜잭션 안에서 실행할 것.
+    Returns: 저장된 자식 Event 리스트
+    """
+    children = Event.objects.bulk_create([
+        Event(
+            date=day,
+            recurrence_type='none',
+            recurrence_parent=series,
+            recurrence_date=day,
+            **{field: getattr(series, field) for field in SERIES_FIELDS},
+        )
+        for day in dates
+    ], batch_size=500)
+    if not children:
+        return children
+    
+    Attendance = Event.attendees.through
+    Attendance.objects.bulk_create([
+        Attendance(event_id=child.id, member_id=member_id)
+        for child in children
+        for member_id in attendee_ids
+    ], batch_size=1000)
+    
+    events_changed.send(sender=Event, dates=[children[0].date])
+    if attendee_ids:
+        attendance_changed.send(
+            sender=Event,
+            event_ids=[child.id for child in children],
+            member_ids=list(attendee_ids),
+            dates=[child.date for child in children],
+        )
+    return children
+
+
+def add_exception(series, day):
+    """회차 하나를 반복에서 제외 (원본 날짜면 원본 회차 숨김)"""
+    if day == series.date:
+        series.attendees.clear()
+        series.recurrence_hidden = True
+        series.save(update_fields=['recurrence_hidden', 'updated_at'])
+        events_changed.send(sender=Event, dates=[day])
+        return
+    
+    exceptions = series.get_recurrence_exceptions()
+    exceptions.add(day)
+    series.set_recurrence_exceptions(exceptions)
+    series.save(update_fields=['recurrence_exceptions', 'updated_at'])
+    # 원본 날짜가 그대로라 모델 시그널로는 알 수 없으므로 직접 알림 (지난 가상 회차 집계)
+    events_changed.send(sender=Event, dates=[day])
+
+
+# === 시리즈 일괄 수정/삭제 (this / future / all) ===
+
+def children_from(series, since):
+    """since 이후 회차의 자식 행 (원래 반복 날짜 기준, 없으면 날짜 기준)"""
+    return Event.objects.filter(recurrence_parent=series).filter(
+        Q(recurrence_date__gte=since) | Q(recurrence_date__isnull=True, date__gte=since)
+    )
+
+
+def series_rows(series):
+    """시리즈의 모든 저장된 행 (원본 + 자식)"""
+    return Event.objects.filter(Q(pk=series.pk) | Q(recurrence_parent=series))
+
+
+def split_series(series, since, changes=None):
+    """
+    since 회차부터 새 시리즈로 분리
+    
+    기존 시리즈는 since 전날까지로 끊고, 새 시리즈가 같은 규칙으로 since부터 이어간다.
+    since 회차가 이미 자식 행이거나 제외된 날짜면 새 원본 회차는 숨김.
+    자식 행은 옮기지 않는다 (호출하는 쪽에서 UPDATE).
+    """
+    changes = changes or {}
+    exceptions = series.get_recurrence_exceptions()
+    hidden = since in exceptions or Event.objects.filter(
+        recurrence_parent=series, recurrence_date=since,
+    ).exists()
+    
+    new_series = Event(
+        date=since,
+        recurrence_type=series.recurrence_type,
+        recurrence_end_date=series.recurrence_end_date,
+        recurrence_weekdays=series.recurrence_weekdays,
+        recurrence_hidden=hidden,
+        **{field: changes.get(field, getattr(series, field)) for field in SERIES_FIELDS},
+    )
+    new_series.set_recurrence_exceptions({d for d in exceptions if d > since})
+    new_series.save()
+    
+    series.recurrence_end_date = since - timedelta(days=1)
+    series.set_recurrence_exceptions({d for d in exceptions if d < since})
+    series.save(update_fields=['recurrence_end_date', 'recurrence_exceptions', 'updated_at'])
+    return new_series
+
+
+def change_series_attendees(series, join=(), leave=()):
+    """
+    시리즈의 저장된 행(원본 + 자식)에 참석자 추가/제거
+    
+    가상 회차는 건드리지 않는다 (시리즈 전체를 자식 행으로 저장하지 않음).
+    중간 테이블에서 leave DELETE 한 번 + join INSERT (중복 무시) 한 번.
+    같은 멤버가 join/leave 모두에 있으면 leave가 우선한다.
+    Returns: (삭제된 참석 행 수, 추가 시도한 참석 행 수)
+    """
+    Attendance = Event.attendees.through
+    leave = set(leave)
+    join = set(join) - leave
+    if not (join or leave):
+        return 0, 0
+    
+    rows = Event.objects.filter(
+        Q(pk=series.pk, recurrence_hidden=False) | Q(recurrence_parent=series)
+    )
+    existing = list(rows.values_list('id', 'date'))
+    if not existing:
+        return 0, 0
+    
+    removed = 0
+    if leave:
+        removed, _ = Attendance.objects.filter(
+            event_id__in=[event_id for event_id, _ in existing], member_id__in=leave,
+        ).delete()
+    added = Attendance.objects.bulk_create([
+        Attendance(event_id=event_id, member_id=member_id)
+        for event_id, _ in existing
+        for member_id in join
+    ], batch_size=1000, ignore_conflicts=True)
+    
+    attendance_changed.send(
+        sender=Event,
+        event_ids=[event_id for event_id, _ in existing],
+        member_ids=sorted(join | leave),
+        dates=sorted({day for _, day in existing}),
+    )
+    return removed, len(added)
+
+
+def update_series(series, changes, since=None, join=(), leave=()):
+    """
+    시리즈 회차 일괄 수정 (since 이후, None이면 전체)
+    
+    - 전체: 원본 + 자식 행을 UPDATE 한 번으로 수정 (가상 회차는 원본을 따름)
+    - since 이후: since부터 새 시리즈로 분리하고, since 이후 자식 행은
+      UPDATE 한 번으로 새 시리즈로 옮기며 함께 수정
+    날짜는 회차마다 다르므로 changes에 넣을 수 없다 (SERIES_FIELDS만).
+    join/leave: 수정 범위의 저장된 행에 추가/제거할 참석자 (change_series_attendees)
+    Returns: (수정 범위의 시리즈, 수정된 행 수)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        if since is None or since <= series.date:
+            target = series
+            updated = series_rows(series).update(updated_at=now, **changes)
+            for field, value in changes.items():
+                setattr(series, field, value)
+        else:
+            target = split_series(series, since, changes)
+            updated = 1 + children_from(series, since).update(
+                recurrence_parent=target, updated_at=now, **changes,
+            )
+        
+        change_series_attendees(target, join, leave)
+    
+    # UPDATE는 모델 시그널이 없으므로 직접 알림 (날짜는 바뀌지 않음)
+    events_changed.send(sender=Event, dates=[since or series.date])
+    return target, updated
+
+
+def delete_series(series, since=None):
+    """
+    시리즈 회차 일괄 삭제 (since 이후, None이면 전체)
+    
+    자식 행과 그 참석 행은 쿼리셋 DELETE로 한 번에 지우고,
+    since 이후만 지우는 경우 원본 규칙의 종료일을 since 전날로 당긴다.
+    Returns: (삭제된 회차 수, {모델: 삭제된 행 수})
+    """
+    with transaction.atomic():
+        if since is None or since <= series.date:
+            occurrences = series_occurrence_count(series, series.date)
+            _, rows = series_rows(series).delete()
+        else:
+            occurrences = series_occurrence_count(series, since)
+            _, rows = children_from(series, since).delete()
+            
+            exceptions = series.get_recurrence_exceptions()
+            series.recurrence_end_date = since - timedelta(days=1)
+            series.set_recurrence_exceptions({d for d in exceptions if d < since})
+            series.save(update_fields=['recurrence_end_date', 'recurrence_exceptions', 'updated_at'])
+            # 종료일을 당겨 사라진 가상 회차도 집계에서 빠지도록 직접 알림
+            events_changed.send(sender=Event, dates=[since])
+    
+    return occurrences, rows
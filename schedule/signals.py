@@ -0,0 +1,85 @@
+"""
+일정/참석 변경 시그널
+
+다른 앱(참석 집계, 캐시 등)은 모델 시그널 대신 아래 두 시그널을 구독한다.
+bulk_create/update/중간 테이블 직접 삽입처럼 모델 시그널이 발생하지 않는
+일괄 처리 경로는 작업 후 직접 send 해야 한다.
+
+- attendance_changed(sender=Event, event_ids, member_ids, dates)
+  참석자 추가/제거. dates는 해당 일정들의 날짜.
+- events_changed(sender=Event, dates)
+  일정 생성/삭제/날짜 변경. 모든 멤버의 집계에 영향.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from .models import Event
+
+
+attendance_changed = Signal()
+events_changed = Signal()
+
+
+@receiver(post_init, sender=Event)
+def remember_original_date(sender, instance, **kwargs):
+    # 지연 로딩(.only/.defer)된 필드를 건드리지 않도록 __dict__에서 직접 읽음
+    instance._original_date = instance.__dict__.get('date')
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    
+    # 뷰가 문자열 날짜를 그대로 넣고 저장한 경우도 date로 맞춰 비교
+    current = Event._meta.get_field('date').to_python(instance.date)
+    original = instance._original_date
+    instance._original_date = current
+    if not created and original == current:
+        return
+    
+    dates = {current}
+    if original and not created:
+        dates.add(original)
+    events_changed.send(sender=Event, dates=sorted(dates))
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    events_changed.send(sender=Event, dates=[instance.date])
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def attendees_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # clear()는 post_clear에서 pk_set을 주지 않으므로 미리 기억
+        if reverse:
+            instance._cleared_ids = set(instance.events.values_list('id', flat=True))
+        else:
+            instance._cleared_ids = set(instance.attendees.values_list('id', flat=True))
+        return
+    
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_ids', set())
+    elif action not in ('post_add', 'post_remove'):
+        return
+    
+    if not pk_set:
+        return
+    
+    if reverse:
+        # member.events.add(...)
+        event_ids = sorted(pk_set)
+        member_ids = [instance.pk]
+        dates = sorted(set(
+            Event.objects.filter(id__in=event_ids).values_list('date', flat=True)
+        ))
+    else:
+        # event.attendees.add(...)
+        event_ids = [instance.pk]
+        member_ids = sorted(pk_set)
+        dates = [instance.date]
+    
+    attendance_changed.send(
+        sender=Event, event_ids=event_ids, member_ids=member_ids, dates=dates,
+    )
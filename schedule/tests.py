@@ -0,0 +1,163 @@
+import json
+from datetime import date, time
+
+from django.test import TestCase
+
+from members.models import Member
+
+from . import recurrence
+from .models import Event
+
+
+class EventUpdateTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            title='정기 모임', date=date(2026, 10, 24),
+            start_time=time(9), end_time=time(11), location='A코트',
+        )
+        self.member = Member.objects.create(name='김민수', gender='M')
+    
+    def update(self, **data):
+        return self.client.post(
+            f'/schedule/api/event/update/{self.event.id}/',
+            json.dumps(data), content_type='application/json',
+        )
+    
+    def test_unchanged_date_string_keeps_attendee_edit(self):
+        # 캘린더 화면은 날짜가 그대로여도 항상 'YYYY-MM-DD' 문자열로 보냄
+        response = self.update(title='정기 모임', date='2026-10-24', attendees=[self.member.id])
+        
+        self.assertEqual(response.status_code, 200)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.date, date(2026, 10, 24))
+        self.assertEqual(list(self.event.attendees.values_list('id', flat=True)), [self.member.id])
+    
+    def test_changed_date_string(self):
+        response = self.update(date='2026-10-25', attendees=[self.member.id])
+        
+        self.assertEqual(response.status_code, 200)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.date, date(2026, 10, 25))
+        self.assertEqual(self.event.attendees.count(), 1)
+
+
+class RecurrenceTestCase(TestCase):
+    """매주 토요일 반복 일정 (2026-10-03 ~ 2026-10-31, 5회차)"""
+    
+    def setUp(self):
+        self.series = Event.objects.create(
+            title='정기 모임', date=date(2026, 10, 3),
+            start_time=time(9), end_time=time(11), location='A코트',
+            recurrence_type='weekly', recurrence_end_date=date(2026, 10, 31),
+        )
+        self.kim = Member.objects.create(name='김민수', gender='M')
+        self.lee = Member.objects.create(name='이지은', gender='F')
+    
+    def post(self, url, **data):
+        return self.client.post(url, json.dumps(data), content_type='application/json')
+    
+    def attendance_rows(self):
+        return Event.attendees.through.objects.filter(
+            event__in=recurrence.series_rows(self.series).values('pk'),
+        ).count()
+
+
+class VirtualExpansionTests(RecurrenceTestCase):
+    def test_expands_rule_dates_without_rows(self):
+        events = recurrence.expand_events(date(2026, 10, 1), date(2026, 10, 31))
+        
+        self.assertEqual([e.date.day for e in events], [3, 10, 17, 24, 31])
+        self.assertEqual(sum(e.is_virtual for e in events), 4)
+        self.assertEqual(Event.objects.count(), 1)
+    
+    def test_materialized_occurrence_replaces_virtual(self):
+        recurrence.materialize(self.series, date(2026, 10, 17))
+        
+        events = recurrence.expand_events(date(2026, 10, 1), date(2026, 10, 31))
+        self.assertEqual([e.date.day for e in events], [3, 10, 17, 24, 31])
+        self.assertFalse(events[2].is_virtual)
+    
+    def test_exception_skips_occurrence(self):
+        recurrence.add_exception(self.series, date(2026, 10, 24))
+        
+        events = recurrence.expand_events(date(2026, 10, 1), date(2026, 10, 31))
+        self.assertEqual([e.date.day for e in events], [3, 10, 17, 31])
+        self.assertIsNone(recurrence.get_occurrence(self.series, date(2026, 10, 24)))
+
+
+class SeriesUpdateTests(RecurrenceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.child = recurrence.materialize(self.series, date(2026, 10, 10))
+        self.child.attendees.add(self.kim)
+    
+    def update(self, **data):
+        return self.post(f'/schedule/api/event/update/{self.series.id}/', **data)
+    
+    def test_title_only_edit_from_virtual_occurrence_keeps_attendance(self):
+        # 수정 모달은 가상 회차에서도 참석자(빈 목록)를 항상 보냄
+        response = self.update(
+            scope='all', occurrence_date='2026-10-24', date='2026-10-24',
+            title='토요 정기 모임', attendees=[],
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.child.refresh_from_db()
+        self.assertEqual(self.child.title, '토요 정기 모임')
+        self.assertEqual(list(self.child.attendees.all()), [self.kim])
+        # 나머지 가상 회차를 자식 행으로 저장하지 않음
+        self.assertEqual(Event.objects.count(), 2)
+    
+    def test_title_only_edit_from_stored_occurrence_keeps_attendance(self):
+        response = self.update(
+            scope='all', occurrence_date='2026-10-10', date='2026-10-10',
+            title='토요 정기 모임', attendees=[self.kim.id],
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.attendance_rows(), 1)
+        self.assertEqual(Event.objects.count(), 2)
+    
+    def test_attendee_change_applies_delta_to_stored_rows(self):
+        response = self.update(
+            scope='all', occurrence_date='2026-10-10', date='2026-10-10',
+            attendees=[self.lee.id],
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.child.attendees.all()), [self.lee])
+        self.assertEqual(list(self.series.attendees.all()), [self.lee])
+        self.assertEqual(Event.objects.count(), 2)
+    
+    def test_future_edit_splits_series(self):
+        response = self.update(
+            scope='future', occurrence_date='2026-10-24', date='2026-10-24',
+            start_time='10:00', attendees=[],
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.series.refresh_from_db()
+        self.assertEqual(self.series.recurrence_end_date, date(2026, 10, 23))
+        events = recurrence.expand_events(date(2026, 10, 1), date(2026, 10, 31))
+        self.assertEqual(
+            [(e.date.day, e.start_time.hour) for e in events],
+            [(3, 9), (10, 9), (17, 9), (24, 10), (31, 10)],
+        )
+        self.assertEqual(list(self.child.attendees.all()), [self.kim])
+    
+    def test_this_edit_materializes_only_that_occurrence(self):
+        response = self.update(
+            scope='this', occurrence_date='2026-10-17', date='2026-10-17', title='번개',
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        events = recurrence.expand_events(date(2026, 10, 1), date(2026, 10, 31))
+        self.assertEqual([e.title for e in events].count('번개'), 1)
+        self.assertEqual(Event.objects.count(), 3)
+    
+    def test_delete_all_removes_series(self):
+        response = self.post(f'/schedule/api/event/delete/{self.series.id}/', delete_type='all')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['deleted_count'], 5)
+        self.assertFalse(Event.objects.exists())
@@ -6,9 +6,14 @@ app_name = 'schedule'
 urlpatterns = [
     path('', views.schedule_calendar, name='calendar'),
     path('api/events/', views.events_api, name='events_api'),
+    path('feed.ics', views.ics_feed, name='ics_feed'),
+    path('feed/member/<int:member_id>.ics', views.ics_feed, name='member_ics_feed'),
     path('api/event/<int:event_id>/', views.event_detail, name='event_detail'),
     path('api/event/create/', views.event_create, name='event_create'),
     path('api/event/update/<int:event_id>/', views.event_update, name='event_update'),
     path('api/event/delete/<int:event_id>/', views.event_delete, name='event_delete'),
+    path('api/event/<int:event_id>/join/', views.event_join, name='event_join'),
+    path('api/event/<int:event_id>/leave/', views.event_leave, name='event_leave'),
+    path('api/event/<int:event_id>/checkin/', views.event_checkin, name='event_checkin'),
 ]
 
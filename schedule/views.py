@@ -1,50 +1,24 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.views.decorators.http import require_http_methods
+from django.db import transaction
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from .models import Event
+from . import attendance, conflicts, dashboard, feed, ics, recurrence
 from members.models import Member
 import json
 import calendar
 
 
 def home(request):
-    """홈 대시보드 페이지"""
+    """홈 대시보드 페이지 (집계는 캐시, 일정/멤버 변경 시 무효화)"""
     today = datetime.now().date()
     
-    # 다가오는 일정 (오늘 이후 3개)
-    upcoming_events = Event.objects.filter(
-        date__gte=today
-    ).prefetch_related('attendees').order_by('date', 'start_time')[:3]
-    
-    # 가장 가까운 일정
-    next_event = upcoming_events.first() if upcoming_events else None
-    
-    # 이번 달 일정 수
-    this_month_events = Event.objects.filter(
-        date__year=today.year,
-        date__month=today.month
-    ).count()
-    
-    # 멤버 현황
-    total_members = Member.objects.filter(status='active').count()
-    male_members = Member.objects.filter(status='active', gender='M').count()
-    female_members = Member.objects.filter(status='active', gender='F').count()
-    
-    # 다음 일정 참석자 수
-    next_event_attendees = next_event.attendees.count() if next_event else 0
-    
-    context = {
-        'today': today,
-        'upcoming_events': upcoming_events,
-        'next_event': next_event,
-        'next_event_attendees': next_event_attendees,
-        'this_month_events': this_month_events,
-        'total_members': total_members,
-        'male_members': male_members,
-        'female_members': female_members,
-    }
+    context = {'today': today}
+    context.update(dashboard.get_home_dashboard(today))
     return render(request, 'home.html', context)
 
 
@@ -59,23 +33,12 @@ def schedule_calendar(request):
     prev_month = current_date - relativedelta(months=1)
     next_month = current_date + relativedelta(months=1)
     
-    # 해당 월의 일정 가져오기
-    events = Event.objects.filter(
-        date__year=year,
-        date__month=month
-    ).prefetch_related('attendees')
-    
     # 캘린더 데이터 생성
     cal = calendar.Calendar(firstweekday=6)  # 일요일 시작
     month_days = cal.monthdatescalendar(year, month)
     
-    # 일정을 날짜별로 그룹화
-    events_by_date = {}
-    for event in events:
-        date_str = event.date.strftime('%Y-%m-%d')
-        if date_str not in events_by_date:
-            events_by_date[date_str] = []
-        events_by_date[date_str].append(event)
+    # 그리드에 보이는 앞뒤 달 날짜까지 포함한 날짜별 피드 (캐시, 반복 일정의 가상 회차 포함)
+    events_by_date = feed.get_feed(month_days[0][0], month_days[-1][-1])['by_date']
     
     context = {
         'year': year,
@@ -93,10 +56,29 @@ def schedule_calendar(request):
     return render(request, 'schedule/calendar.html', context)
 
 
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+def _resolve_occurrence(event, occurrence_date):
+    """
+    반복 일정의 특정 회차 (저장된 행 또는 가상 회차)
+    
+    회차 날짜가 없거나 반복 원본이 아니면 event 그대로.
+    """
+    if occurrence_date is None or not event.is_parent_event:
+        return event
+    return recurrence.get_occurrence(event, occurrence_date)
+
+
 def event_detail(request, event_id):
-    """일정 상세 API"""
+    """일정 상세 API (반복 일정의 회차는 ?occurrence=YYYY-MM-DD)"""
     event = get_object_or_404(Event, id=event_id)
-    attendees = list(event.attendees.values('id', 'name', 'gender'))
+    event = _resolve_occurrence(event, _parse_date(request.GET.get('occurrence')))
+    if event is None:
+        return JsonResponse({'success': False, 'error': '해당 날짜의 일정이 없습니다.'}, status=404)
+    
+    attendees = [] if event.is_virtual else list(event.attendees.values('id', 'name', 'gender'))
     
     return JsonResponse({
         'id': event.id,
@@ -113,6 +95,8 @@ def event_detail(request, event_id):
         'is_recurring': event.is_recurring,
         'is_parent_event': event.is_parent_event,
         'recurrence_parent_id': event.recurrence_parent_id,
+        'is_virtual': event.is_virtual,
+        'occurrence_date': event.date.strftime('%Y-%m-%d') if event.is_virtual else None,
     })
 
 
@@ -164,60 +148,32 @@ def event_create(request):
             if attendee_ids:
                 event.attendees.set(attendee_ids)
             created_events.append(event)
+            created_count = 1
         else:
             # 반복 일정 생성
-            # 원본 일정 생성
-            parent_event = Event.objects.create(
-                title=title,
-                date=start_date,
-                start_time=start_time,
-                end_time=end_time,
-                location=location,
-                description=description,
-                recurrence_type=recurrence_type,
-                recurrence_end_date=recurrence_end_date,
-                recurrence_weekdays=json.dumps(recurrence_weekdays) if recurrence_weekdays else '',
-            )
-            if attendee_ids:
-                parent_event.attendees.set(attendee_ids)
-            created_events.append(parent_event)
-            
-            # 반복 일정 생성 (자식 이벤트들)
-            current_date = start_date
-            max_events = 365  # 최대 1년치
-            event_count = 0
-            
-            while event_count < max_events:
-                # 다음 날짜 계산
-                if recurrence_type == 'daily':
-                    current_date += timedelta(days=1)
-                elif recurrence_type == 'weekly':
-                    current_date += timedelta(weeks=1)
-                elif recurrence_type == 'custom':
-                    current_date += timedelta(days=1)
-                    # 선택된 요일이 아니면 건너뛰기
-                    while current_date <= recurrence_end_date and current_date.weekday() not in recurrence_weekdays:
-                        current_date += timedelta(days=1)
-                
-                # 종료일 체크
-                if current_date > recurrence_end_date:
-                    break
-                
-                # 자식 이벤트 생성
-                child_event = Event.objects.create(
+            # 원본 일정 + (참석자가 있으면) 회차 자식 일정을 한 트랜잭션에서 일괄 생성
+            with transaction.atomic():
+                parent_event = Event.objects.create(
                     title=title,
-                    date=current_date,
+                    date=start_date,
                     start_time=start_time,
                     end_time=end_time,
                     location=location,
                     description=description,
-                    recurrence_type='none',
-                    recurrence_parent=parent_event,
+                    recurrence_type=recurrence_type,
+                    recurrence_end_date=recurrence_end_date,
+                    recurrence_weekdays=json.dumps(recurrence_weekdays) if recurrence_weekdays else '',
                 )
                 if attendee_ids:
-                    child_event.attendees.set(attendee_ids)
-                created_events.append(child_event)
-                event_count += 1
+                    parent_event.attendees.set(attendee_ids)
+                created_events.append(parent_event)
+                
+                # 회차 날짜는 메모리에서 먼저 계산. 가상으로 펼치되,
+                # 참석자가 지정된 경우에만 자식 일정으로 일괄 저장
+                occurrence_dates = list(recurrence.series_dates(parent_event))
+                if attendee_ids:
+                    recurrence.bulk_materialize(parent_event, occurrence_dates, attendee_ids)
+            created_count = 1 + len(occurrence_dates)
         
         return JsonResponse({
             'success': True,
@@ -226,7 +182,8 @@ def event_create(request):
                 'title': created_events[0].title,
                 'date': created_events[0].date.strftime('%Y-%m-%d'),
             },
-            'created_count': len(created_events),
+            'created_count': created_count,
+            'conflicts': conflicts.event_conflicts(created_events[0]),
         })
     except Exception as e:
         import traceback
@@ -237,118 +194,293 @@ def event_create(request):
         }, status=400)
 
 
+def _changes_event_fields(event, data):
+    """참석자 외 필드가 바뀌는지 확인"""
+    current = {
+        'title': event.title,
+        'date': event.date.strftime('%Y-%m-%d'),
+        'start_time': event.start_time.strftime('%H:%M'),
+        'end_time': event.end_time.strftime('%H:%M'),
+        'location': event.location,
+        'description': event.description,
+    }
+    return any(field in data and data[field] != value for field, value in current.items())
+
+
 @require_http_methods(["POST"])
 def event_update(request, event_id):
-    """일정 수정 API"""
+    """
+    일정 수정 API
+    
+    반복 일정은 scope로 범위 지정 (기본 this)
+    - this: 이 회차만. 가상 회차나 원본 회차는 자식 일정으로 저장한 뒤 수정
+    - future: 이 회차부터 새 시리즈로 분리해 일괄 수정
+    - all: 시리즈 전체 일괄 수정
+    """
     try:
         event = get_object_or_404(Event, id=event_id)
         data = json.loads(request.body)
+        scope = data.get('scope', 'this')
+        
+        series, occurrence_date = _series_and_date(event, data)
+        if series is not None and scope in ('future', 'all'):
+            return _update_series(series, occurrence_date, scope, data)
+        
+        if event.is_parent_event:
+            if occurrence_date != event.date:
+                if recurrence.get_occurrence(event, occurrence_date) is None:
+                    return JsonResponse({'success': False, 'error': '해당 날짜의 일정이 없습니다.'}, status=404)
+                event = recurrence.materialize(event, occurrence_date)
+            elif _changes_event_fields(event, data):
+                # 원본 회차만 수정: 규칙은 원본에 남기고 회차를 분리
+                event = recurrence.materialize(event, event.date)
         
         event.title = data.get('title', event.title)
-        event.date = data.get('date', event.date)
+        event.date = _parse_date(data.get('date')) or event.date
         event.start_time = data.get('start_time', event.start_time)
         event.end_time = data.get('end_time', event.end_time)
         event.location = data.get('location', event.location)
         event.description = data.get('description', event.description)
-        event.save()
         
-        # 참석자 업데이트
-        if 'attendees' in data:
-            event.attendees.set(data['attendees'])
+        # 저장과 참석자 변경은 함께 반영 (중간에 실패하면 둘 다 취소)
+        with transaction.atomic():
+            event.save()
+            if 'attendees' in data:
+                event.attendees.set(data['attendees'])
         
-        return JsonResponse({'success': True})
+        return JsonResponse({
+            'success': True,
+            'id': event.id,
+            'updated_count': 1,
+            'conflicts': conflicts.event_conflicts(event),
+        })
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
 
 
+def _series_and_date(event, data):
+    """
+    반복 일정이면 (원본 시리즈, 기준 회차 날짜), 아니면 (None, None)
+    """
+    if event.is_parent_event:
+        return event, _parse_date(data.get('occurrence_date')) or event.date
+    if event.recurrence_parent_id:
+        return event.recurrence_parent, event.recurrence_date or event.date
+    return None, None
+
+
+def _attendee_delta(series, occurrence_date, data):
+    """
+    수정 모달의 참석자 목록과 클릭한 회차의 현재 참석자를 비교한 (추가, 제거) 멤버
+    
+    모달은 참석자를 항상 보내고 가상 회차면 빈 목록을 보내므로,
+    바뀐 멤버만 시리즈에 반영한다 (제목/시간만 바꿀 때 참석 기록 유지).
+    """
+    if 'attendees' not in data:
+        return set(), set()
+    
+    occurrence = recurrence.get_occurrence(series, occurrence_date)
+    if occurrence is None or occurrence.is_virtual:
+        current = set()
+    else:
+        current = set(occurrence.attendees.values_list('id', flat=True))
+    requested = {int(member_id) for member_id in data['attendees']}
+    return requested - current, current - requested
+
+
+def _update_series(series, occurrence_date, scope, data):
+    """반복 일정 일괄 수정 (future/all)"""
+    if scope == 'future' and recurrence.get_occurrence(series, occurrence_date) is None:
+        return JsonResponse({'success': False, 'error': '해당 날짜의 일정이 없습니다.'}, status=404)
+    if data.get('date') and data['date'] != occurrence_date.strftime('%Y-%m-%d'):
+        return JsonResponse({'success': False, 'error': '반복 일정을 일괄 수정할 때는 날짜를 바꿀 수 없습니다.'}, status=400)
+    
+    join, leave = _attendee_delta(series, occurrence_date, data)
+    changes = {field: data[field] for field in recurrence.SERIES_FIELDS if field in data}
+    target, updated_count = recurrence.update_series(
+        series,
+        changes,
+        since=occurrence_date if scope == 'future' else None,
+        join=join,
+        leave=leave,
+    )
+    return JsonResponse({
+        'success': True,
+        'id': target.id,
+        'updated_count': updated_count,
+        'conflicts': conflicts.event_conflicts(target),
+    })
+
+
 @require_http_methods(["POST"])
 def event_delete(request, event_id):
-    """일정 삭제 API (반복 일정 삭제 옵션 지원)"""
+    """
+    일정 삭제 API (반복 일정 삭제 옵션 지원)
+    
+    반복 일정의 회차는 occurrence_date로 지정 (가상 회차 포함).
+    - single: 이 회차만 (반복 제외 날짜로 기록)
+    - future: 이 회차 이후 (반복 종료일을 앞당기고 이후 자식 일정 삭제)
+    - all: 시리즈 전체
+    """
     try:
         event = get_object_or_404(Event, id=event_id)
         data = json.loads(request.body) if request.body else {}
         delete_type = data.get('delete_type', 'single')  # 'single', 'future', 'all'
         
-        deleted_count = 0
+        series, occurrence_date = _series_and_date(event, data)
+        if series is None:
+            # 단일 일정 (또는 원본이 삭제된 자식 일정) 삭제
+            _, rows = event.delete()
+            return JsonResponse({'success': True, 'deleted_count': 1, 'deleted_rows': rows})
         
-        if not event.is_recurring:
-            # 단일 일정 삭제
-            event.delete()
-            deleted_count = 1
+        if delete_type == 'all':
+            deleted_count, rows = recurrence.delete_series(series)
+            return JsonResponse({'success': True, 'deleted_count': deleted_count, 'deleted_rows': rows})
+        
+        target = event if not event.is_parent_event else recurrence.get_occurrence(series, occurrence_date)
+        if target is None:
+            return JsonResponse({'success': False, 'error': '해당 날짜의 일정이 없습니다.'}, status=404)
+        
+        if delete_type == 'future':
+            # 이번 일정 및 앞으로의 모든 일정 삭제
+            deleted_count, rows = recurrence.delete_series(series, since=occurrence_date)
         else:
-            if delete_type == 'single':
-                # 이번 일정만 삭제
-                event.delete()
-                deleted_count = 1
-            elif delete_type == 'future':
-                # 이번 일정 및 앞으로의 모든 일정 삭제
-                if event.is_parent_event:
-                    # 원본 일정인 경우: 원본 + 이 날짜 이후의 자식들 삭제
-                    future_events = Event.objects.filter(
-                        recurrence_parent=event,
-                        date__gte=event.date
-                    )
-                    deleted_count = future_events.count() + 1
-                    future_events.delete()
-                    event.delete()
-                else:
-                    # 자식 일정인 경우: 이 날짜 이후의 같은 부모 자식들 삭제
-                    parent = event.recurrence_parent
-                    future_events = Event.objects.filter(
-                        recurrence_parent=parent,
-                        date__gte=event.date
-                    )
-                    deleted_count = future_events.count()
-                    future_events.delete()
-            elif delete_type == 'all':
-                # 모든 반복 일정 삭제
-                if event.is_parent_event:
-                    # 원본 일정인 경우: 원본 + 모든 자식들 삭제
-                    children = Event.objects.filter(recurrence_parent=event)
-                    deleted_count = children.count() + 1
-                    children.delete()
-                    event.delete()
-                else:
-                    # 자식 일정인 경우: 부모 + 모든 형제 삭제
-                    parent = event.recurrence_parent
-                    if parent:
-                        siblings = Event.objects.filter(recurrence_parent=parent)
-                        deleted_count = siblings.count() + 1
-                        siblings.delete()
-                        parent.delete()
-                    else:
-                        event.delete()
-                        deleted_count = 1
+            # 이번 일정만 삭제
+            rows = {}
+            if target is not series and not target.is_virtual:
+                _, rows = target.delete()
+            recurrence.add_exception(series, occurrence_date)
+            deleted_count = 1
         
-        return JsonResponse({
-            'success': True,
-            'deleted_count': deleted_count
-        })
+        return JsonResponse({'success': True, 'deleted_count': deleted_count, 'deleted_rows': rows})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+
+def _rsvp(event_id, data, join, leave):
+    """참석 등록/취소 공통 처리 (반복 일정의 가상 회차는 참석 등록 시 저장)"""
+    event = get_object_or_404(Event, id=event_id)
+    occurrence_date = _parse_date(data.get('occurrence_date'))
+    
+    join = [int(member_id) for member_id in join]
+    leave = [int(member_id) for member_id in leave]
+    unknown = attendance.unknown_member_ids(join + leave)
+    if unknown:
+        return JsonResponse({'success': False, 'error': f'존재하지 않는 멤버입니다: {unknown}'}, status=400)
+    
+    target = _resolve_occurrence(event, occurrence_date)
+    if target is None:
+        return JsonResponse({'success': False, 'error': '해당 날짜의 일정이 없습니다.'}, status=404)
+    
+    if target.is_virtual:
+        if not join:
+            # 가상 회차는 참석자가 없으므로 취소할 것도 없음
+            return JsonResponse({'success': True, 'id': target.id, 'attendees_count': 0, 'removed': 0})
+        target = recurrence.materialize(target.series, target.date)
+    
+    result = attendance.change_attendance(target, join=join, leave=leave)
+    return JsonResponse({'success': True, 'id': target.id, **result})
+
+
+@require_http_methods(["POST"])
+def event_join(request, event_id):
+    """참석 등록 API (body: member_id, 반복 일정 회차는 occurrence_date)"""
+    try:
+        data = json.loads(request.body) if request.body else {}
+        if not data.get('member_id'):
+            return JsonResponse({'success': False, 'error': 'member_id를 입력해주세요.'}, status=400)
+        return _rsvp(event_id, data, join=[data['member_id']], leave=[])
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+
+@require_http_methods(["POST"])
+def event_leave(request, event_id):
+    """참석 취소 API (body: member_id, 반복 일정 회차는 occurrence_date)"""
+    try:
+        data = json.loads(request.body) if request.body else {}
+        if not data.get('member_id'):
+            return JsonResponse({'success': False, 'error': 'member_id를 입력해주세요.'}, status=400)
+        return _rsvp(event_id, data, join=[], leave=[data['member_id']])
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+
+@require_http_methods(["POST"])
+def event_checkin(request, event_id):
+    """
+    참석 일괄 체크인 API (운영진용)
+    
+    body: {join: [멤버 id...], leave: [멤버 id...], occurrence_date}
+    """
+    try:
+        data = json.loads(request.body) if request.body else {}
+        join = data.get('join', [])
+        leave = data.get('leave', [])
+        if not isinstance(join, list) or not isinstance(leave, list) or not (join or leave):
+            return JsonResponse({'success': False, 'error': 'join 또는 leave 목록을 입력해주세요.'}, status=400)
+        return _rsvp(event_id, data, join=join, leave=leave)
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
 
 
 def events_api(request):
-    """일정 목록 API (FullCalendar 형식)"""
-    year = int(request.GET.get('year', datetime.now().year))
-    month = int(request.GET.get('month', datetime.now().month))
+    """
+    일정 목록 API (FullCalendar 형식, 반복 일정의 가상 회차 포함)
     
-    events = Event.objects.filter(
-        date__year=year,
-        date__month=month
-    ).prefetch_related('attendees')
+    ?start=YYYY-MM-DD&end=YYYY-MM-DD 로 구간 조회 (종료일 포함, 최대 feed.MAX_RANGE_DAYS일)
+    구간이 없으면 ?year=&month= 의 한 달 (기본 이번 달)
+    """
+    if 'start' in request.GET or 'end' in request.GET:
+        try:
+            start = _parse_date(request.GET.get('start'))
+            end = _parse_date(request.GET.get('end'))
+        except ValueError:
+            return JsonResponse({'success': False, 'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}, status=400)
+        if start is None or end is None:
+            return JsonResponse({'success': False, 'error': 'start와 end를 모두 입력해주세요.'}, status=400)
+        if end < start:
+            return JsonResponse({'success': False, 'error': '종료일이 시작일보다 빠릅니다.'}, status=400)
+        if (end - start).days >= feed.MAX_RANGE_DAYS:
+            return JsonResponse({'success': False, 'error': f'조회 구간은 최대 {feed.MAX_RANGE_DAYS}일입니다.'}, status=400)
+    else:
+        year = int(request.GET.get('year', datetime.now().year))
+        month = int(request.GET.get('month', datetime.now().month))
+        start, end = feed.month_range(year, month)
     
-    events_data = []
-    for event in events:
-        events_data.append({
-            'id': event.id,
-            'title': event.title,
-            'date': event.date.strftime('%Y-%m-%d'),
-            'start_time': event.start_time.strftime('%H:%M'),
-            'end_time': event.end_time.strftime('%H:%M'),
-            'location': event.location,
-            'attendees_count': event.attendees.count(),
-            'is_recurring': event.is_recurring,
-        })
+    events_data = feed.get_feed(start, end)['events']
+    
+    return JsonResponse({
+        'start': start.strftime('%Y-%m-%d'),
+        'end': end.strftime('%Y-%m-%d'),
+        'events': events_data,
+    })
+
+
+def ics_feed(request, member_id=None):
+    """
+    iCalendar 구독 피드 (클럽 전체 또는 멤버가 참석하는 일정)
+    
+    ETag/Last-Modified가 같으면 집계 쿼리 1회로 304 응답
+    """
+    member = get_object_or_404(Member, id=member_id) if member_id is not None else None
+    events = ics.feed_events(datetime.now().date(), member)
+    
+    etag, last_modified = ics.feed_version(events)
+    etag = quote_etag(etag)
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+    
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
     
-    return JsonResponse({'events': events_data})
+    response = StreamingHttpResponse(
+        ics.stream_ics(events, request.get_host(), as_single=member is not None),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'no-cache'
+    response['Content-Disposition'] = 'inline; filename="tennis-club.ics"'
+    return response